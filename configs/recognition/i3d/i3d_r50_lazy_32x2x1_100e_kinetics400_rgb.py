@@ -22,8 +22,7 @@ train_pipeline = [
         lazy=True),
     dict(type='Resize', scale=(224, 224), keep_ratio=False, lazy=True),
     dict(type='Flip', flip_ratio=0.5, lazy=True),
-    dict(type='Fuse'),
-    dict(type='Normalize', **img_norm_cfg),
+    dict(type='Fuse', img_norm_cfg=img_norm_cfg),
     dict(type='FormatShape', input_format='NCTHW'),
     dict(type='Collect', keys=['imgs', 'label'], meta_keys=[]),
     dict(type='ToTensor', keys=['imgs', 'label'])
@@ -39,8 +38,7 @@ val_pipeline = [
     dict(type='Resize', scale=(-1, 256), lazy=True),
     dict(type='CenterCrop', crop_size=224, lazy=True),
     dict(type='Flip', flip_ratio=0, lazy=True),
-    dict(type='Fuse'),
-    dict(type='Normalize', **img_norm_cfg),
+    dict(type='Fuse', img_norm_cfg=img_norm_cfg),
     dict(type='FormatShape', input_format='NCTHW'),
     dict(type='Collect', keys=['imgs', 'label'], meta_keys=[]),
     dict(type='ToTensor', keys=['imgs'])
@@ -53,10 +51,10 @@ test_pipeline = [
         num_clips=10,
         test_mode=True),
     dict(type='RawFrameDecode', decoding_backend='turbojpeg'),
-    dict(type='Resize', scale=(-1, 256)),
-    dict(type='ThreeCrop', crop_size=256),
-    dict(type='Flip', flip_ratio=0),
-    dict(type='Normalize', **img_norm_cfg),
+    dict(type='Resize', scale=(-1, 256), lazy=True),
+    dict(type='ThreeCrop', crop_size=256, lazy=True),
+    dict(type='Flip', flip_ratio=0, lazy=True),
+    dict(type='Fuse', img_norm_cfg=img_norm_cfg),
     dict(type='FormatShape', input_format='NCTHW'),
     dict(type='Collect', keys=['imgs', 'label'], meta_keys=[]),
     dict(type='ToTensor', keys=['imgs'])
@@ -39,6 +39,8 @@ train_pipeline = [
     dict(type='Resize', scale=(224, 224), keep_ratio=False),
     dict(type='Flip', flip_ratio=0.5),
     dict(type='Imgaug', transforms='default'),
+    # the same transforms without the imgaug library
+    # dict(type='NativeImgaug', transforms='default'),
     # dict(
     #     type='Imgaug',
     #     transforms=[
@@ -6,8 +6,9 @@ from mmcv.runner import (DistSamplerSeedHook, EpochBasedRunner, OptimizerHook,
                          build_optimizer)
 from mmcv.runner.hooks import Fp16OptimizerHook
 
-from ..core import (DistEvalHook, EvalHook, OmniSourceDistSamplerSeedHook,
-                    OmniSourceRunner)
+from ..core import (DatasetEpochHook, DistEvalHook, EvalHook,
+                    OmniSourceDistSamplerSeedHook, OmniSourceRunner,
+                    PipelineProfileHook)
 from ..datasets import build_dataloader, build_dataset
 from ..utils import PreciseBNHook, get_root_logger
 
@@ -114,6 +115,11 @@ def train_model(model,
             runner.register_hook(OmniSourceDistSamplerSeedHook())
         else:
             runner.register_hook(DistSamplerSeedHook())
+    if any(hasattr(ds, 'set_epoch') for ds in dataset):
+        # iterable datasets shuffling the data by themselves
+        runner.register_hook(DatasetEpochHook())
+    # only logs the datasets built with "profile_pipeline"
+    runner.register_hook(PipelineProfileHook())
 
     # precise bn setting
     if cfg.get('precise_bn', False):
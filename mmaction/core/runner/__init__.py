@@ -1,3 +1,8 @@
+from .dataset_epoch_hook import DatasetEpochHook
 from .omnisource_runner import OmniSourceDistSamplerSeedHook, OmniSourceRunner
+from .pipeline_profile_hook import PipelineProfileHook
 
-__all__ = ['OmniSourceRunner', 'OmniSourceDistSamplerSeedHook']
+__all__ = [
+    'OmniSourceRunner', 'OmniSourceDistSamplerSeedHook', 'DatasetEpochHook',
+    'PipelineProfileHook'
+]
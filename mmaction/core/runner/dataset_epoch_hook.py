@@ -0,0 +1,17 @@
+from mmcv.runner import HOOKS, Hook
+
+
+@HOOKS.register_module()
+class DatasetEpochHook(Hook):
+    """Set the epoch of the datasets with ``set_epoch``, e.g.
+    :obj:`ShardedVideoDataset`, before each epoch.
+
+    The samplers of such iterable datasets cannot be set by
+    ``DistSamplerSeedHook``, since they shuffle the data by themselves.
+    """
+
+    def before_epoch(self, runner):
+        data_loaders = getattr(runner, 'data_loaders', [runner.data_loader])
+        for data_loader in data_loaders:
+            if hasattr(data_loader.dataset, 'set_epoch'):
+                data_loader.dataset.set_epoch(runner.epoch)
@@ -0,0 +1,27 @@
+from mmcv.runner import HOOKS, Hook
+
+
+@HOOKS.register_module()
+class PipelineProfileHook(Hook):
+    """Log the profiled statistics of the pipelines of the training datasets
+    built with "profile_pipeline", and reset them after each epoch.
+
+    The statistics are aggregated across the dataloader workers of a rank,
+    and logged by the rank 0.
+    """
+
+    def after_train_epoch(self, runner):
+        data_loaders = getattr(runner, 'data_loaders', [runner.data_loader])
+        for data_loader in data_loaders:
+            dataset = data_loader.dataset
+            # unwrap the dataset wrappers, e.g. RepeatDataset
+            while not hasattr(dataset, 'pipeline') and hasattr(
+                    dataset, 'dataset'):
+                dataset = dataset.dataset
+            pipeline = getattr(dataset, 'pipeline', None)
+            if not getattr(pipeline, 'profile', False):
+                continue
+            runner.logger.info(
+                f'Pipeline profile of {dataset.__class__.__name__} in epoch '
+                f'{runner.epoch + 1}:\n{pipeline.profile_table()}')
+            pipeline.reset_profile()
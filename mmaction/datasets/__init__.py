@@ -10,12 +10,15 @@ from .hvu_dataset import HVUDataset
 from .image_dataset import ImageDataset
 from .rawframe_dataset import RawframeDataset
 from .rawvideo_dataset import RawVideoDataset
+from .sharded_dataset import ShardedVideoDataset
 from .ssn_dataset import SSNDataset
 from .video_dataset import VideoDataset
+from .video_infos import CompactVideoInfos
 
 __all__ = [
     'VideoDataset', 'build_dataloader', 'build_dataset', 'RepeatDataset',
     'RawframeDataset', 'BaseDataset', 'ActivityNetDataset', 'SSNDataset',
     'HVUDataset', 'AudioDataset', 'AudioFeatureDataset', 'ImageDataset',
-    'RawVideoDataset', 'AVADataset', 'AudioVisualDataset'
+    'RawVideoDataset', 'AVADataset', 'AudioVisualDataset', 'CompactVideoInfos',
+    'ShardedVideoDataset'
 ]
@@ -1,9 +1,8 @@
 import os.path as osp
 
-import torch
-
 from .base import BaseDataset
 from .registry import DATASETS
+from .video_infos import CompactVideoInfos
 
 
 @DATASETS.register_module()
@@ -58,12 +57,11 @@ class AudioDataset(BaseDataset):
                 assert label, f'missing label in line: {line}'
                 if self.multi_class:
                     assert self.num_classes is not None
-                    onehot = torch.zeros(self.num_classes)
-                    onehot[label] = 1.0
-                    video_info['label'] = onehot
+                    # converted into one-hot tensors when preparing samples
+                    video_info['label'] = label
                 else:
                     assert len(label) == 1
                     video_info['label'] = label[0]
                 video_infos.append(video_info)
 
-        return video_infos
+        return CompactVideoInfos(video_infos)
@@ -2,6 +2,7 @@ import os.path as osp
 
 from .rawframe_dataset import RawframeDataset
 from .registry import DATASETS
+from .video_infos import CompactVideoInfos
 
 
 @DATASETS.register_module()
@@ -73,4 +74,4 @@ class AudioVisualDataset(RawframeDataset):
                     assert len(label) == 1
                     video_info['label'] = label[0]
                 video_infos.append(video_info)
-        return video_infos
+        return CompactVideoInfos(video_infos)
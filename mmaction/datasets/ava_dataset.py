@@ -1,7 +1,5 @@
-import copy
 import os
 import os.path as osp
-from collections import defaultdict
 from datetime import datetime
 
 import mmcv
@@ -14,6 +12,12 @@ from .base import BaseDataset
 from .registry import DATASETS
 
 
+def _concat(arrays, empty_shape, dtype):
+    if not arrays:
+        return np.zeros(empty_shape, dtype=dtype)
+    return np.concatenate(arrays)
+
+
 @DATASETS.register_module()
 class AVADataset(BaseDataset):
     """AVA dataset for spatial temporal detection.
@@ -138,7 +142,8 @@ class AVADataset(BaseDataset):
             num_classes=num_classes)
 
         if self.proposal_file is not None:
-            self.proposals = mmcv.load(self.proposal_file)
+            self.proposals = self.filter_proposals(
+                mmcv.load(self.proposal_file))
         else:
             self.proposals = None
 
@@ -148,6 +153,50 @@ class AVADataset(BaseDataset):
                 f'{len(valid_indexes)} out of {len(self.video_infos)} '
                 f'frames are valid.')
             self.video_infos = [self.video_infos[i] for i in valid_indexes]
+        self.build_frame_tables()
+
+    def build_frame_tables(self):
+        """Pack the annotations and proposals of the frames into arrays.
+
+        The ground truths and proposals of all the frames are concatenated,
+        and those of a frame are sliced by its offsets when preparing it, so
+        no nested dicts of arrays are copied per sample. It should be called
+        again if ``video_infos`` or ``proposals`` are changed.
+        """
+        anns = [video_info['ann'] for video_info in self.video_infos]
+        self.gt_offsets = np.cumsum([0] +
+                                    [len(ann['entity_ids']) for ann in anns])
+        self.gt_bboxes = _concat([ann['gt_bboxes'] for ann in anns], (0, 4),
+                                 np.float64)
+        self.gt_labels = _concat([ann['gt_labels'] for ann in anns],
+                                 (0, self.num_classes), np.float32)
+        self.gt_entity_ids = _concat([ann['entity_ids'] for ann in anns],
+                                     (0, ), np.int64)
+        # the annotations are kept as views of the arrays
+        for i, ann in enumerate(anns):
+            start, end = self.gt_offsets[i:i + 2]
+            ann['gt_bboxes'] = self.gt_bboxes[start:end]
+            ann['gt_labels'] = self.gt_labels[start:end]
+            ann['entity_ids'] = self.gt_entity_ids[start:end]
+
+        if self.proposals is None:
+            return
+        # the proposal of the whole frame is used for the frames without
+        # proposals
+        default_proposal = np.array([[0, 0, 1, 1, 1]])
+        proposals = [
+            self.proposals.get(video_info['img_key'], default_proposal)
+            for video_info in self.video_infos
+        ]
+        self.proposal_offsets = np.cumsum([0] + [len(p) for p in proposals])
+        self.proposal_boxes = _concat([p[:, :4] for p in proposals], (0, 4),
+                                      np.float64)
+        self.proposal_scores = _concat([
+            p[:, 4] if p.shape[-1] == 5 else np.full(len(p), np.nan)
+            for p in proposals
+        ], (0, ), np.float64)
+        self.proposal_with_scores = np.array(
+            [p.shape[-1] == 5 for p in proposals], dtype=bool)
 
     def parse_img_record(self, img_records):
         bboxes, labels, entity_ids = [], [], []
@@ -184,67 +233,141 @@ class AVADataset(BaseDataset):
         return bboxes, labels, entity_ids
 
     def filter_exclude_file(self):
-        valid_indexes = []
         if self.exclude_file is None:
-            valid_indexes = list(range(len(self.video_infos)))
-        else:
-            exclude_video_infos = [
-                x.strip().split(',') for x in open(self.exclude_file)
+            return list(range(len(self.video_infos)))
+        excluded = set()
+        with open(self.exclude_file, 'r') as fin:
+            for line in fin:
+                video_id, timestamp = line.strip().split(',')
+                excluded.add((video_id, int(timestamp)))
+        return [
+            i for i, info in enumerate(self.video_infos)
+            if (info['video_id'], info['timestamp']) not in excluded
+        ]
+
+    def filter_proposals(self, proposals):
+        """Filter the proposals of all the frames at once.
+
+        The proposals with detection scores no less than
+        ``person_det_score_thr``, or the largest score of the frame if lower,
+        are kept, and at most ``num_max_proposals`` of them for each frame.
+
+        Args:
+            proposals (dict[str, np.ndarray]): Proposals of each ``img_key``,
+                in shape (N, 4) or (N, 5) with the detection scores.
+
+        Returns:
+            dict[str, np.ndarray]: The filtered proposals, which are views of
+                the concatenated proposals of all the frames.
+        """
+        filtered = {}
+        for num_cols in [4, 5]:
+            img_keys = [
+                img_key for img_key, value in proposals.items()
+                if value.shape[-1] == num_cols and len(value) > 0
             ]
-            for i, video_info in enumerate(self.video_infos):
-                valid_indexes.append(i)
-                for video_id, timestamp in exclude_video_infos:
-                    if (video_info['video_id'] == video_id
-                            and video_info['timestamp'] == int(timestamp)):
-                        valid_indexes.pop()
-                        break
-        return valid_indexes
+            if not img_keys:
+                continue
+            concat = np.concatenate([proposals[key] for key in img_keys])
+            lengths = np.array([len(proposals[key]) for key in img_keys])
+            starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+            keep = np.ones(len(concat), dtype=bool)
+            if num_cols == 5:
+                scores = concat[:, 4]
+                thrs = np.minimum(self.person_det_score_thr,
+                                  np.maximum.reduceat(scores, starts))
+                keep = scores >= np.repeat(thrs, lengths)
+            # rank of the kept proposals in their frames, from 1
+            num_kept = np.cumsum(keep)
+            ranks = num_kept - np.repeat(num_kept[starts] - keep[starts],
+                                         lengths)
+            keep &= ranks <= self.num_max_proposals
+            counts = np.add.reduceat(keep, starts)
+            kept = concat[keep]
+            for img_key, start, end in zip(img_keys,
+                                           np.cumsum(counts) - counts,
+                                           np.cumsum(counts)):
+                filtered[img_key] = kept[start:end]
+
+        for img_key, value in proposals.items():
+            assert value.shape[-1] in [4, 5]
+            if img_key not in filtered:
+                filtered[img_key] = value
+        return filtered
 
     def load_annotations(self):
+        video_ids = np.loadtxt(
+            self.ann_file, delimiter=',', dtype=str, usecols=0, ndmin=1)
+        records = np.loadtxt(
+            self.ann_file, delimiter=',', usecols=range(1, 8), ndmin=2)
+        timestamps = records[:, 0].astype(np.int64)
+        entity_boxes = records[:, 1:5]
+        labels = records[:, 5].astype(np.int64)
+        entity_ids = records[:, 6].astype(np.int64)
+
+        if self.custom_classes is not None:
+            # map the labels to their first indexes in custom_classes, and
+            # drop the records of other labels
+            custom_classes = np.array(self.custom_classes)
+            sorter = np.argsort(custom_classes, kind='stable')
+            inds = np.searchsorted(custom_classes, labels, sorter=sorter)
+            inds = np.minimum(inds, len(custom_classes) - 1)
+            valid = custom_classes[sorter[inds]] == labels
+            video_ids, timestamps, entity_boxes, entity_ids = (
+                video_ids[valid], timestamps[valid], entity_boxes[valid],
+                entity_ids[valid])
+            labels = sorter[inds[valid]]
+
+        # group the records by the frame, and then by the entity box, both in
+        # order of appearance
+        _, video_codes = np.unique(video_ids, return_inverse=True)
+        _, img_first, img_inds = np.unique(
+            np.stack([video_codes, timestamps], axis=1),
+            axis=0,
+            return_index=True,
+            return_inverse=True)
+        img_ranks = np.empty_like(img_first)
+        img_ranks[np.argsort(img_first)] = np.arange(len(img_first))
+        img_inds = img_ranks[img_inds.reshape(-1)]
+
+        _, box_first, box_inds = np.unique(
+            np.concatenate([img_inds[:, None], entity_boxes], axis=1),
+            axis=0,
+            return_index=True,
+            return_inverse=True)
+        box_order = np.lexsort((box_first, img_inds[box_first]))
+        box_ranks = np.empty_like(box_order)
+        box_ranks[box_order] = np.arange(len(box_order))
+        box_first = box_first[box_order]
+
+        # The format can be directly used by BCELossWithLogits
+        gt_labels = np.zeros((len(box_first), self.num_classes),
+                             dtype=np.float32)
+        gt_labels[box_ranks[box_inds.reshape(-1)], labels] = 1.
+        gt_bboxes = entity_boxes[box_first]
+        gt_entity_ids = entity_ids[box_first]
+        box_bounds = np.searchsorted(img_inds[box_first],
+                                     np.arange(len(img_first) + 1))
+
+        shot_info = (0,
+                     (self.timestamp_end - self.timestamp_start) * self._FPS)
         video_infos = []
-        records_dict_by_img = defaultdict(list)
-        with open(self.ann_file, 'r') as fin:
-            for line in fin:
-                line_split = line.strip().split(',')
-
-                label = int(line_split[6])
-                if self.custom_classes is not None:
-                    if label not in self.custom_classes:
-                        continue
-                    label = self.custom_classes.index(label)
-
-                video_id = line_split[0]
-                timestamp = int(line_split[1])
-                img_key = f'{video_id},{timestamp:04d}'
-
-                entity_box = np.array(list(map(float, line_split[2:6])))
-                entity_id = int(line_split[7])
-                shot_info = (0, (self.timestamp_end - self.timestamp_start) *
-                             self._FPS)
-
-                video_info = dict(
-                    video_id=video_id,
-                    timestamp=timestamp,
-                    entity_box=entity_box,
-                    label=label,
-                    entity_id=entity_id,
-                    shot_info=shot_info)
-                records_dict_by_img[img_key].append(video_info)
-
-        for img_key in records_dict_by_img:
-            video_id, timestamp = img_key.split(',')
-            bboxes, labels, entity_ids = self.parse_img_record(
-                records_dict_by_img[img_key])
+        for i, first in enumerate(np.sort(img_first)):
+            video_id = str(video_ids[first])
+            timestamp = int(timestamps[first])
+            box_slice = slice(box_bounds[i], box_bounds[i + 1])
             ann = dict(
-                gt_bboxes=bboxes, gt_labels=labels, entity_ids=entity_ids)
+                gt_bboxes=gt_bboxes[box_slice],
+                gt_labels=gt_labels[box_slice],
+                entity_ids=gt_entity_ids[box_slice])
             frame_dir = video_id
             if self.data_prefix is not None:
                 frame_dir = osp.join(self.data_prefix, frame_dir)
             video_info = dict(
                 frame_dir=frame_dir,
                 video_id=video_id,
-                timestamp=int(timestamp),
-                img_key=img_key,
+                timestamp=timestamp,
+                img_key=f'{video_id},{timestamp:04d}',
                 shot_info=shot_info,
                 fps=self._FPS,
                 ann=ann)
@@ -252,11 +375,12 @@ class AVADataset(BaseDataset):
 
         return video_infos
 
-    def prepare_train_frames(self, idx):
-        """Prepare the frames for training given the index."""
-        results = copy.deepcopy(self.video_infos[idx])
-        img_key = results['img_key']
-
+    def _prepare_frames(self, idx):
+        video_info = self.video_infos[idx]
+        results = {
+            key: value
+            for key, value in video_info.items() if key != 'ann'
+        }
         results['filename_tmpl'] = self.filename_tmpl
         results['modality'] = self.modality
         results['start_index'] = self.start_index
@@ -264,66 +388,27 @@ class AVADataset(BaseDataset):
         results['timestamp_end'] = self.timestamp_end
 
         if self.proposals is not None:
-            if img_key not in self.proposals:
-                results['proposals'] = np.array([[0, 0, 1, 1]])
-                results['scores'] = np.array([1])
-            else:
-                proposals = self.proposals[img_key]
-                assert proposals.shape[-1] in [4, 5]
-                if proposals.shape[-1] == 5:
-                    thr = min(self.person_det_score_thr, max(proposals[:, 4]))
-                    positive_inds = (proposals[:, 4] >= thr)
-                    proposals = proposals[positive_inds]
-                    proposals = proposals[:self.num_max_proposals]
-                    results['proposals'] = proposals[:, :4]
-                    results['scores'] = proposals[:, 4]
-                else:
-                    proposals = proposals[:self.num_max_proposals]
-                    results['proposals'] = proposals
-
-        ann = results.pop('ann')
-        results['gt_bboxes'] = ann['gt_bboxes']
-        results['gt_labels'] = ann['gt_labels']
-        results['entity_ids'] = ann['entity_ids']
+            # filtered by filter_proposals already
+            start, end = self.proposal_offsets[idx:idx + 2]
+            results['proposals'] = self.proposal_boxes[start:end]
+            if self.proposal_with_scores[idx]:
+                results['scores'] = self.proposal_scores[start:end]
+
+        # Follow the mmdet variable naming style.
+        start, end = self.gt_offsets[idx:idx + 2]
+        results['gt_bboxes'] = self.gt_bboxes[start:end].copy()
+        results['gt_labels'] = self.gt_labels[start:end].copy()
+        results['entity_ids'] = self.gt_entity_ids[start:end].copy()
 
         return self.pipeline(results)
 
+    def prepare_train_frames(self, idx):
+        """Prepare the frames for training given the index."""
+        return self._prepare_frames(idx)
+
     def prepare_test_frames(self, idx):
         """Prepare the frames for testing given the index."""
-        results = copy.deepcopy(self.video_infos[idx])
-        img_key = results['img_key']
-
-        results['filename_tmpl'] = self.filename_tmpl
-        results['modality'] = self.modality
-        results['start_index'] = self.start_index
-        results['timestamp_start'] = self.timestamp_start
-        results['timestamp_end'] = self.timestamp_end
-
-        if self.proposals is not None:
-            if img_key not in self.proposals:
-                results['proposals'] = np.array([[0, 0, 1, 1]])
-                results['scores'] = np.array([1])
-            else:
-                proposals = self.proposals[img_key]
-                assert proposals.shape[-1] in [4, 5]
-                if proposals.shape[-1] == 5:
-                    thr = min(self.person_det_score_thr, max(proposals[:, 4]))
-                    positive_inds = (proposals[:, 4] >= thr)
-                    proposals = proposals[positive_inds]
-                    proposals = proposals[:self.num_max_proposals]
-                    results['proposals'] = proposals[:, :4]
-                    results['scores'] = proposals[:, 4]
-                else:
-                    proposals = proposals[:self.num_max_proposals]
-                    results['proposals'] = proposals
-
-        ann = results.pop('ann')
-        # Follow the mmdet variable naming style.
-        results['gt_bboxes'] = ann['gt_bboxes']
-        results['gt_labels'] = ann['gt_labels']
-        results['entity_ids'] = ann['entity_ids']
-
-        return self.pipeline(results)
+        return self._prepare_frames(idx)
 
     def dump_results(self, results, out):
         assert out.endswith('csv')
@@ -1,5 +1,9 @@
 import copy
+import hashlib
+import os
 import os.path as osp
+import pickle
+import struct
 import warnings
 from abc import ABCMeta, abstractmethod
 from collections import OrderedDict, defaultdict
@@ -13,6 +17,21 @@ from torch.utils.data import Dataset
 from ..core import (mean_average_precision, mean_class_accuracy,
                     mmit_mean_average_precision, top_k_accuracy)
 from .pipelines import Compose
+from .video_infos import CompactVideoInfos
+
+
+def _is_simple(value):
+    if isinstance(value, (list, tuple)):
+        return all(_is_simple(x) for x in value)
+    return value is None or isinstance(value, (bool, int, float, str))
+
+
+def _sha1(filename):
+    sha1 = hashlib.sha1()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha1.update(chunk)
+    return sha1.hexdigest()
 
 
 class BaseDataset(Dataset, metaclass=ABCMeta):
@@ -51,6 +70,10 @@ class BaseDataset(Dataset, metaclass=ABCMeta):
             when sampling data. `power == 1` indicates uniformly sampling all
             data; `power == 0` indicates uniformly sampling all classes.
             Default: None.
+        cache_annotations (bool): Whether to cache the loaded annotations in
+            a binary file next to the local ``ann_file``, which is memory
+            mapped by the following runs and processes as long as
+            ``ann_file`` is not changed. Default: False.
     """
 
     def __init__(self,
@@ -63,7 +86,8 @@ class BaseDataset(Dataset, metaclass=ABCMeta):
                  start_index=1,
                  modality='RGB',
                  sample_by_class=False,
-                 power=None):
+                 power=None,
+                 cache_annotations=False):
         super().__init__()
 
         self.ann_file = ann_file
@@ -77,10 +101,14 @@ class BaseDataset(Dataset, metaclass=ABCMeta):
         self.modality = modality
         self.sample_by_class = sample_by_class
         self.power = power
+        self.cache_annotations = cache_annotations
         assert not (self.multi_class and self.sample_by_class)
 
         self.pipeline = Compose(pipeline)
-        self.video_infos = self.load_annotations()
+        if self.cache_annotations and osp.isfile(self.ann_file):
+            self.video_infos = self.load_cached_annotations()
+        else:
+            self.video_infos = self.load_annotations()
         if self.sample_by_class:
             self.video_infos_by_class = self.parse_by_class()
 
@@ -88,6 +116,62 @@ class BaseDataset(Dataset, metaclass=ABCMeta):
     def load_annotations(self):
         """Load the annotation according to ann_file into video_infos."""
 
+    def _annotation_signature(self):
+        # the simple attributes set before loading the annotations, which are
+        # the arguments of the dataset in general
+        attrs = {
+            key: value
+            for key, value in vars(self).items()
+            if key != 'cache_annotations' and _is_simple(value)
+        }
+        return repr((self.__class__.__module__, self.__class__.__qualname__,
+                     sorted(attrs.items())))
+
+    def load_cached_annotations(self):
+        """Load the annotations with a binary cache.
+
+        The cache is named after ``ann_file`` and the arguments of the
+        dataset, and is valid if ``ann_file`` has the same size and
+        modification time, or the same sha1 hash as when the cache was
+        dumped. Otherwise, the annotations are loaded by
+        :meth:`load_annotations` and dumped into the cache.
+
+        Returns:
+            :obj:`CompactVideoInfos`: The video infos memory mapped from the
+                cache.
+        """
+        signature = self._annotation_signature()
+        digest = hashlib.sha1(signature.encode('utf-8')).hexdigest()[:8]
+        cache_file = f'{self.ann_file}.{digest}.cache'
+        stat = os.stat(self.ann_file)
+
+        if osp.isfile(cache_file):
+            try:
+                meta = CompactVideoInfos.read_meta(cache_file)
+            except (OSError, EOFError, struct.error, pickle.UnpicklingError):
+                meta = None
+            if (meta is not None and meta['signature'] == signature
+                    and meta['size'] == stat.st_size
+                    and (meta['mtime_ns'] == stat.st_mtime_ns
+                         or meta['sha1'] == _sha1(self.ann_file))):
+                return CompactVideoInfos.load(cache_file)
+
+        video_infos = self.load_annotations()
+        if not isinstance(video_infos, CompactVideoInfos):
+            video_infos = CompactVideoInfos(video_infos)
+        meta = dict(
+            signature=signature,
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            sha1=_sha1(self.ann_file))
+        try:
+            video_infos.dump(cache_file, meta)
+        except OSError as e:
+            warnings.warn(f'Failed to dump the annotation cache '
+                          f'{cache_file}: {e}')
+            return video_infos
+        return CompactVideoInfos.load(cache_file)
+
     # json annotations already looks like video_infos, so for each dataset,
     # this func should be the same
     def load_json_annotations(self):
@@ -105,7 +189,7 @@ class BaseDataset(Dataset, metaclass=ABCMeta):
             else:
                 assert len(video_infos[i]['label']) == 1
                 video_infos[i]['label'] = video_infos[i]['label'][0]
-        return video_infos
+        return CompactVideoInfos(video_infos)
 
     def parse_by_class(self):
         video_infos_by_class = defaultdict(list)
@@ -6,11 +6,13 @@ import numpy as np
 from mmcv.parallel import collate
 from mmcv.runner import get_dist_info
 from mmcv.utils import build_from_cfg
-from torch.utils.data import DataLoader
+from torch.utils.data import DataLoader, IterableDataset
 
 from .dataset_wrappers import RepeatDataset
+from .pipelines import Compose
 from .registry import DATASETS
 from .samplers import DistributedPowerSampler, DistributedSampler
+from .shared_memory import SharedSlabRing, SlabDataLoader
 
 if platform.system() != 'Windows':
     # https://github.com/pytorch/pytorch/issues/973
@@ -24,6 +26,11 @@ if platform.system() != 'Windows':
 def build_dataset(cfg, default_args=None):
     """Build a dataset from config dict.
 
+    The pipeline of the dataset is profiled if "profile_pipeline" is set in
+    the config, as True or a dict of the other profiling args of
+    :obj:`Compose`, e.g. ``dict(trace_alloc=True)``. See
+    :obj:`PipelineProfileHook` for reporting the statistics in training.
+
     Args:
         cfg (dict): Config dict. It should at least contain the key "type".
         default_args (dict | None, optional): Default initialization arguments.
@@ -36,7 +43,14 @@ def build_dataset(cfg, default_args=None):
         dataset = RepeatDataset(
             build_dataset(cfg['dataset'], default_args), cfg['times'])
     else:
+        cfg = cfg.copy()
+        profile_cfg = cfg.pop('profile_pipeline', False)
         dataset = build_from_cfg(cfg, DATASETS, default_args)
+        if profile_cfg:
+            profile_cfg = profile_cfg if isinstance(profile_cfg, dict) else {}
+            # rebuilt with the same transforms
+            dataset.pipeline = Compose(
+                dataset.pipeline.transforms, profile=True, **profile_cfg)
     return dataset
 
 
@@ -49,6 +63,8 @@ def build_dataloader(dataset,
                      seed=None,
                      drop_last=False,
                      pin_memory=True,
+                     shm_slab_size=None,
+                     shm_num_slabs=None,
                      **kwargs):
     """Build PyTorch DataLoader.
 
@@ -71,6 +87,17 @@ def build_dataloader(dataset,
             Default: False
         pin_memory (bool): Whether to use pin_memory in DataLoader.
             Default: True
+        shm_slab_size (int | None): Size in bytes of each shared-memory slab.
+            If set, the workers stack the batches into a ring of slabs
+            preallocated in shared memory (and pinned if ``pin_memory``),
+            and only pass the handles of the slabs to the main process. A
+            batch then stays valid until the next batch is fetched, and
+            batches larger than a slab are passed as usual. See
+            :obj:`SlabDataLoader`. Default: None.
+        shm_num_slabs (int | None): Number of the shared-memory slabs, which
+            should be more than the batches prefetched by the workers. If set
+            to None, it is one more than the prefetched batches.
+            Default: None.
         kwargs (dict, optional): Any keyword argument to be used to initialize
             DataLoader.
 
@@ -81,7 +108,15 @@ def build_dataloader(dataset,
     sample_by_class = getattr(dataset, 'sample_by_class', False)
     power = getattr(dataset, 'power', None)
 
-    if dist:
+    if isinstance(dataset, IterableDataset):
+        # iterable datasets split and shuffle the data by themselves
+        sampler = None
+        shuffle = False
+        batch_size = videos_per_gpu if dist else num_gpus * videos_per_gpu
+        num_workers = workers_per_gpu if dist else num_gpus * workers_per_gpu
+        if hasattr(dataset, 'set_batch_size'):
+            dataset.set_batch_size(batch_size)
+    elif dist:
         if sample_by_class:
             assert power is not None
             sampler = DistributedPowerSampler(
@@ -101,12 +136,40 @@ def build_dataloader(dataset,
         worker_init_fn, num_workers=num_workers, rank=rank,
         seed=seed) if seed is not None else None
 
-    data_loader = DataLoader(
+    if shm_slab_size is None:
+        data_loader = DataLoader(
+            dataset,
+            batch_size=batch_size,
+            sampler=sampler,
+            num_workers=num_workers,
+            collate_fn=partial(collate, samples_per_gpu=videos_per_gpu),
+            pin_memory=pin_memory,
+            shuffle=shuffle,
+            worker_init_fn=init_fn,
+            drop_last=drop_last,
+            **kwargs)
+        return data_loader
+
+    # a slab is held by each prefetched batch and the batch in use
+    prefetch_factor = kwargs.get('prefetch_factor') or 2
+    min_slabs = max(num_workers * prefetch_factor, 1) + 1
+    if shm_num_slabs is None:
+        shm_num_slabs = min_slabs
+    elif shm_num_slabs < min_slabs:
+        raise ValueError(f'shm_num_slabs should be at least {min_slabs}, '
+                         f'but got {shm_num_slabs}')
+    slab_ring = SharedSlabRing(
+        shm_num_slabs,
+        shm_slab_size,
+        pin_memory=pin_memory,
+        mp_context=kwargs.get('multiprocessing_context'))
+    data_loader = SlabDataLoader(
         dataset,
+        slab_ring,
+        samples_per_gpu=videos_per_gpu,
         batch_size=batch_size,
         sampler=sampler,
         num_workers=num_workers,
-        collate_fn=partial(collate, samples_per_gpu=videos_per_gpu),
         pin_memory=pin_memory,
         shuffle=shuffle,
         worker_init_fn=init_fn,
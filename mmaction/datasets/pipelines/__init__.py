@@ -1,9 +1,10 @@
 from .augmentations import (AudioAmplify, CenterCrop, ColorJitter,
                             EntityBoxCrop, EntityBoxFlip, EntityBoxRescale,
                             Flip, Fuse, Imgaug, MelSpectrogram, MultiGroupCrop,
-                            MultiScaleCrop, Normalize, RandomCrop,
-                            RandomRescale, RandomResizedCrop, RandomScale,
-                            Resize, TenCrop, ThreeCrop)
+                            MultiScaleCrop, NativeImgaug, Normalize,
+                            PackLazyParams, RandomCrop, RandomRescale,
+                            RandomResizedCrop, RandomScale, Resize, TenCrop,
+                            ThreeCrop)
 from .compose import Compose
 from .formating import (Collect, FormatAudioShape, FormatShape, ImageToTensor,
                         Rename, ToDataContainer, ToTensor, Transpose)
@@ -12,7 +13,8 @@ from .loading import (AudioDecode, AudioDecodeInit, AudioFeatureSelector,
                       DenseSampleFrames, FrameSelector,
                       GenerateLocalizationLabels, ImageDecode,
                       LoadAudioFeature, LoadHVULabel, LoadLocalizationFeature,
-                      LoadProposals, OpenCVDecode, OpenCVInit, PyAVDecode,
+                      LoadProposals, MotionVectorToFlow, OpenCVDecode,
+                      OpenCVInit, PackedFrameDecode, PyAVDecode,
                       PyAVDecodeMotionVector, PyAVInit, RawFrameDecode,
                       SampleAVAFrames, SampleFrames, SampleProposalFrames,
                       UntrimmedSampleFrames)
@@ -31,5 +33,6 @@ __all__ = [
     'FormatAudioShape', 'LoadAudioFeature', 'AudioFeatureSelector',
     'AudioDecodeInit', 'EntityBoxFlip', 'EntityBoxCrop', 'EntityBoxRescale',
     'RandomScale', 'ImageDecode', 'BuildPseudoClip', 'RandomRescale',
-    'PyAVDecodeMotionVector', 'Rename', 'Imgaug'
+    'PyAVDecodeMotionVector', 'Rename', 'Imgaug', 'PackedFrameDecode',
+    'MotionVectorToFlow', 'PackLazyParams', 'NativeImgaug'
 ]
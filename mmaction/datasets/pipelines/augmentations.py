@@ -1,8 +1,14 @@
+import hashlib
+import os
+import os.path as osp
 import random
 from collections.abc import Sequence
+from functools import partial
 
+import cv2
 import mmcv
 import numpy as np
+from mmcv.image.geometric import cv2_interp_codes
 from torch.nn.modules.utils import _pair
 
 from ..registry import PIPELINES
@@ -42,6 +48,34 @@ def _init_lazy_if_proper(results, lazy):
         assert 'lazy' not in results, 'Use Fuse after lazy operations'
 
 
+def _record_lazy_views(results, views, view_flips=None):
+    """Record the crop boxes of multiple views in lazy operation.
+
+    Multi-view crops, e.g. ``ThreeCrop`` and ``TenCrop``, only record the
+    crop boxes of the views, and ``Fuse`` crops all the views from each frame
+    resized once.
+
+    Required keys in results are "img_shape" and "lazy", added keys in "lazy"
+    are "views", "view_flips" and "source_shape".
+
+    Args:
+        results (dict): A dict stores data pipeline result.
+        views (list[list[int]]): Crop boxes of the views in "img_shape".
+        view_flips (list[bool] | None): Whether each view is flipped
+            horizontally. If set to None, no view is flipped. Default: None.
+    """
+    lazyop = results['lazy']
+    if lazyop['flip']:
+        raise NotImplementedError('Put Flip at last for now')
+    if 'views' in lazyop:
+        raise NotImplementedError('Use one multi-view crop please')
+    if view_flips is None:
+        view_flips = [False] * len(views)
+    lazyop['views'] = np.array(views, dtype=np.int64)
+    lazyop['view_flips'] = np.array(view_flips, dtype=bool)
+    lazyop['source_shape'] = tuple(results['img_shape'])
+
+
 @PIPELINES.register_module()
 class Imgaug:
     """Imgaug augmentation.
@@ -259,18 +293,398 @@ class Imgaug:
         return results
 
 
+@PIPELINES.register_module()
+class NativeImgaug:
+    """Native implementation of the default transforms of ``Imgaug``.
+
+    It follows the policy of ``Imgaug(transforms='default')``: a rotation in
+    [-30, 30] degrees, then 0 to 3 of (one of gaussian, average and median
+    blurs), (one of dropout and coarse dropout) and additive gaussian noise.
+    As in ``Imgaug``, the parameters and the random masks are sampled once
+    for a clip and shared by all its frames, but the masks and the noise are
+    applied to the whole clip in one NumPy operation and the other
+    transforms are done by OpenCV, without the imgaug library.
+
+    Configs using ``dict(type='Imgaug', transforms='default')`` can switch to
+    it by replacing the type with ``'NativeImgaug'``. Only uint8 images are
+    supported.
+
+    Required keys are "imgs", "img_shape"(if "gt_bboxes" is not None) and
+    "modality", added or modified keys are "imgs", "img_shape", "gt_bboxes"
+    and "proposals".
+
+    Args:
+        transforms (str): Transforms to apply, only support `default` for
+            now. Default: 'default'.
+    """
+
+    def __init__(self, transforms='default'):
+        if transforms != 'default':
+            raise ValueError('NativeImgaug only supports the `default` '
+                             'transforms')
+        self.transforms = transforms
+
+    @staticmethod
+    def _rotation_matrix(angle, img_h, img_w):
+        """Get the matrix rotating the pixel indices clockwise around the
+        center of the pixel grid, as imgaug does."""
+        return cv2.getRotationMatrix2D((img_w / 2 - 0.5, img_h / 2 - 0.5),
+                                       -angle, 1)
+
+    @staticmethod
+    def _rotate(imgs, angle):
+        """Rotate the frames clockwise around their centers, with the pixels
+        out of the frames filled with 0."""
+        img_h, img_w = imgs.shape[1:3]
+        matrix = NativeImgaug._rotation_matrix(angle, img_h, img_w)
+        out = np.empty_like(imgs)
+        for img, dst in zip(imgs, out):
+            cv2.warpAffine(
+                img,
+                matrix, (img_w, img_h),
+                dst=dst,
+                flags=cv2.INTER_LINEAR,
+                borderMode=cv2.BORDER_CONSTANT,
+                borderValue=0)
+        return out
+
+    @staticmethod
+    def _rotate_bboxes(bboxes, angle, img_h, img_w):
+        """Rotate the corners of the bboxes and take their bounding boxes,
+        clipped by the frame."""
+        bboxes = np.asarray(bboxes, dtype=np.float32).reshape(-1, 4)
+        matrix = NativeImgaug._rotation_matrix(angle, img_h, img_w)
+        # the pixel of index i spans [i, i + 1) in the bbox coordinates, so
+        # the corners are rotated with the same matrix as the pixel indices
+        corners = bboxes[:, [[0, 1], [2, 1], [0, 3], [2, 3]]] - 0.5
+        corners = corners @ matrix[:, :2].T + matrix[:, 2] + 0.5
+        rotated = np.concatenate([corners.min(axis=1),
+                                  corners.max(axis=1)],
+                                 axis=1)
+        np.clip(rotated[:, 0::2], 0, img_w, out=rotated[:, 0::2])
+        np.clip(rotated[:, 1::2], 0, img_h, out=rotated[:, 1::2])
+        return rotated.astype(np.float32)
+
+    @staticmethod
+    def _blur(imgs):
+        """Blur the frames by one of gaussian, average and median blurs."""
+        blur_type = np.random.randint(3)
+        if blur_type == 0:
+            sigma = np.random.uniform(0, 0.5)
+            if sigma < 1e-3:
+                return imgs
+            blur = partial(cv2.GaussianBlur, ksize=(5, 5), sigmaX=sigma)
+        elif blur_type == 1:
+            ksize = np.random.randint(2, 8)
+            blur = partial(cv2.blur, ksize=(ksize, ksize))
+        else:
+            ksize = np.random.randint(3, 12)
+            ksize = ksize + 1 if ksize % 2 == 0 else ksize
+            blur = partial(cv2.medianBlur, ksize=ksize)
+        out = np.empty_like(imgs)
+        for img, dst in zip(imgs, out):
+            blur(img, dst=dst)
+        return out
+
+    @staticmethod
+    def _dropout(imgs):
+        """Set random pixels or rectangular areas of the frames to 0."""
+        img_h, img_w, num_channels = imgs.shape[1:]
+        if np.random.randint(2) == 0:
+            p = np.random.uniform(0.01, 0.1)
+            per_channel = np.random.rand() < 0.5
+            mask_shape = (img_h, img_w, num_channels if per_channel else 1)
+            mask = np.random.rand(*mask_shape) >= p
+        else:
+            p = np.random.uniform(0.03, 0.15)
+            size_percent = np.random.uniform(0.02, 0.05, 2)
+            per_channel = np.random.rand() < 0.2
+            mask_h, mask_w = np.maximum(
+                (size_percent * [img_h, img_w]).astype(np.int32), 3)
+            mask = np.random.rand(mask_h, mask_w,
+                                  num_channels if per_channel else 1) >= p
+            mask = cv2.resize(
+                mask.astype(np.uint8), (img_w, img_h),
+                interpolation=cv2.INTER_NEAREST).reshape(img_h, img_w, -1)
+        return imgs * mask.astype(np.uint8)
+
+    @staticmethod
+    def _gaussian_noise(imgs):
+        """Add the same gaussian noise to all the frames."""
+        img_h, img_w, num_channels = imgs.shape[1:]
+        scale = np.random.uniform(0, 0.05 * 255)
+        per_channel = np.random.rand() < 0.5
+        noise = np.random.normal(
+            0, scale, (img_h, img_w,
+                       num_channels if per_channel else 1)).astype(np.float32)
+        out = imgs + noise
+        np.rint(out, out=out)
+        np.clip(out, 0, 255, out=out)
+        return out.astype(np.uint8)
+
+    def __call__(self, results):
+        assert results['modality'] == 'RGB', \
+            'NativeImgaug only support RGB images.'
+        imgs = results['imgs']
+        if not isinstance(imgs, np.ndarray):
+            imgs = np.stack(imgs)
+        if imgs.dtype != np.uint8:
+            raise TypeError('NativeImgaug only supports uint8 images, but '
+                            f'got {imgs.dtype}')
+        img_h, img_w = imgs.shape[1:3]
+
+        angle = np.random.uniform(-30, 30)
+        imgs = self._rotate(imgs, angle)
+
+        children = [self._blur, self._dropout, self._gaussian_noise]
+        num_children = np.random.randint(len(children) + 1)
+        chosen = np.sort(
+            np.random.choice(len(children), num_children, replace=False))
+        for i in chosen:
+            imgs = children[i](imgs)
+        results['imgs'] = imgs
+
+        if 'gt_bboxes' in results:
+            results['gt_bboxes'] = self._rotate_bboxes(results['gt_bboxes'],
+                                                       angle, img_h, img_w)
+            if 'proposals' in results:
+                results['proposals'] = self._rotate_bboxes(
+                    results['proposals'], angle, img_h, img_w)
+
+        results['img_shape'] = (img_h, img_w)
+
+        return results
+
+    def __repr__(self):
+        repr_str = self.__class__.__name__ + f'(transforms={self.transforms})'
+        return repr_str
+
+
 @PIPELINES.register_module()
 class Fuse:
     """Fuse lazy operations.
 
     Fusion order:
-        crop -> resize -> flip
+        crop -> resize -> flip -> color jitter (optional) -> normalize
+        (optional)
+
+    If a multi-view crop, e.g. ``ThreeCrop`` or ``TenCrop``, is lazy, each
+    frame is cropped and resized once, then all the views are cropped,
+    flipped if required, and written into one preallocated array.
 
     Required keys are "imgs", "img_shape" and "lazy", added or modified keys
-    are "imgs", "lazy".
-    Required keys in "lazy" are "crop_bbox", "interpolation", "flip_direction".
+    are "imgs", "lazy". If "img_norm_cfg" is given, required keys also
+    include "modality", and added key is "img_norm_cfg".
+    Required keys in "lazy" are "crop_bbox", "interpolation", "flip_direction",
+    and "color_transforms", "color_keep_uint8" if ``ColorJitter`` is lazy,
+    and "views", "view_flips", "source_shape" if a multi-view crop is lazy.
+
+    Args:
+        img_norm_cfg (dict | None): Arguments of ``Normalize``. If set, every
+            frame is cropped, resized, flipped, converted from RGB to BGR if
+            required, and normalized in one pass into a preallocated float32
+            array, so ``Normalize`` should not be applied again after
+            ``Fuse``. The results are the same as ``Fuse`` followed by
+            ``Normalize``. Default: None.
     """
 
+    def __init__(self, img_norm_cfg=None):
+        self.img_norm_cfg = img_norm_cfg
+        self.normalize = None
+        if img_norm_cfg is not None:
+            self.normalize = Normalize(**img_norm_cfg)
+
+    def _get_norm_matrices(self, color_transforms, num_imgs):
+        """Get the affine transform of each RGB frame, which jitters the color
+        if required and normalizes the frame."""
+        norm = self.normalize
+        norm_matrix = norm._get_norm_matrix(norm.to_bgr)
+        if color_transforms is None:
+            return np.broadcast_to(norm_matrix,
+                                   (num_imgs, ) + norm_matrix.shape)
+        # the color jitter and the normalization of each frame are composed
+        # into one affine transform
+        linear = norm_matrix[:, :3] @ color_transforms[..., :3]
+        offset = (
+            norm_matrix[:, :3] @ color_transforms[..., 3:] +
+            norm_matrix[:, 3:])
+        return np.concatenate([linear, offset], axis=2)
+
+    def _fuse_views(self, imgs, crop_bbox, interpolation, flip_direction,
+                    color_transforms, lazyop, results):
+        """Crop and resize each frame once, then crop all the views from it
+        into one array."""
+        left, top, right, bottom = crop_bbox
+        src_h, src_w = lazyop['source_shape']
+        img_h, img_w = results['img_shape']
+        views = lazyop['views']
+        # flips of the views and the lazy flip are combined
+        h_flips = lazyop['view_flips'] != (flip_direction == 'horizontal')
+        v_flip = flip_direction == 'vertical'
+        # x flow is inverted by the lazy flip, but not by the views flipped
+        invert_x_flow = (
+            results.get('modality') == 'Flow'
+            and flip_direction == 'horizontal')
+
+        num_imgs = len(imgs)
+        # RGB views are jittered and normalized as they are written, unless
+        # the color jitter is rounded in uint8 first
+        norm_matrices = None
+        if (self.normalize is not None and results['modality'] == 'RGB'
+                and not (color_transforms is not None
+                         and lazyop['color_keep_uint8'])):
+            norm_matrices = self._get_norm_matrices(color_transforms, num_imgs)
+            dtype = np.float32
+        else:
+            dtype = imgs[0].dtype
+        out = np.empty(
+            (len(views) * num_imgs, img_h, img_w) + imgs[0].shape[2:],
+            dtype=dtype)
+        resized = None
+        flipped = None
+        for i, img in enumerate(imgs):
+            img = img[top:bottom, left:right]
+            if img.shape[:2] != (src_h, src_w):
+                if resized is None:
+                    resized = np.empty(
+                        (src_h, src_w) + img.shape[2:], dtype=img.dtype)
+                img = cv2.resize(
+                    img, (src_w, src_h),
+                    dst=resized,
+                    interpolation=cv2_interp_codes[interpolation])
+            for j, (view_left, view_top, view_right,
+                    view_bottom) in enumerate(views):
+                view = img[view_top:view_bottom, view_left:view_right]
+                dst = out[j * num_imgs + i]
+                flip_code = None
+                if h_flips[j] and v_flip:
+                    flip_code = -1
+                elif h_flips[j]:
+                    flip_code = 1
+                elif v_flip:
+                    flip_code = 0
+
+                if norm_matrices is not None:
+                    if flip_code is not None:
+                        if flipped is None:
+                            flipped = np.empty_like(view)
+                        view = cv2.flip(view, flip_code, dst=flipped)
+                    dst[...] = view
+                    cv2.transform(dst, norm_matrices[i], dst)
+                    continue
+
+                if flip_code is not None:
+                    cv2.flip(view, flip_code, dst=dst)
+                else:
+                    dst[...] = view
+                if invert_x_flow and i % 2 == 0:
+                    np.subtract(255, dst, out=dst)
+
+        if norm_matrices is not None:
+            norm = self.normalize
+            results['imgs'] = out
+            results['img_norm_cfg'] = dict(
+                mean=norm.mean, std=norm.std, to_bgr=norm.to_bgr)
+            return results
+
+        if color_transforms is not None:
+            color_transforms = np.tile(color_transforms, (len(views), 1, 1))
+            if lazyop['color_keep_uint8']:
+                out = ColorJitter._jitter_clip_uint8(out, color_transforms)
+            else:
+                out = ColorJitter._jitter_clip(out, color_transforms)
+
+        results['imgs'] = out
+        if self.normalize is not None:
+            results = self.normalize(results)
+        return results
+
+    def _fuse_normalize(self, imgs, crop_bbox, img_shape, interpolation,
+                        flip_direction, color_transforms, color_keep_uint8,
+                        results):
+        """Crop, resize, flip, jitter the color and normalize the frames into
+        one float32 array."""
+        left, top, right, bottom = crop_bbox
+        img_h, img_w = img_shape
+        modality = results['modality']
+        norm = self.normalize
+
+        num_imgs = len(imgs)
+        uint8_transforms = None
+        if modality == 'RGB':
+            num_channels = imgs[0].shape[2]
+            out = np.empty((num_imgs, img_h, img_w, num_channels),
+                           dtype=np.float32)
+            if color_transforms is not None and color_keep_uint8:
+                # the color jitter is rounded and saturated in uint8 before
+                # the normalization
+                uint8_transforms = ColorJitter._get_uint8_transforms(
+                    color_transforms)
+                color_transforms = None
+            norm_matrices = self._get_norm_matrices(color_transforms, num_imgs)
+        elif modality == 'Flow':
+            assert num_imgs % 2 == 0
+            assert norm.mean.shape[0] == 2
+            assert norm.std.shape[0] == 2
+            out = np.empty((num_imgs // 2, img_h, img_w, 2), dtype=np.float32)
+            mean = norm.mean
+            std_inv = 1 / norm.std
+            if norm.adjust_magnitude:
+                std_inv = std_inv * results['scale_factor'][:2]
+        else:
+            raise NotImplementedError
+
+        # buffers reused by all the frames
+        resized = None
+        flipped = None
+        jittered = None
+        flow = None
+        for i, img in enumerate(imgs):
+            img = img[top:bottom, left:right]
+            if img.shape[:2] != (img_h, img_w):
+                if resized is None or resized.dtype != img.dtype:
+                    resized = np.empty(
+                        (img_h, img_w) + img.shape[2:], dtype=img.dtype)
+                img = cv2.resize(
+                    img, (img_w, img_h),
+                    dst=resized,
+                    interpolation=cv2_interp_codes[interpolation])
+            if flip_direction is not None:
+                if flipped is None or flipped.dtype != img.dtype:
+                    flipped = np.empty_like(img)
+                img = cv2.flip(
+                    img,
+                    1 if flip_direction == 'horizontal' else 0,
+                    dst=flipped)
+
+            if modality == 'RGB':
+                if uint8_transforms is not None:
+                    if jittered is None:
+                        jittered = np.empty_like(img)
+                    img = cv2.transform(img, uint8_transforms[i], jittered)
+                dst = out[i]
+                dst[...] = img
+                cv2.transform(dst, norm_matrices[i], dst)
+            else:
+                if flow is None:
+                    flow = np.empty((img_h, img_w), dtype=np.float32)
+                flow[...] = img
+                channel = i % 2
+                if channel == 0 and flip_direction == 'horizontal':
+                    # x flow is inverted when flipped horizontally
+                    np.subtract(255 - mean[channel], flow, out=flow)
+                else:
+                    flow -= mean[channel]
+                flow *= std_inv[channel]
+                out[i // 2, ..., channel] = flow
+
+        results['imgs'] = out
+        results['img_norm_cfg'] = dict(
+            mean=norm.mean, std=norm.std, to_bgr=norm.to_bgr)
+        if modality == 'Flow':
+            results['img_norm_cfg']['adjust_magnitude'] = norm.adjust_magnitude
+        return results
+
     def __call__(self, results):
         if 'lazy' not in results:
             raise ValueError('No lazy operation detected')
@@ -279,7 +693,6 @@ class Fuse:
 
         # crop
         left, top, right, bottom = lazyop['crop_bbox'].round().astype(int)
-        imgs = [img[top:bottom, left:right] for img in imgs]
 
         # resize
         img_h, img_w = results['img_shape']
@@ -287,21 +700,141 @@ class Fuse:
             interpolation = 'bilinear'
         else:
             interpolation = lazyop['interpolation']
-        imgs = [
-            mmcv.imresize(img, (img_w, img_h), interpolation=interpolation)
-            for img in imgs
-        ]
 
-        # flip
-        if lazyop['flip']:
-            for img in imgs:
-                mmcv.imflip_(img, lazyop['flip_direction'])
+        flip_direction = lazyop['flip_direction'] if lazyop['flip'] else None
+        color_transforms = lazyop.get('color_transforms')
+        if (color_transforms is not None
+                and results.get('modality', 'RGB') != 'RGB'):
+            raise NotImplementedError(
+                'ColorJitter only supports frames in RGB modality')
+
+        if 'views' in lazyop:
+            results = self._fuse_views(imgs, (left, top, right, bottom),
+                                       interpolation, flip_direction,
+                                       color_transforms, lazyop, results)
+            del results['lazy']
+            return results
 
-        results['imgs'] = imgs
+        if self.normalize is not None:
+            results = self._fuse_normalize(imgs, (left, top, right, bottom),
+                                           (img_h, img_w), interpolation,
+                                           flip_direction, color_transforms,
+                                           lazyop.get('color_keep_uint8'),
+                                           results)
+            del results['lazy']
+            return results
+
+        # the frames are written into one preallocated array, so that
+        # FormatShape only makes a view of it instead of stacking the frames
+        num_imgs = len(imgs)
+        out = np.empty(
+            (num_imgs, img_h, img_w) + imgs[0].shape[2:], dtype=imgs[0].dtype)
+        flip_code = None
+        if flip_direction is not None:
+            flip_code = 1 if flip_direction == 'horizontal' else 0
+        # flow with even indexes are x_flow, which need to be inverted when
+        # doing horizontal flip
+        invert_x_flow = (
+            results.get('modality') == 'Flow'
+            and flip_direction == 'horizontal')
+        uint8_transforms = None
+        if color_transforms is not None and lazyop['color_keep_uint8']:
+            uint8_transforms = ColorJitter._get_uint8_transforms(
+                color_transforms)
+
+        resized = None
+        for i, img in enumerate(imgs):
+            # crop
+            img = img[top:bottom, left:right]
+            dst = out[i]
+
+            # resize
+            if img.shape[:2] != (img_h, img_w):
+                if flip_code is None:
+                    img = cv2.resize(
+                        img, (img_w, img_h),
+                        dst=dst,
+                        interpolation=cv2_interp_codes[interpolation])
+                else:
+                    if resized is None:
+                        resized = np.empty_like(dst)
+                    img = cv2.resize(
+                        img, (img_w, img_h),
+                        dst=resized,
+                        interpolation=cv2_interp_codes[interpolation])
+
+            # flip
+            if flip_code is not None:
+                cv2.flip(img, flip_code, dst=dst)
+            elif img is not dst:
+                dst[...] = img
+            if invert_x_flow and i % 2 == 0:
+                np.subtract(255, dst, out=dst)
+
+            # color jitter
+            if uint8_transforms is not None:
+                cv2.transform(dst, uint8_transforms[i], dst)
+
+        if color_transforms is not None and uint8_transforms is None:
+            out = ColorJitter._jitter_clip(out, color_transforms)
+
+        results['imgs'] = out
         del results['lazy']
 
         return results
 
+    def __repr__(self):
+        repr_str = (f'{self.__class__.__name__}('
+                    f'img_norm_cfg={self.img_norm_cfg})')
+        return repr_str
+
+
+@PIPELINES.register_module()
+class PackLazyParams:
+    """Pack the parameters of lazy operations to apply them on the device.
+
+    Instead of applying the lazy operations on the frames as ``Fuse`` does,
+    the recorded random parameters are packed into arrays, so that the frames
+    of a whole batch are cropped, resized, flipped and color jittered together
+    on the device by :class:`mmaction.utils.module_hooks.GPUAugment`. The
+    frames are left as they are, so they should share the same shape across
+    samples, e.g. by a non-lazy ``Resize`` with ``keep_ratio=False`` before
+    the lazy operations.
+
+    Required keys are "imgs", "img_shape" and "lazy", added or modified keys
+    are "lazy_params" and "lazy". "lazy_params" is a dict of
+    "crop_bbox" (np.ndarray of shape (4, ) in float32), "img_shape"
+    (np.ndarray of shape (2, ) in int64), "flip" (np.ndarray of shape (2, )
+    in float32, whether to flip horizontally and vertically), and
+    "color_transforms" (np.ndarray of shape (N, 3, 4) in float32) if
+    ``ColorJitter`` is lazy.
+    """
+
+    def __call__(self, results):
+        if 'lazy' not in results:
+            raise ValueError('No lazy operation detected')
+        if results.get('modality', 'RGB') != 'RGB':
+            raise NotImplementedError(
+                'Only frames in RGB modality are supported')
+        if 'views' in results['lazy']:
+            raise NotImplementedError('Multi-view crops are not supported')
+        lazyop = results.pop('lazy')
+
+        flip_direction = lazyop['flip_direction'] if lazyop['flip'] else None
+        flip = [flip_direction == 'horizontal', flip_direction == 'vertical']
+        lazy_params = dict(
+            crop_bbox=lazyop['crop_bbox'].round().astype(np.float32),
+            img_shape=np.array(results['img_shape'], dtype=np.int64),
+            flip=np.array(flip, dtype=np.float32))
+        if 'color_transforms' in lazyop:
+            lazy_params['color_transforms'] = lazyop['color_transforms']
+        results['lazy_params'] = lazy_params
+
+        return results
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}()'
+
 
 @PIPELINES.register_module()
 class RandomScale:
@@ -570,6 +1103,9 @@ class RandomCrop:
             lazyop = results['lazy']
             if lazyop['flip']:
                 raise NotImplementedError('Put Flip at last for now')
+            if 'views' in lazyop:
+                raise NotImplementedError(
+                    'Put multi-view crops after other lazy operations')
 
             # record crop_bbox in lazyop dict to ensure only crop once in Fuse
             lazy_left, lazy_top, lazy_right, lazy_bottom = lazyop['crop_bbox']
@@ -723,6 +1259,9 @@ class RandomResizedCrop:
             lazyop = results['lazy']
             if lazyop['flip']:
                 raise NotImplementedError('Put Flip at last for now')
+            if 'views' in lazyop:
+                raise NotImplementedError(
+                    'Put multi-view crops after other lazy operations')
 
             # record crop_bbox in lazyop dict to ensure only crop once in Fuse
             lazy_left, lazy_top, lazy_right, lazy_bottom = lazyop['crop_bbox']
@@ -893,6 +1432,9 @@ class MultiScaleCrop:
             lazyop = results['lazy']
             if lazyop['flip']:
                 raise NotImplementedError('Put Flip at last for now')
+            if 'views' in lazyop:
+                raise NotImplementedError(
+                    'Put multi-view crops after other lazy operations')
 
             # record crop_bbox in lazyop dict to ensure only crop once in Fuse
             lazy_left, lazy_top, lazy_right, lazy_bottom = lazyop['crop_bbox']
@@ -1005,6 +1547,9 @@ class Resize:
             lazyop = results['lazy']
             if lazyop['flip']:
                 raise NotImplementedError('Put Flip at last for now')
+            if 'views' in lazyop:
+                raise NotImplementedError(
+                    'Put multi-view crops after other lazy operations')
             lazyop['interpolation'] = self.interpolation
 
         if 'gt_bboxes' in results:
@@ -1174,6 +1719,10 @@ class Normalize:
     keys are "imgs" and "img_norm_cfg". If modality is 'Flow', additional
     keys "scale_factor" is required
 
+    The frames can be given as a list or as one array of the clip, e.g. an
+    (N, H, W, C) uint8 array from a decoder. A C-contiguous float32 array of
+    RGB frames is normalized in place.
+
     Args:
         mean (Sequence[float]): Mean values of different channels.
         std (Sequence[float]): Std values of different channels.
@@ -1198,42 +1747,79 @@ class Normalize:
         self.to_bgr = to_bgr
         self.adjust_magnitude = adjust_magnitude
 
+    def _get_norm_matrix(self, to_bgr=False, scale=None):
+        """Get the affine transform of the channels that normalizes them.
+
+        Args:
+            to_bgr (bool): Whether to reverse the channels before the
+                normalization. Default: False.
+            scale (np.ndarray | None): Extra scale of each channel after the
+                normalization. Default: None.
+
+        Returns:
+            np.ndarray: Matrix in shape (C, C + 1) to be applied by
+                ``cv2.transform``.
+        """
+        num_channels = self.mean.shape[0]
+        std_inv = 1 / np.float64(self.std)
+        if scale is not None:
+            std_inv = std_inv * scale
+        matrix = np.zeros((num_channels, num_channels + 1))
+        for channel in range(num_channels):
+            src_channel = num_channels - 1 - channel if to_bgr else channel
+            matrix[channel, src_channel] = std_inv[channel]
+        matrix[:, -1] = -self.mean * std_inv
+        return matrix
+
     def __call__(self, results):
         modality = results['modality']
+        imgs = results['imgs']
 
+        # The clip is normalized into one (N, H, W, C) float32 array. Each
+        # frame is converted and transformed while it is still in the cache,
+        # which is faster than doing either over the whole clip at once.
         if modality == 'RGB':
-            n = len(results['imgs'])
-            h, w, c = results['imgs'][0].shape
-            imgs = np.empty((n, h, w, c), dtype=np.float32)
-            for i, img in enumerate(results['imgs']):
-                imgs[i] = img
-
-            for img in imgs:
-                mmcv.imnormalize_(img, self.mean, self.std, self.to_bgr)
-
-            results['imgs'] = imgs
+            norm_matrix = self._get_norm_matrix(self.to_bgr)
+            if (isinstance(imgs, np.ndarray) and imgs.dtype == np.float32
+                    and imgs.flags.c_contiguous):
+                # normalize in place
+                out = imgs
+                for dst in out:
+                    cv2.transform(dst, norm_matrix, dst)
+            else:
+                n = len(imgs)
+                h, w, c = imgs[0].shape
+                out = np.empty((n, h, w, c), dtype=np.float32)
+                for i in range(n):
+                    dst = out[i]
+                    dst[...] = imgs[i]
+                    cv2.transform(dst, norm_matrix, dst)
+
+            results['imgs'] = out
             results['img_norm_cfg'] = dict(
                 mean=self.mean, std=self.std, to_bgr=self.to_bgr)
             return results
         if modality == 'Flow':
-            num_imgs = len(results['imgs'])
+            num_imgs = len(imgs)
             assert num_imgs % 2 == 0
             assert self.mean.shape[0] == 2
             assert self.std.shape[0] == 2
             n = num_imgs // 2
-            h, w = results['imgs'][0].shape
-            x_flow = np.empty((n, h, w), dtype=np.float32)
-            y_flow = np.empty((n, h, w), dtype=np.float32)
-            for i in range(n):
-                x_flow[i] = results['imgs'][2 * i]
-                y_flow[i] = results['imgs'][2 * i + 1]
-            x_flow = (x_flow - self.mean[0]) / self.std[0]
-            y_flow = (y_flow - self.mean[1]) / self.std[1]
+            h, w = imgs[0].shape
+            scale = None
             if self.adjust_magnitude:
-                x_flow = x_flow * results['scale_factor'][0]
-                y_flow = y_flow * results['scale_factor'][1]
-            imgs = np.stack([x_flow, y_flow], axis=-1)
-            results['imgs'] = imgs
+                scale = np.float64(results['scale_factor'][:2])
+            norm_matrix = self._get_norm_matrix(scale=scale)
+
+            # x and y flow are interleaved in the input frames
+            out = np.empty((n, h, w, 2), dtype=np.float32)
+            for i in range(n):
+                dst = out[i]
+                dst[..., 0] = imgs[2 * i]
+                dst[..., 1] = imgs[2 * i + 1]
+                cv2.transform(dst, norm_matrix, dst)
+
+            results['imgs'] = out
             args = dict(
                 mean=self.mean,
                 std=self.std,
@@ -1270,7 +1856,18 @@ class ColorJitter:
     channel sequence.
 
     Required keys are "imgs", added or modified keys are "imgs", "eig_val",
-    "eig_vec", "alpha_std" and "color_space_aug".
+    "eig_vec", "alpha_std" and "color_space_aug". If lazy, added or modified
+    keys in "lazy" are "color_transforms" and "color_keep_uint8".
+
+    When the frames share the same shape, the distortions of each frame are
+    composed into one affine transform and the clip is output as one
+    (N, H, W, 3) float32 array. Otherwise the frames are distorted one by one.
+
+    With ``keep_uint8=True``, uint8 frames stay uint8 and the distorted values
+    are rounded and clipped into [0, 255]. In this mode the float conversion
+    and normalization are expected to be done on the device by
+    :class:`mmaction.utils.module_hooks.GPUNormalize`, which moves 4x fewer
+    bytes through the rest of the pipeline and the data loader.
 
     Args:
         color_space_aug (bool): Whether to apply color space augmentations. If
@@ -1284,13 +1881,30 @@ class ColorJitter:
         eig_vec (np.ndarray | None): Eigenvectors of [3 x 3] size for RGB
             channel jitter. If set to None, it will use the default
             eigenvectors. Default: None.
+        keep_uint8 (bool): Whether to keep uint8 frames in uint8 instead of
+            converting them into float32. Default: False.
+        lazy (bool): Determine whether to apply lazy operation. If set, the
+            affine transform of each frame is recorded in "color_transforms"
+            of "lazy", and applied by ``Fuse`` or on the device by
+            :class:`mmaction.utils.module_hooks.GPUAugment`. Default: False.
     """
 
+    # conversion between RGB and YIQ color spaces, used for hue distortion
+    _tyiq = np.array([[0.299, 0.587, 0.114], [0.596, -0.274, -0.321],
+                      [0.211, -0.523, 0.311]],
+                     dtype=np.float32)
+    _ityiq = np.array([[1.0, 0.956, 0.621], [1.0, -0.272, -0.647],
+                       [1.0, -1.107, 1.705]],
+                      dtype=np.float32)
+    _gray_weights = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
     def __init__(self,
                  color_space_aug=False,
                  alpha_std=0.1,
                  eig_val=None,
-                 eig_vec=None):
+                 eig_vec=None,
+                 keep_uint8=False,
+                 lazy=False):
         if eig_val is None:
             # note that the data range should be [0, 255]
             self.eig_val = np.array([55.46, 4.794, 1.148], dtype=np.float32)
@@ -1307,6 +1921,8 @@ class ColorJitter:
 
         self.alpha_std = alpha_std
         self.color_space_aug = color_space_aug
+        self.keep_uint8 = keep_uint8
+        self.lazy = lazy
 
     @staticmethod
     def brightness(img, delta):
@@ -1353,7 +1969,7 @@ class ColorJitter:
             np.ndarray: A saturation distorted image.
         """
         if np.random.rand() > 0.5:
-            gray = img * np.array([0.299, 0.587, 0.114], dtype=np.float32)
+            gray = img * ColorJitter._gray_weights
             gray = np.sum(gray, 2, keepdims=True)
             gray *= (1.0 - alpha)
             img = img * alpha
@@ -1373,51 +1989,162 @@ class ColorJitter:
             np.ndarray: A hue distorted image.
         """
         if np.random.rand() > 0.5:
-            u = np.cos(alpha * np.pi)
-            w = np.sin(alpha * np.pi)
-            bt = np.array([[1.0, 0.0, 0.0], [0.0, u, -w], [0.0, w, u]],
-                          dtype=np.float32)
-            tyiq = np.array([[0.299, 0.587, 0.114], [0.596, -0.274, -0.321],
-                             [0.211, -0.523, 0.311]],
-                            dtype=np.float32)
-            ityiq = np.array([[1.0, 0.956, 0.621], [1.0, -0.272, -0.647],
-                              [1.0, -1.107, 1.705]],
-                             dtype=np.float32)
-            t = np.dot(np.dot(ityiq, bt), tyiq).T
-            t = np.array(t, dtype=np.float32)
+            t = ColorJitter._hue_matrix(alpha)
             img = np.dot(img, t)
         return img
 
+    @staticmethod
+    def _hue_matrix(alpha):
+        """Get the matrix which rotates the hue of pixels in rows."""
+        u = np.cos(alpha * np.pi)
+        w = np.sin(alpha * np.pi)
+        bt = np.array([[1.0, 0.0, 0.0], [0.0, u, -w], [0.0, w, u]],
+                      dtype=np.float32)
+        t = np.dot(np.dot(ColorJitter._ityiq, bt), ColorJitter._tyiq).T
+        return np.array(t, dtype=np.float32)
+
+    def _color_space_transforms(self, num_imgs, bright_delta, contrast_alpha,
+                                saturation_alpha, hue_alpha, jitter_coin):
+        """Compose the color space distortions of each frame into one affine
+        transform.
+
+        The distortions are applied on a frame with the random coins drawn in
+        the same order as :meth:`brightness`, :meth:`contrast`,
+        :meth:`saturation` and :meth:`hue` do when applied frame by frame.
+
+        Args:
+            num_imgs (int): Number of frames.
+            bright_delta (float): Delta value to distort brightness.
+            contrast_alpha (float): Alpha value to distort contrast.
+            saturation_alpha (float): Alpha value to distort the saturation.
+            hue_alpha (float): Alpha value to control the degree of rotation
+                for hue.
+            jitter_coin (float): Coin deciding whether contrast is distorted
+                before saturation and hue or after them.
+
+        Returns:
+            tuple[np.ndarray]: Matrices in shape (num_imgs, 3, 3) and offsets
+                in shape (num_imgs, 3), so that a distorted pixel in a row is
+                ``pixel @ matrix + offset``.
+        """
+        contrast = (contrast_alpha * np.eye(3), np.zeros(3))
+        saturation = (saturation_alpha * np.eye(3) + (1.0 - saturation_alpha) *
+                      np.outer(self._gray_weights, np.ones(3)), np.zeros(3))
+        hue = (np.float64(self._hue_matrix(hue_alpha)), np.zeros(3))
+        if jitter_coin > 0.5:
+            distortions = [contrast, saturation, hue]
+        else:
+            distortions = [saturation, hue, contrast]
+
+        coins = np.random.rand(num_imgs, 4) > 0.5
+        matrices = np.tile(np.eye(3), (num_imgs, 1, 1))
+        offsets = np.zeros((num_imgs, 3))
+        offsets[coins[:, 0]] += bright_delta
+        for i, (matrix, offset) in enumerate(distortions):
+            applied = coins[:, i + 1]
+            matrices[applied] = matrices[applied] @ matrix
+            offsets[applied] = offsets[applied] @ matrix + offset
+        return matrices, offsets
+
+    @staticmethod
+    def _jitter_clip(imgs, transforms):
+        """Apply the affine transform of each frame to the frames stacked in
+        one (N, H, W, 3) float32 array."""
+        num_imgs = len(imgs)
+        out = np.empty((num_imgs, ) + imgs[0].shape, dtype=np.float32)
+        for i in range(num_imgs):
+            dst = out[i]
+            dst[...] = imgs[i]
+            cv2.transform(dst, transforms[i], dst)
+        return out
+
+    @staticmethod
+    def _get_uint8_transforms(transforms):
+        """Get the affine transforms to apply on uint8 frames by
+        ``cv2.transform``."""
+        # OpenCV distorts uint8 pixels with a diagonal matrix, e.g. only in
+        # brightness and contrast, in a slow path which is about 20x slower
+        # than with a full matrix, so a negligible value (less than 0.01 in
+        # [0, 255]) is put off the diagonal. This is also about 8x faster
+        # than lookup tables of the channels.
+        transforms = transforms.astype(np.float64)
+        transforms[:, :, :3] += (1 - np.eye(3)) * 1e-5
+        return transforms
+
+    @staticmethod
+    def _jitter_clip_uint8(imgs, transforms, same_shape=True):
+        """Apply the affine transform of each frame to uint8 frames, and keep
+        the distorted frames in uint8."""
+        num_imgs = len(imgs)
+        if same_shape:
+            out = np.empty((num_imgs, ) + imgs[0].shape, dtype=np.uint8)
+        else:
+            out = [np.empty_like(img) for img in imgs]
+        transforms = ColorJitter._get_uint8_transforms(transforms)
+        for i in range(num_imgs):
+            # cv2.transform rounds and saturates the distorted values
+            cv2.transform(imgs[i], transforms[i], out[i])
+        return out
+
     def __call__(self, results):
         imgs = results['imgs']
-        out = []
+        if self.lazy:
+            _init_lazy_if_proper(results, self.lazy)
+            if 'color_transforms' in results['lazy']:
+                raise NotImplementedError(
+                    'Use ColorJitter with lazy=True only once before Fuse')
+
+        # the color space distortions and the PCA based noise are affine
+        # transforms of the pixels, so a clip with frames of the same shape
+        # is distorted with one precomputed transform per frame
+        if self.lazy or isinstance(imgs, np.ndarray):
+            same_shape = True
+        else:
+            same_shape = len(imgs) > 0 and all(img.shape == imgs[0].shape
+                                               for img in imgs)
         if self.color_space_aug:
             bright_delta = np.random.uniform(-32, 32)
             contrast_alpha = np.random.uniform(0.6, 1.4)
             saturation_alpha = np.random.uniform(0.6, 1.4)
             hue_alpha = np.random.uniform(-18, 18)
             jitter_coin = np.random.rand()
-            for img in imgs:
-                img = self.brightness(img, delta=bright_delta)
-                if jitter_coin > 0.5:
-                    img = self.contrast(img, alpha=contrast_alpha)
-                    img = self.saturation(img, alpha=saturation_alpha)
-                    img = self.hue(img, alpha=hue_alpha)
-                else:
-                    img = self.saturation(img, alpha=saturation_alpha)
-                    img = self.hue(img, alpha=hue_alpha)
-                    img = self.contrast(img, alpha=contrast_alpha)
-                out.append(img)
-        else:
-            out = imgs
 
-        # Add PCA based noise
-        alpha = np.random.normal(0, self.alpha_std, size=(3, ))
-        rgb = np.array(
-            np.dot(self.eig_vec * alpha, self.eig_val), dtype=np.float32)
-        rgb = rgb[None, None, ...]
+        keep_uint8 = self.keep_uint8 and all(img.dtype == np.uint8
+                                             for img in imgs)
+        if same_shape or keep_uint8:
+            if self.color_space_aug:
+                matrices, offsets = self._color_space_transforms(
+                    len(imgs), bright_delta, contrast_alpha, saturation_alpha,
+                    hue_alpha, jitter_coin)
+            else:
+                matrices = np.tile(np.eye(3), (len(imgs), 1, 1))
+                offsets = np.zeros((len(imgs), 3))
+            offsets = offsets + self._pca_noise()
+            # cv2.transform takes pixels in columns
+            transforms = np.concatenate(
+                [matrices.transpose(0, 2, 1), offsets[..., None]],
+                axis=2).astype(np.float32)
+            if self.lazy:
+                lazyop = results['lazy']
+                lazyop['color_transforms'] = transforms
+                lazyop['color_keep_uint8'] = keep_uint8
+            elif keep_uint8:
+                results['imgs'] = self._jitter_clip_uint8(
+                    imgs, transforms, same_shape)
+            else:
+                results['imgs'] = self._jitter_clip(imgs, transforms)
+        else:
+            if self.color_space_aug:
+                out = [
+                    self._jitter_img(img, bright_delta, contrast_alpha,
+                                     saturation_alpha, hue_alpha, jitter_coin)
+                    for img in imgs
+                ]
+            else:
+                out = imgs
+            rgb = self._pca_noise().astype(np.float32)[None, None, ...]
+            results['imgs'] = [img + rgb for img in out]
 
-        results['imgs'] = [img + rgb for img in out]
         results['eig_val'] = self.eig_val
         results['eig_vec'] = self.eig_vec
         results['alpha_std'] = self.alpha_std
@@ -1425,12 +2152,34 @@ class ColorJitter:
 
         return results
 
+    def _pca_noise(self):
+        """Draw the PCA based noise of RGB channels."""
+        alpha = np.random.normal(0, self.alpha_std, size=(3, ))
+        return np.array(
+            np.dot(self.eig_vec * alpha, self.eig_val), dtype=np.float32)
+
+    def _jitter_img(self, img, bright_delta, contrast_alpha, saturation_alpha,
+                    hue_alpha, jitter_coin):
+        """Apply the color space distortions on one frame."""
+        img = self.brightness(img, delta=bright_delta)
+        if jitter_coin > 0.5:
+            img = self.contrast(img, alpha=contrast_alpha)
+            img = self.saturation(img, alpha=saturation_alpha)
+            img = self.hue(img, alpha=hue_alpha)
+        else:
+            img = self.saturation(img, alpha=saturation_alpha)
+            img = self.hue(img, alpha=hue_alpha)
+            img = self.contrast(img, alpha=contrast_alpha)
+        return img
+
     def __repr__(self):
         repr_str = (f'{self.__class__.__name__}('
                     f'color_space_aug={self.color_space_aug}, '
                     f'alpha_std={self.alpha_std}, '
                     f'eig_val={self.eig_val}, '
-                    f'eig_vec={self.eig_vec})')
+                    f'eig_vec={self.eig_vec}, '
+                    f'keep_uint8={self.keep_uint8}, '
+                    f'lazy={self.lazy})')
         return repr_str
 
 
@@ -1502,6 +2251,9 @@ class CenterCrop:
             lazyop = results['lazy']
             if lazyop['flip']:
                 raise NotImplementedError('Put Flip at last for now')
+            if 'views' in lazyop:
+                raise NotImplementedError(
+                    'Put multi-view crops after other lazy operations')
 
             # record crop_bbox in lazyop dict to ensure only crop once in Fuse
             lazy_left, lazy_top, lazy_right, lazy_bottom = lazyop['crop_bbox']
@@ -1535,14 +2287,17 @@ class ThreeCrop:
     Crop the images equally into three crops with equal intervals along the
     shorter side.
     Required keys are "imgs", "img_shape", added or modified keys are "imgs",
-    "crop_bbox" and "img_shape".
+    "crop_bbox", "lazy" and "img_shape". Added keys in "lazy" are "views",
+    "view_flips" and "source_shape".
 
     Args:
         crop_size(int | tuple[int]): (w, h) of crop size.
+        lazy (bool): Determine whether to apply lazy operation. Default: False.
     """
 
-    def __init__(self, crop_size):
+    def __init__(self, crop_size, lazy=False):
         self.crop_size = _pair(crop_size)
+        self.lazy = lazy
         if not mmcv.is_tuple_of(self.crop_size, int):
             raise TypeError(f'Crop_size must be int or tuple of int, '
                             f'but got {type(crop_size)}')
@@ -1554,10 +2309,13 @@ class ThreeCrop:
             results (dict): The resulting dict to be modified and passed
                 to the next transform in pipeline.
         """
-        _init_lazy_if_proper(results, False)
+        _init_lazy_if_proper(results, self.lazy)
 
         imgs = results['imgs']
-        img_h, img_w = results['imgs'][0].shape[:2]
+        if self.lazy:
+            img_h, img_w = results['img_shape']
+        else:
+            img_h, img_w = results['imgs'][0].shape[:2]
         crop_w, crop_h = self.crop_size
         assert crop_h == img_h or crop_w == img_w
 
@@ -1576,6 +2334,13 @@ class ThreeCrop:
                 (0, h_step),  # middle
             ]
 
+        if self.lazy:
+            views = [[x, y, x + crop_w, y + crop_h] for x, y in offsets]
+            _record_lazy_views(results, views)
+            results['crop_bbox'] = np.repeat(views, len(imgs), axis=0)
+            results['img_shape'] = (crop_h, crop_w)
+            return results
+
         cropped = []
         crop_bboxes = []
         for x_offset, y_offset in offsets:
@@ -1595,7 +2360,8 @@ class ThreeCrop:
         return results
 
     def __repr__(self):
-        repr_str = f'{self.__class__.__name__}(crop_size={self.crop_size})'
+        repr_str = (f'{self.__class__.__name__}(crop_size={self.crop_size}, '
+                    f'lazy={self.lazy})')
         return repr_str
 
 
@@ -1606,14 +2372,17 @@ class TenCrop:
     Crop the four corners and the center part of the image with the same
     given crop_size, and flip it horizontally.
     Required keys are "imgs", "img_shape", added or modified keys are "imgs",
-    "crop_bbox" and "img_shape".
+    "crop_bbox", "lazy" and "img_shape". Added keys in "lazy" are "views",
+    "view_flips" and "source_shape".
 
     Args:
         crop_size(int | tuple[int]): (w, h) of crop size.
+        lazy (bool): Determine whether to apply lazy operation. Default: False.
     """
 
-    def __init__(self, crop_size):
+    def __init__(self, crop_size, lazy=False):
         self.crop_size = _pair(crop_size)
+        self.lazy = lazy
         if not mmcv.is_tuple_of(self.crop_size, int):
             raise TypeError(f'Crop_size must be int or tuple of int, '
                             f'but got {type(crop_size)}')
@@ -1625,11 +2394,14 @@ class TenCrop:
             results (dict): The resulting dict to be modified and passed
                 to the next transform in pipeline.
         """
-        _init_lazy_if_proper(results, False)
+        _init_lazy_if_proper(results, self.lazy)
 
         imgs = results['imgs']
 
-        img_h, img_w = results['imgs'][0].shape[:2]
+        if self.lazy:
+            img_h, img_w = results['img_shape']
+        else:
+            img_h, img_w = results['imgs'][0].shape[:2]
         crop_w, crop_h = self.crop_size
 
         w_step = (img_w - crop_w) // 4
@@ -1643,6 +2415,15 @@ class TenCrop:
             (2 * w_step, 2 * h_step),  # center
         ]
 
+        if self.lazy:
+            # each view is followed by its flipped copy
+            views = [[x, y, x + crop_w, y + crop_h] for x, y in offsets
+                     for _ in range(2)]
+            _record_lazy_views(results, views, [False, True] * len(offsets))
+            results['crop_bbox'] = np.repeat(views, len(imgs), axis=0)
+            results['img_shape'] = (crop_h, crop_w)
+            return results
+
         img_crops = list()
         crop_bboxes = list()
         for x_offset, y_offsets in offsets:
@@ -1664,7 +2445,8 @@ class TenCrop:
         return results
 
     def __repr__(self):
-        repr_str = f'{self.__class__.__name__}(crop_size={self.crop_size})'
+        repr_str = (f'{self.__class__.__name__}(crop_size={self.crop_size}, '
+                    f'lazy={self.lazy})')
         return repr_str
 
 
@@ -1674,17 +2456,20 @@ class MultiGroupCrop:
 
     Crop the random region with the same given crop_size and bounding box
     into several groups.
-    Required keys are "imgs", added or modified keys are "imgs", "crop_bbox"
-    and "img_shape".
+    Required keys are "imgs", added or modified keys are "imgs", "crop_bbox",
+    "lazy" and "img_shape". Added keys in "lazy" are "views", "view_flips"
+    and "source_shape".
 
     Args:
         crop_size(int | tuple[int]): (w, h) of crop size.
         groups(int): Number of groups.
+        lazy (bool): Determine whether to apply lazy operation. Default: False.
     """
 
-    def __init__(self, crop_size, groups):
+    def __init__(self, crop_size, groups, lazy=False):
         self.crop_size = _pair(crop_size)
         self.groups = groups
+        self.lazy = lazy
         if not mmcv.is_tuple_of(self.crop_size, int):
             raise TypeError('Crop size must be int or tuple of int, '
                             f'but got {type(crop_size)}')
@@ -1703,9 +2488,25 @@ class MultiGroupCrop:
                 to the next transform in pipeline.
         """
         imgs = results['imgs']
-        img_h, img_w = imgs[0].shape[:2]
+        if self.lazy:
+            _init_lazy_if_proper(results, self.lazy)
+            img_h, img_w = results['img_shape']
+        else:
+            img_h, img_w = imgs[0].shape[:2]
         crop_w, crop_h = self.crop_size
 
+        if self.lazy:
+            views = []
+            for _ in range(self.groups):
+                x_offset = random.randint(0, img_w - crop_w)
+                y_offset = random.randint(0, img_h - crop_h)
+                views.append(
+                    [x_offset, y_offset, x_offset + crop_w, y_offset + crop_h])
+            _record_lazy_views(results, views)
+            results['crop_bbox'] = np.repeat(views, len(imgs), axis=0)
+            results['img_shape'] = (crop_h, crop_w)
+            return results
+
         img_crops = []
         crop_bboxes = []
         for _ in range(self.groups):
@@ -1730,7 +2531,8 @@ class MultiGroupCrop:
     def __repr__(self):
         repr_str = (f'{self.__class__.__name__}'
                     f'(crop_size={self.crop_size}, '
-                    f'groups={self.groups})')
+                    f'groups={self.groups}, '
+                    f'lazy={self.lazy})')
         return repr_str
 
 
@@ -1777,6 +2579,20 @@ class MelSpectrogram:
     Required keys are "audios", "sample_rate", "num_clips", added or modified
     keys are "audios".
 
+    The melspectrogram of each clip is in shape (fixed_length, n_mels). If
+    ``cache_dir`` is set, the melspectrogram of the whole audio file is
+    computed once and saved under ``cache_dir`` as a ``.npy`` file, which is
+    memory mapped and sliced w.r.t. "audio_clip_ranges" given by
+    ``AudioDecode`` afterwards, so that the STFT is not recomputed in every
+    epoch. The cache is keyed by the path, size and modification time of the
+    audio file, and only used for audio files on the local disk. Only the
+    clips starting at a multiple of the hop length are served from the cache,
+    where the frames whose windows cross the clip boundaries are still
+    computed from the clip, as they are padded differently. Thus the cached
+    melspectrograms are the same as the ones computed clip by clip, as long as
+    the clips are only amplified by ``AudioAmplify`` and not resampled when
+    read by ``AudioDecode``.
+
     Args:
         window_size (int): The window size in milisecond. Default: 32.
         step_size (int): The step size in milisecond. Default: 16.
@@ -1784,13 +2600,16 @@ class MelSpectrogram:
         fixed_length (int): The sample length of melspectrogram maybe not
             exactly as wished due to different fps, fix the length for batch
             collation by truncating or padding. Default: 128.
+        cache_dir (str | None): Directory to store the melspectrograms of
+            whole audio files. Default: None.
     """
 
     def __init__(self,
                  window_size=32,
                  step_size=16,
                  n_mels=80,
-                 fixed_length=128):
+                 fixed_length=128,
+                 cache_dir=None):
         if all(
                 isinstance(x, int)
                 for x in [window_size, step_size, n_mels, fixed_length]):
@@ -1800,6 +2619,93 @@ class MelSpectrogram:
             self.fixed_length = fixed_length
         else:
             raise TypeError('All arguments should be int.')
+        self.cache_dir = cache_dir
+
+    def _fix_length(self, mel):
+        """Truncate or pad the melspectrogram along the time axis."""
+        if mel.shape[0] >= self.fixed_length:
+            mel = mel[:self.fixed_length]
+        else:
+            mel = np.pad(
+                mel, ((0, self.fixed_length - mel.shape[0]), (0, 0)),
+                mode='edge')
+        return mel
+
+    def _compute_mel(self, signal, sample_rate, n_fft, hop_length):
+        """Compute the melspectrogram of a signal in shape (T, n_mels)."""
+        import librosa
+
+        mel = librosa.feature.melspectrogram(
+            y=signal,
+            sr=sample_rate,
+            n_fft=n_fft,
+            hop_length=hop_length,
+            n_mels=self.n_mels)
+        return mel.T
+
+    def _load_cached_mel(self, audio_path, sample_rate, n_fft, hop_length):
+        """Load the memory-mapped melspectrogram of a whole audio file, and
+        compute it if it is not in the cache."""
+        import librosa
+
+        stat = os.stat(audio_path)
+        key = (f'{osp.abspath(audio_path)}|{stat.st_size}|'
+               f'{stat.st_mtime_ns}|{sample_rate}|{n_fft}|{hop_length}|'
+               f'{self.n_mels}')
+        key = hashlib.sha1(key.encode()).hexdigest()
+        cache_path = osp.join(self.cache_dir, key[:2], f'{key}.npy')
+        if not osp.exists(cache_path):
+            y, _ = librosa.load(audio_path, sr=sample_rate)
+            mel = librosa.feature.melspectrogram(
+                y=y,
+                sr=sample_rate,
+                n_fft=n_fft,
+                hop_length=hop_length,
+                n_mels=self.n_mels)
+            mmcv.mkdir_or_exist(osp.dirname(cache_path))
+            # write to a temporary file first so that other processes never
+            # see a partially written file
+            tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                np.save(f, np.ascontiguousarray(mel.T, dtype=np.float32))
+            os.replace(tmp_path, cache_path)
+        return np.load(cache_path, mmap_mode='r')
+
+    def _slice_cached_mel(self, full_mel, clip_signal, start_idx, end_idx,
+                          scale, sample_rate, n_fft, hop_length):
+        """Build the melspectrogram of a clip from the one of the whole audio
+        file, return None if the clip does not start at a multiple of the hop
+        length."""
+        if start_idx % hop_length != 0:
+            return None
+        # frames before ``head`` are padded at the start of the clip, and
+        # frames from ``tail`` on cross the end of the samples of the clip in
+        # the audio file, or are padded at the end of the clip
+        head = -(-(n_fft // 2) // hop_length)
+        valid_len = min(end_idx - start_idx, clip_signal.shape[-1])
+        tail = (valid_len - n_fft + n_fft // 2) // hop_length + 1
+        if tail <= head:
+            return None
+
+        offset = start_idx // hop_length
+        num_frames = 1 + clip_signal.shape[-1] // hop_length
+        mel = np.empty((num_frames, self.n_mels), dtype=np.float32)
+        mel[head:tail] = full_mel[offset + head:offset + tail]
+        if scale != 1:
+            mel[head:tail] *= scale
+        if head > 0:
+            mel[:head] = self._compute_mel(
+                clip_signal[:(head - 1) * hop_length + n_fft], sample_rate,
+                n_fft, hop_length)[:head]
+        # the last segment starts at a frame before ``tail - head`` so that
+        # its frames from ``tail`` on are not padded at the start of it, and
+        # it is no shorter than the window if possible
+        first = max(
+            0, min(tail - head, (clip_signal.shape[-1] - n_fft) // hop_length))
+        mel[tail:] = self._compute_mel(clip_signal[first * hop_length:],
+                                       sample_rate, n_fft,
+                                       hop_length)[tail - first:]
+        return mel
 
     def __call__(self, results):
         """Perform MelSpectrogram transformation.
@@ -1809,7 +2715,7 @@ class MelSpectrogram:
                 to the next transform in pipeline.
         """
         try:
-            import librosa
+            import librosa  # noqa: F401
         except ImportError:
             raise ImportError('Install librosa first.')
         signals = results['audios']
@@ -1817,29 +2723,36 @@ class MelSpectrogram:
         n_fft = int(round(sample_rate * self.window_size / 1000))
         hop_length = int(round(sample_rate * self.step_size / 1000))
         melspectrograms = list()
+
+        full_mel = None
+        if (self.cache_dir is not None and 'audio_clip_ranges' in results
+                and osp.isfile(results.get('audio_path', ''))):
+            full_mel = self._load_cached_mel(results['audio_path'],
+                                             sample_rate, n_fft, hop_length)
+            # the power spectrogram scales with the square of amplitude
+            scale = results.get('amplify_ratio', 1.)**2
+
         for clip_idx in range(results['num_clips']):
             clip_signal = signals[clip_idx]
-            mel = librosa.feature.melspectrogram(
-                y=clip_signal,
-                sr=sample_rate,
-                n_fft=n_fft,
-                hop_length=hop_length,
-                n_mels=self.n_mels)
-            if mel.shape[0] >= self.fixed_length:
-                mel = mel[:self.fixed_length, :]
-            else:
-                mel = np.pad(
-                    mel, ((0, mel.shape[-1] - self.fixed_length), (0, 0)),
-                    mode='edge')
-            melspectrograms.append(mel)
+            mel = None
+            if full_mel is not None:
+                start_idx, end_idx = results['audio_clip_ranges'][clip_idx]
+                mel = self._slice_cached_mel(full_mel, clip_signal, start_idx,
+                                             end_idx, scale, sample_rate,
+                                             n_fft, hop_length)
+            if mel is None:
+                mel = self._compute_mel(clip_signal, sample_rate, n_fft,
+                                        hop_length)
+            melspectrograms.append(self._fix_length(mel))
 
         results['audios'] = np.array(melspectrograms)
         return results
 
     def __repr__(self):
         repr_str = (f'{self.__class__.__name__}'
-                    f'(window_size={self.window_size}), '
+                    f'(window_size={self.window_size}, '
                     f'step_size={self.step_size}, '
                     f'n_mels={self.n_mels}, '
-                    f'fixed_length={self.fixed_length})')
+                    f'fixed_length={self.fixed_length}, '
+                    f'cache_dir={self.cache_dir})')
         return repr_str
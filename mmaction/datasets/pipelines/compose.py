@@ -1,20 +1,61 @@
+import multiprocessing
+import time
+import tracemalloc
 from collections.abc import Sequence
 
+import numpy as np
+import torch
 from mmcv.utils import build_from_cfg
 
 from ..registry import PIPELINES
 
+# the shapes of "imgs" with at most _MAX_NDIM dimensions are recorded
+_MAX_NDIM = 7
+
+
+def _nbytes(data):
+    """Total size of the arrays and tensors in the data."""
+    if isinstance(data, np.ndarray):
+        return data.nbytes
+    if isinstance(data, torch.Tensor):
+        return data.numel() * data.element_size()
+    if isinstance(data, dict):
+        return sum(_nbytes(value) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        return sum(_nbytes(value) for value in data)
+    return 0
+
+
+def _shape(imgs):
+    """Shape of "imgs", which may be a list of frames."""
+    if isinstance(imgs, (np.ndarray, torch.Tensor)):
+        return tuple(imgs.shape)
+    if isinstance(imgs, (list, tuple)) and len(imgs) > 0 and isinstance(
+            imgs[0], (np.ndarray, torch.Tensor)):
+        return (len(imgs), ) + tuple(imgs[0].shape)
+    return None
+
 
 @PIPELINES.register_module()
 class Compose:
     """Compose a data pipeline with a sequence of transforms.
 
+    In profiling mode, the wall time, the size of the output arrays and the
+    shape of the output "imgs" of each transform are recorded. The records
+    are kept in shared memory, so they are aggregated across the dataloader
+    workers forked after the pipeline is built, and are reported by
+    :meth:`profile_stats`.
+
     Args:
         transforms (list[dict | callable]):
             Either config dicts of transforms or transform objects.
+        profile (bool): Whether to profile the transforms. Default: False.
+        trace_alloc (bool): Whether to trace the peak memory allocated by
+            each transform with ``tracemalloc`` in profiling mode, which
+            slows the transforms down. Default: False.
     """
 
-    def __init__(self, transforms):
+    def __init__(self, transforms, profile=False, trace_alloc=False):
         assert isinstance(transforms, Sequence)
         self.transforms = []
         for transform in transforms:
@@ -27,6 +68,51 @@ class Compose:
                 raise TypeError(f'transform must be callable or a dict, '
                                 f'but got {type(transform)}')
 
+        self.profile = profile
+        self.trace_alloc = trace_alloc
+        if profile:
+            num_transforms = len(self.transforms)
+            # count, total time, total output bytes and total allocation peak
+            self._stats = torch.zeros((num_transforms, 4),
+                                      dtype=torch.float64).share_memory_()
+            # number of dimensions followed by the shape of the output imgs
+            self._shapes = torch.full((num_transforms, _MAX_NDIM + 1),
+                                      -1,
+                                      dtype=torch.int64).share_memory_()
+            self._lock = multiprocessing.Lock()
+
+    def _profile_transform(self, i, transform, data):
+        if self.trace_alloc:
+            if hasattr(tracemalloc, 'reset_peak'):
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                tracemalloc.reset_peak()
+            else:
+                # reset_peak is new in Python 3.9, so the tracing is
+                # restarted instead, which clears the traces
+                tracemalloc.stop()
+                tracemalloc.start()
+            base_memory = tracemalloc.get_traced_memory()[0]
+        tic = time.perf_counter()
+        data = transform(data)
+        elapsed = time.perf_counter() - tic
+        alloc = 0
+        if self.trace_alloc:
+            alloc = tracemalloc.get_traced_memory()[1] - base_memory
+
+        nbytes = 0
+        shape = None
+        if isinstance(data, dict):
+            nbytes = _nbytes(data)
+            shape = _shape(data.get('imgs'))
+        with self._lock:
+            self._stats[i] += torch.tensor([1, elapsed, nbytes, alloc],
+                                           dtype=torch.float64)
+            if shape is not None and len(shape) <= _MAX_NDIM:
+                self._shapes[i, 0] = len(shape)
+                self._shapes[i, 1:len(shape) + 1] = torch.tensor(shape)
+        return data
+
     def __call__(self, data):
         """Call function to apply transforms sequentially.
 
@@ -37,12 +123,76 @@ class Compose:
             dict: Transformed data.
         """
 
-        for t in self.transforms:
-            data = t(data)
+        for i, t in enumerate(self.transforms):
+            if self.profile:
+                data = self._profile_transform(i, t, data)
+            else:
+                data = t(data)
             if data is None:
                 return None
         return data
 
+    def profile_stats(self):
+        """Get the profiled statistics of the transforms.
+
+        Returns:
+            list[dict]: The name, number of calls, mean wall time in seconds,
+                mean size in bytes of the output arrays, mean allocation
+                peak in bytes (0 if not traced) and the last shape of the
+                output "imgs" (None if unknown) of each transform.
+        """
+        if not self.profile:
+            raise RuntimeError('The pipeline is not built in profiling mode')
+        stats = []
+        with self._lock:
+            records = self._stats.tolist()
+            shapes = self._shapes.tolist()
+        for transform, record, shape in zip(self.transforms, records, shapes):
+            count, total_time, total_bytes, total_alloc = record
+            count = int(count)
+            num_calls = max(count, 1)
+            stats.append(
+                dict(
+                    name=transform.__class__.__name__,
+                    count=count,
+                    time=total_time / num_calls,
+                    out_bytes=total_bytes / num_calls,
+                    alloc_bytes=total_alloc / num_calls,
+                    shape=shape[1:shape[0] + 1] if shape[0] >= 0 else None))
+        return stats
+
+    def profile_table(self):
+        """Format the profiled statistics of the transforms as a markdown
+        table, with the share of each transform in the total time.
+
+        Returns:
+            str: The table.
+        """
+        stats = self.profile_stats()
+        total_time = sum(stat['time'] for stat in stats)
+        table = [
+            '| transform | calls | time (ms) | time (%) | output (MB) | '
+            'alloc (MB) | imgs shape |',
+            '| --- | --- | --- | --- | --- | --- | --- |'
+        ]
+        for stat in stats:
+            shape = 'x'.join(map(str, stat['shape'])) if stat['shape'] else '-'
+            table.append(
+                f'| {stat["name"]} | {stat["count"]} | '
+                f'{stat["time"] * 1000:.2f} | '
+                f'{stat["time"] / max(total_time, 1e-12) * 100:.1f} | '
+                f'{stat["out_bytes"] / 1024**2:.2f} | '
+                f'{stat["alloc_bytes"] / 1024**2:.2f} | {shape} |')
+        return '\n'.join(table)
+
+    def reset_profile(self):
+        """Clear the profiled statistics."""
+        if not self.profile:
+            raise RuntimeError('The pipeline is not built in profiling mode')
+        with self._lock:
+            self._stats.zero_()
+            self._shapes.fill_(-1)
+
     def __repr__(self):
         format_string = self.__class__.__name__ + '('
         for t in self.transforms:
@@ -255,6 +255,11 @@ class FormatShape:
     Required keys are "imgs", "num_clips" and "clip_len", added or modified
     keys are "imgs" and "input_shape".
 
+    If "imgs" are a list of frames, they are stacked into one array first.
+    If they are already one array, e.g. the output of ``Fuse`` or
+    ``Normalize``, the formatted imgs are a view of it without copying,
+    except for "NCHW_Flow".
+
     Args:
         input_format (str): Define the final imgs format.
         collapse (bool): To collpase input_format N... to ... (NCTHW to CTHW,
@@ -2,17 +2,173 @@ import io
 import os
 import os.path as osp
 import shutil
+import struct
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 
+import cv2
 import mmcv
 import numpy as np
 import torch
 from mmcv.fileio import FileClient
 from torch.nn.modules.utils import _pair
 
-from ...utils import get_random_string, get_shm_dir, get_thread_id
+from ...utils import (FileCache, FramePack, get_random_string, get_shm_dir,
+                      get_thread_id)
 from ..registry import PIPELINES
 
+# markers of the JPEG start of frame segments, which hold the image size
+_JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+_CV2_REDUCED_FLAGS = {
+    ('color', 2): cv2.IMREAD_REDUCED_COLOR_2,
+    ('color', 4): cv2.IMREAD_REDUCED_COLOR_4,
+    ('color', 8): cv2.IMREAD_REDUCED_COLOR_8,
+    ('grayscale', 2): cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    ('grayscale', 4): cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    ('grayscale', 8): cv2.IMREAD_REDUCED_GRAYSCALE_8
+}
+
+
+def _get_jpeg_size(content):
+    """Parse the (height, width) of a JPEG image from its header.
+
+    Returns None if the content is not a JPEG image.
+    """
+    if content[:2] != b'\xff\xd8':
+        return None
+    pos = 2
+    while pos + 4 <= len(content):
+        if content[pos] != 0xFF:
+            return None
+        marker = content[pos + 1]
+        if marker == 0xFF:
+            # fill byte
+            pos += 1
+        elif marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            # markers without payload
+            pos += 2
+        elif marker in _JPEG_SOF_MARKERS:
+            if pos + 9 > len(content):
+                return None
+            return struct.unpack('>HH', content[pos + 5:pos + 9])
+        else:
+            pos += 2 + struct.unpack('>H', content[pos + 2:pos + 4])[0]
+    return None
+
+
+def _imfrombytes_reduced(content,
+                         target_short_side,
+                         flag='color',
+                         channel_order='rgb'):
+    """Decode a JPEG image at a reduced resolution.
+
+    The image is decoded with the DCT domain downscaling of the decoder
+    (1/2, 1/4 or 1/8) to the smallest size whose short side is still at least
+    ``target_short_side``. Images in other formats are decoded as usual. The
+    decoding backend is the one set by ``mmcv.use_backend``.
+
+    Args:
+        content (bytes): Image bytes.
+        target_short_side (int): Target short side of the decoded image.
+        flag (str): Either 'color' or 'grayscale'. Default: 'color'.
+        channel_order (str): Channel order of color images. Default: 'rgb'.
+
+    Returns:
+        tuple[np.ndarray, tuple[int]]: The decoded image and the (height,
+            width) of the image at full resolution.
+    """
+    size = _get_jpeg_size(content)
+    scale = 1
+    if size is not None:
+        for candidate in (8, 4, 2):
+            # decoders round up the downscaled size
+            if -(-min(size) // candidate) >= target_short_side:
+                scale = candidate
+                break
+    if scale == 1:
+        img = mmcv.imfrombytes(content, flag=flag, channel_order=channel_order)
+        return img, img.shape[:2]
+
+    backend = mmcv.image.io.imread_backend
+    if backend == 'turbojpeg':
+        from turbojpeg import TJPF_BGR, TJPF_GRAY, TJPF_RGB
+        if flag == 'grayscale':
+            pixel_format = TJPF_GRAY
+        else:
+            pixel_format = TJPF_RGB if channel_order == 'rgb' else TJPF_BGR
+        img = mmcv.image.io.jpeg.decode(
+            content, pixel_format, scaling_factor=(1, scale))
+        if img.shape[-1] == 1:
+            img = img[:, :, 0]
+    elif backend == 'pillow':
+        from PIL import Image
+        img = Image.open(io.BytesIO(content))
+        # ``draft`` configures the decoder to downscale in the DCT domain
+        img.draft('L' if flag == 'grayscale' else 'RGB',
+                  (-(-size[1] // scale), -(-size[0] // scale)))
+        img = mmcv.image.io._pillow2array(img, flag, channel_order)
+    else:
+        img = cv2.imdecode(
+            np.frombuffer(content, np.uint8),
+            _CV2_REDUCED_FLAGS[(flag, scale)])
+        if flag == 'color' and channel_order == 'rgb':
+            cv2.cvtColor(img, cv2.COLOR_BGR2RGB, img)
+    return img, size
+
+
+def _snap_to_keyframes(frame_inds, key_inds):
+    """Snap frame indices to the nearest keyframe indices.
+
+    Args:
+        frame_inds (np.ndarray): Frame indices to snap.
+        key_inds (np.ndarray): Sorted indices of the keyframes.
+
+    Returns:
+        np.ndarray: Indices of the nearest keyframes. Ties are resolved to
+            the earlier keyframe.
+    """
+    key_inds = np.asarray(key_inds)
+    pos = np.searchsorted(key_inds, frame_inds)
+    prev_inds = key_inds[np.clip(pos - 1, 0, len(key_inds) - 1)]
+    next_inds = key_inds[np.clip(pos, 0, len(key_inds) - 1)]
+    return np.where(frame_inds - prev_inds <= next_inds - frame_inds,
+                    prev_inds, next_inds)
+
+
+def _set_reduced_scale_factor(results, img, size):
+    """Record the downscaling of reduced decoding in "scale_factor", so that
+    later transforms like ``Normalize`` can adjust the flow magnitude."""
+    h, w = img.shape[:2]
+    scale_factor = np.array([w / size[1], h / size[0]], dtype=np.float32)
+    if 'scale_factor' in results:
+        scale_factor = results['scale_factor'] * scale_factor
+    results['scale_factor'] = scale_factor
+
+
+def _scatter_frames(frame_dict, frame_keys):
+    """Arrange the frames decoded once per unique key in the requested order.
+
+    A frame requested more than once is copied for every repeat, so that
+    in-place transforms like ``Flip`` never modify one array twice.
+
+    Args:
+        frame_dict (dict): Map from the unique keys to the decoded frames.
+        frame_keys (Sequence): Keys of the frames in the requested order.
+
+    Returns:
+        list[np.ndarray]: Frames in the order of ``frame_keys``.
+    """
+    imgs = list()
+    used = set()
+    for key in frame_keys:
+        img = frame_dict[key]
+        if id(img) in used:
+            img = img.copy()
+        else:
+            used.add(id(img))
+        imgs.append(img)
+    return imgs
+
 
 @PIPELINES.register_module()
 class LoadHVULabel:
@@ -417,12 +573,12 @@ class SampleAVAFrames(SampleFrames):
     def __init__(self, clip_len, frame_interval=2, test_mode=False):
 
         super().__init__(clip_len, frame_interval, test_mode=test_mode)
+        # offsets of the frames of a clip to its center frame
+        self._clip_offsets = np.arange(-(clip_len // 2),
+                                       (clip_len + 1) // 2) * frame_interval
 
     def _get_clips(self, center_index, skip_offsets, shot_info):
-        start = center_index - (self.clip_len // 2) * self.frame_interval
-        end = center_index + ((self.clip_len + 1) // 2) * self.frame_interval
-        frame_inds = list(range(start, end, self.frame_interval))
-        frame_inds = frame_inds + skip_offsets
+        frame_inds = center_index + self._clip_offsets + skip_offsets
         frame_inds = np.clip(frame_inds, shot_info[0], shot_info[1] - 1)
 
         return frame_inds
@@ -717,19 +873,26 @@ class PyAVInit:
 
     PyAV: https://github.com/mikeboers/PyAV
 
-    Required keys are "filename",
-    added or modified keys are "video_reader", and "total_frames".
+    Required keys are "filename", or "video_bytes" of the encoded video read
+    instead of the file, added or modified keys are "video_reader", and
+    "total_frames".
 
     Args:
         io_backend (str): io backend where frames are store.
             Default: 'disk'.
+        cache_cfg (dict | None): Config of the local file cache, see
+            :class:`mmaction.utils.FileCache`. If set, videos are fetched
+            once into the shared on-disk cache and read from a memory map.
+            Default: None.
         kwargs (dict): Args for file client.
     """
 
-    def __init__(self, io_backend='disk', **kwargs):
+    def __init__(self, io_backend='disk', cache_cfg=None, **kwargs):
         self.io_backend = io_backend
+        self.cache_cfg = cache_cfg
         self.kwargs = kwargs
         self.file_client = None
+        self.file_cache = None
 
     def __call__(self, results):
         """Perform the PyAV initialization.
@@ -746,8 +909,15 @@ class PyAVInit:
 
         if self.file_client is None:
             self.file_client = FileClient(self.io_backend, **self.kwargs)
+        if self.cache_cfg is not None and self.file_cache is None:
+            self.file_cache = FileCache(self.file_client, **self.cache_cfg)
 
-        file_obj = io.BytesIO(self.file_client.get(results['filename']))
+        if 'video_bytes' in results:
+            file_obj = io.BytesIO(results['video_bytes'])
+        elif self.file_cache is not None:
+            file_obj = self.file_cache.get(results['filename'])
+        else:
+            file_obj = io.BytesIO(self.file_client.get(results['filename']))
         container = av.open(file_obj)
 
         results['video_reader'] = container
@@ -772,10 +942,201 @@ class PyAVDecode:
     Args:
         multi_thread (bool): If set to True, it will apply multi
             thread processing. Default: False.
+        mode (str): Decoding mode. Options are 'accurate', 'seek' and
+            'keyframe'. If set to 'accurate', it will decode every frame from
+            the beginning of the video up to the largest frame index. If set
+            to 'seek', it will seek to the keyframe before each requested
+            index and only decode from there, converting only the requested
+            frames to RGB. The 'seek' mode produces the same frames as the
+            'accurate' mode and falls back to it if the stream timestamps are
+            not regular. If set to 'keyframe', only keyframes are decoded and
+            every requested index is snapped to the nearest keyframe, the
+            snapped indices are written back to "frame_inds". It is meant for
+            sampling over long videos where exact frames are not needed.
+            Default: 'accurate'.
     """
 
-    def __init__(self, multi_thread=False):
+    def __init__(self, multi_thread=False, mode='accurate'):
         self.multi_thread = multi_thread
+        self.mode = mode
+        assert mode in ['accurate', 'seek', 'keyframe']
+
+    @staticmethod
+    def _decode_frames(container, frame_inds, convert):
+        """Decode frames sequentially from the beginning of the video.
+
+        All the clips are decoded in one forward pass, and only the frames
+        at the requested indices are converted and kept.
+
+        Args:
+            container (av.container.InputContainer): The opened video.
+            frame_inds (np.ndarray): Requested frame indices.
+            convert (callable): Function converting a decoded ``av`` frame
+                to the kept array.
+
+        Returns:
+            dict: Map from the unique requested indices to the converted
+                frames.
+        """
+        unique_inds = set(np.unique(frame_inds).tolist())
+        # set max index to make early stop
+        max_idx = max(unique_inds)
+        frame_dict = dict()
+        num_frames = 0
+        for frame in container.decode(video=0):
+            if num_frames > max_idx:
+                break
+            if num_frames in unique_inds:
+                frame_dict[num_frames] = convert(frame)
+            num_frames += 1
+
+        # the available frame in pyav may be less than its length, the
+        # indices out of range are wrapped around as the frames of the
+        # video are repeated
+        missing_inds = unique_inds - frame_dict.keys()
+        if missing_inds:
+            if num_frames == 0:
+                raise RuntimeError('No frame is decoded from the video')
+            wrapped_inds = {idx % num_frames
+                            for idx in missing_inds} - frame_dict.keys()
+            if wrapped_inds:
+                container.seek(0)
+                for i, frame in enumerate(container.decode(video=0)):
+                    if i in wrapped_inds:
+                        frame_dict[i] = convert(frame)
+                    if i >= max(wrapped_inds):
+                        break
+            for idx in missing_inds:
+                frame_dict[idx] = frame_dict[idx % num_frames]
+        return frame_dict
+
+    @staticmethod
+    def _decode_accurate(container, frame_inds):
+        """Decode frames sequentially from the beginning of the video."""
+        frame_dict = PyAVDecode._decode_frames(
+            container, frame_inds, lambda frame: frame.to_rgb().to_ndarray())
+        return _scatter_frames(frame_dict, frame_inds)
+
+    @staticmethod
+    def _decode_seek(container, frame_inds):
+        """Decode the requested frames by seeking to the preceding keyframes.
+
+        The index of a decoded frame is recovered from its timestamp, so it
+        requires a stream with a constant frame rate and increasing
+        timestamps in decoding order.
+
+        Returns:
+            list[np.ndarray] | None: The decoded frames in the order of
+                ``frame_inds``, or None if the stream does not meet the
+                requirements or a requested frame can not be reached.
+        """
+        stream = container.streams.video[0]
+        if stream.average_rate is None or stream.time_base is None:
+            return None
+        # number of frames in one unit of stream time base
+        pts_scale = stream.average_rate * stream.time_base
+        start_pts = stream.start_time or 0
+
+        frame_dict = dict()
+        frame_iter = None
+        # index of the last decoded frame
+        cur_idx = None
+        last_pts = None
+        # average number of frames decoded after a seek to reach the target,
+        # used to decide whether seeking is cheaper than decoding forward
+        seek_cost = None
+        for idx in np.unique(frame_inds):
+            if (frame_iter is None or seek_cost is None
+                    or idx - cur_idx > seek_cost):
+                target_pts = int(start_pts + idx / pts_scale)
+                container.seek(
+                    target_pts, backward=True, any_frame=False, stream=stream)
+                frame_iter = container.decode(stream)
+                cur_idx = last_pts = None
+                is_seek = True
+            else:
+                is_seek = False
+
+            seek_idx = None
+            for frame in frame_iter:
+                if frame.pts is None or (last_pts is not None
+                                         and frame.pts <= last_pts):
+                    return None
+                last_pts = frame.pts
+                cur_idx = int(round((frame.pts - start_pts) * pts_scale))
+                if seek_idx is None:
+                    seek_idx = cur_idx
+                if cur_idx >= idx:
+                    break
+            else:
+                return None
+            if cur_idx != idx:
+                return None
+
+            if is_seek:
+                cost = idx - seek_idx + 1
+                seek_cost = cost if seek_cost is None else (seek_cost +
+                                                            cost) / 2
+            frame_dict[idx] = frame.to_rgb().to_ndarray()
+
+        return _scatter_frames(frame_dict, frame_inds)
+
+    @staticmethod
+    def _decode_keyframe(container, frame_inds):
+        """Decode only the keyframes nearest to the requested indices.
+
+        Returns:
+            tuple[list[np.ndarray], np.ndarray] | None: The decoded keyframes
+                in the order of ``frame_inds`` and their indices, or None if
+                the stream timestamps can not be mapped to frame indices.
+        """
+        stream = container.streams.video[0]
+        if stream.average_rate is None or stream.time_base is None:
+            return None
+        pts_scale = stream.average_rate * stream.time_base
+        # the first keyframe is taken as the first frame of the video
+        start_pts = None
+        # let the decoder drop all the frames except keyframes
+        stream.codec_context.skip_frame = 'NONKEY'
+
+        unique_inds = np.unique(frame_inds)
+        # map from the requested indices to the keyframe indices
+        snapped = dict()
+        keyframes = dict()
+        pending = 0
+        prev_idx = prev_frame = None
+        for frame in container.decode(stream):
+            if frame.pts is None:
+                return None
+            if start_pts is None:
+                start_pts = frame.pts
+            idx = int(round((frame.pts - start_pts) * pts_scale))
+            # requested indices before the current keyframe are resolved to
+            # either the previous keyframe or the current one
+            while pending < len(unique_inds) and unique_inds[pending] <= idx:
+                req_idx = unique_inds[pending]
+                if prev_idx is None or idx - req_idx < req_idx - prev_idx:
+                    key_idx, key_frame = idx, frame
+                else:
+                    key_idx, key_frame = prev_idx, prev_frame
+                if key_idx not in keyframes:
+                    keyframes[key_idx] = key_frame.to_rgb().to_ndarray()
+                snapped[req_idx] = key_idx
+                pending += 1
+            if pending == len(unique_inds):
+                break
+            prev_idx, prev_frame = idx, frame
+        else:
+            # the rest indices are after the last keyframe
+            if prev_idx is None:
+                return None
+            if pending < len(unique_inds):
+                keyframes[prev_idx] = prev_frame.to_rgb().to_ndarray()
+            for req_idx in unique_inds[pending:]:
+                snapped[req_idx] = prev_idx
+
+        key_inds = np.array([snapped[idx] for idx in frame_inds])
+        return _scatter_frames(keyframes, key_inds), key_inds
 
     def __call__(self, results):
         """Perform the PyAV decoding.
@@ -785,29 +1146,31 @@ class PyAVDecode:
                 to the next transform in pipeline.
         """
         container = results['video_reader']
-        imgs = list()
 
         if self.multi_thread:
             container.streams.video[0].thread_type = 'AUTO'
         if results['frame_inds'].ndim != 1:
             results['frame_inds'] = np.squeeze(results['frame_inds'])
 
-        # set max indice to make early stop
-        max_inds = max(results['frame_inds'])
-        i = 0
-        for frame in container.decode(video=0):
-            if i > max_inds + 1:
-                break
-            imgs.append(frame.to_rgb().to_ndarray())
-            i += 1
+        imgs = None
+        if self.mode == 'seek':
+            imgs = self._decode_seek(container, results['frame_inds'])
+            if imgs is None:
+                container.seek(0)
+        elif self.mode == 'keyframe':
+            decoded = self._decode_keyframe(container, results['frame_inds'])
+            if decoded is None:
+                container.streams.video[0].codec_context.skip_frame = 'DEFAULT'
+                container.seek(0)
+            else:
+                imgs, results['frame_inds'] = decoded
+        if imgs is None:
+            imgs = self._decode_accurate(container, results['frame_inds'])
 
         results['video_reader'] = None
         del container
 
-        # the available frame in pyav may be less than its length,
-        # which may raise error
-        results['imgs'] = [imgs[i % len(imgs)] for i in results['frame_inds']]
-
+        results['imgs'] = imgs
         results['original_shape'] = imgs[0].shape[:2]
         results['img_shape'] = imgs[0].shape[:2]
 
@@ -815,7 +1178,7 @@ class PyAVDecode:
 
     def __repr__(self):
         repr_str = self.__class__.__name__
-        repr_str += f'(multi_thread={self.multi_thread})'
+        repr_str += f'(multi_thread={self.multi_thread}, mode={self.mode})'
         return repr_str
 
 
@@ -836,20 +1199,67 @@ class PyAVDecodeMotionVector(PyAVDecode):
 
     @staticmethod
     def _parse_vectors(mv, vectors, height, width):
-        """Parse the returned vectors."""
-        (w, h, src_x, src_y, dst_x,
-         dst_y) = (vectors['w'], vectors['h'], vectors['src_x'],
-                   vectors['src_y'], vectors['dst_x'], vectors['dst_y'])
-        val_x = dst_x - src_x
-        val_y = dst_y - src_y
+        """Parse the returned vectors.
+
+        Every block inside the frame is filled with its motion vector, and
+        the later vectors overwrite the earlier ones where blocks overlap.
+        The blocks are rasterized on the coarsest grid that all the block
+        positions and sizes are aligned to, e.g. 4x4 pixels for H.264.
+        """
+        w = vectors['w'].astype(np.int64)
+        h = vectors['h'].astype(np.int64)
+        dst_x = vectors['dst_x'].astype(np.int64)
+        dst_y = vectors['dst_y'].astype(np.int64)
+        val = np.stack([dst_x - vectors['src_x'], dst_y - vectors['src_y']],
+                       axis=1)
         start_x = dst_x - w // 2
         start_y = dst_y - h // 2
-        end_x = start_x + w
-        end_y = start_y + h
-        for sx, ex, sy, ey, vx, vy in zip(start_x, end_x, start_y, end_y,
-                                          val_x, val_y):
-            if (sx >= 0 and ex < width and sy >= 0 and ey < height):
-                mv[sy:ey, sx:ex] = (vx, vy)
+        valid = ((start_x >= 0) & (start_x + w < width) & (start_y >= 0)
+                 & (start_y + h < height) & (w > 0) & (h > 0))
+        inds = np.nonzero(valid)[0]
+        if len(inds) == 0:
+            return mv
+        w, h, start_x, start_y = w[inds], h[inds], start_x[inds], start_y[inds]
+
+        cell = int(np.gcd.reduce(np.concatenate([w, h, start_x, start_y])))
+        grid_h = -(-height // cell)
+        grid_w = -(-width // cell)
+        w, h = w // cell, h // cell
+        start_x, start_y = start_x // cell, start_y // cell
+
+        # rasterize the blocks of the same size together
+        cell_inds = list()
+        vector_inds = list()
+        for bw, bh in set(zip(w.tolist(), h.tolist())):
+            is_size = (w == bw) & (h == bh)
+            ys = start_y[is_size, None, None] + np.arange(bh)[None, :, None]
+            xs = start_x[is_size, None, None] + np.arange(bw)[None, None, :]
+            cell_inds.append((ys * grid_w + xs).reshape(-1))
+            vector_inds.append(np.repeat(inds[is_size], bh * bw))
+        cell_inds = np.concatenate(cell_inds)
+        vector_inds = np.concatenate(vector_inds)
+
+        # keep the last vector covering each cell
+        order = np.lexsort((vector_inds, cell_inds))
+        cell_inds = cell_inds[order]
+        vector_inds = vector_inds[order]
+        is_last = np.append(cell_inds[1:] != cell_inds[:-1], True)
+        cell_inds = cell_inds[is_last]
+        vector_inds = vector_inds[is_last]
+
+        if grid_h * cell == height and grid_w * cell == width:
+            out = mv
+        else:
+            out = np.zeros((grid_h * cell, grid_w * cell, 2), dtype=mv.dtype)
+            out[:height, :width] = mv
+        # view the frame as (grid_h, grid_w, cell, cell, 2) to fill the
+        # covered cells without upsampling the grid
+        cells = out.reshape(grid_h, cell, grid_w, cell,
+                            2).transpose(0, 2, 1, 3, 4)
+        cells[cell_inds // grid_w, cell_inds % grid_w] = val[vector_inds, None,
+                                                             None]
+        if out is not mv:
+            mv[:] = out[:height, :width]
 
         return mv
 
@@ -861,61 +1271,122 @@ class PyAVDecodeMotionVector(PyAVDecode):
                 to the next transform in pipeline.
         """
         container = results['video_reader']
-        imgs = list()
 
         if self.multi_thread:
             container.streams.video[0].thread_type = 'AUTO'
         if results['frame_inds'].ndim != 1:
             results['frame_inds'] = np.squeeze(results['frame_inds'])
 
-        # set max index to make early stop
-        max_idx = max(results['frame_inds'])
-        i = 0
         stream = container.streams.video[0]
         codec_context = stream.codec_context
         codec_context.options = {'flags2': '+export_mvs'}
-        for packet in container.demux(stream):
-            for frame in packet.decode():
-                if i > max_idx + 1:
-                    break
-                i += 1
-                height = frame.height
-                width = frame.width
-                mv = np.zeros((height, width, 2), dtype=np.int8)
-                vectors = frame.side_data.get('MOTION_VECTORS')
-                if frame.key_frame:
-                    # Key frame don't have motion vectors
-                    assert vectors is None
-                if vectors is not None and len(vectors) > 0:
-                    mv = self._parse_vectors(mv, vectors.to_ndarray(), height,
-                                             width)
-                imgs.append(mv)
+
+        def convert(frame):
+            height = frame.height
+            width = frame.width
+            mv = np.zeros((height, width, 2), dtype=np.int8)
+            vectors = frame.side_data.get('MOTION_VECTORS')
+            if frame.key_frame:
+                # Key frame don't have motion vectors
+                assert vectors is None
+            if vectors is not None and len(vectors) > 0:
+                mv = self._parse_vectors(mv, vectors.to_ndarray(), height,
+                                         width)
+            return mv
+
+        frame_dict = self._decode_frames(container, results['frame_inds'],
+                                         convert)
 
         results['video_reader'] = None
         del container
 
-        # the available frame in pyav may be less than its length,
-        # which may raise error
         results['motion_vectors'] = np.array(
-            [imgs[i % len(imgs)] for i in results['frame_inds']])
+            [frame_dict[idx] for idx in results['frame_inds']])
         return results
 
 
+@PIPELINES.register_module()
+class MotionVectorToFlow:
+    """Convert the motion vectors to flow images.
+
+    The motion vectors decoded by ``PyAVDecodeMotionVector`` are clipped to
+    [-bound, bound] and quantized to uint8 in the same way as
+    ``tools/flow_extraction.py`` does for the optical flow, so the results
+    can replace the TV-L1 flow frames in the pipelines of the "Flow"
+    modality, e.g. TSN with ``input_format='NCHW_Flow'``.
+
+    Required keys are "motion_vectors", added or modified keys are "imgs",
+    "modality", "img_shape" and "original_shape", removed key is
+    "motion_vectors".
+
+    Args:
+        bound (float): Bound for the flow-to-image normalization. Default: 20.
+    """
+
+    def __init__(self, bound=20.):
+        self.bound = bound
+
+    def __call__(self, results):
+        """Perform the motion vector to flow conversion.
+
+        Args:
+            results (dict): The resulting dict to be modified and passed
+                to the next transform in pipeline.
+        """
+        motion_vectors = results.pop('motion_vectors')
+        num_frames, height, width = motion_vectors.shape[:3]
+
+        flow = np.clip(
+            motion_vectors.astype(np.float32), -self.bound, self.bound)
+        flow += self.bound
+        flow *= (255 / float(2 * self.bound))
+        # x and y flow images are interleaved as loaded by ``RawFrameDecode``
+        flow = flow.astype(np.uint8).transpose(0, 3, 1, 2).reshape(
+            num_frames * 2, height, width)
+
+        results['imgs'] = list(flow)
+        results['modality'] = 'Flow'
+        results['original_shape'] = (height, width)
+        results['img_shape'] = (height, width)
+        return results
+
+    def __repr__(self):
+        repr_str = f'{self.__class__.__name__}(bound={self.bound})'
+        return repr_str
+
+
 @PIPELINES.register_module()
 class DecordInit:
     """Using decord to initialize the video_reader.
 
     Decord: https://github.com/dmlc/decord
 
-    Required keys are "filename",
-    added or modified keys are "video_reader" and "total_frames".
+    Required keys are "filename", or "video_bytes" of the encoded video read
+    instead of the file, added or modified keys are "video_reader" and
+    "total_frames".
+
+    Args:
+        io_backend (str): io backend where frames are store.
+            Default: 'disk'.
+        num_threads (int): Number of thread to decode the video. Default: 1.
+        cache_cfg (dict | None): Config of the local file cache, see
+            :class:`mmaction.utils.FileCache`. If set, videos are fetched
+            once into the shared on-disk cache and opened from there.
+            Default: None.
+        kwargs (dict): Args for file client.
     """
 
-    def __init__(self, io_backend='disk', num_threads=1, **kwargs):
+    def __init__(self,
+                 io_backend='disk',
+                 num_threads=1,
+                 cache_cfg=None,
+                 **kwargs):
         self.io_backend = io_backend
         self.num_threads = num_threads
+        self.cache_cfg = cache_cfg
         self.kwargs = kwargs
         self.file_client = None
+        self.file_cache = None
 
     def __call__(self, results):
         """Perform the Decord initialization.
@@ -932,9 +1403,22 @@ class DecordInit:
 
         if self.file_client is None:
             self.file_client = FileClient(self.io_backend, **self.kwargs)
-
-        file_obj = io.BytesIO(self.file_client.get(results['filename']))
-        container = decord.VideoReader(file_obj, num_threads=self.num_threads)
+        if self.cache_cfg is not None and self.file_cache is None:
+            self.file_cache = FileCache(self.file_client, **self.cache_cfg)
+
+        def open_video(file_obj):
+            return decord.VideoReader(file_obj, num_threads=self.num_threads)
+
+        if 'video_bytes' in results:
+            container = open_video(io.BytesIO(results['video_bytes']))
+        elif self.file_cache is not None:
+            # decord copies file objects into its own buffer, so the cached
+            # file is opened by path instead
+            container = self.file_cache.open_local(results['filename'],
+                                                   open_video)
+        else:
+            container = open_video(
+                io.BytesIO(self.file_client.get(results['filename'])))
         results['video_reader'] = container
         results['total_frames'] = len(container)
         return results
@@ -954,8 +1438,23 @@ class DecordDecode:
 
     Required keys are "video_reader", "filename" and "frame_inds",
     added or modified keys are "imgs" and "original_shape".
+
+    Args:
+        batched (bool): If set to True, it will fetch all the unique frame
+            indices with one ``get_batch`` call and return "imgs" as a
+            contiguous array in shape (T, H, W, C) instead of a list of
+            frames. Default: False.
+        keyframe_only (bool): If set to True, every requested index is
+            snapped to the nearest keyframe so that only keyframes are
+            decoded, and the snapped indices are written back to
+            "frame_inds". It is meant for sampling over long videos where
+            exact frames are not needed. Default: False.
     """
 
+    def __init__(self, batched=False, keyframe_only=False):
+        self.batched = batched
+        self.keyframe_only = keyframe_only
+
     def __call__(self, results):
         """Perform the Decord decoding.
 
@@ -968,14 +1467,27 @@ class DecordDecode:
         if results['frame_inds'].ndim != 1:
             results['frame_inds'] = np.squeeze(results['frame_inds'])
 
+        if self.keyframe_only:
+            key_inds = container.get_key_indices()
+            if len(key_inds) > 0:
+                results['frame_inds'] = _snap_to_keyframes(
+                    results['frame_inds'], key_inds)
+
         frame_inds = results['frame_inds']
-        # Generate frame index mapping in order
-        frame_dict = {
-            idx: container[idx].asnumpy()
-            for idx in np.unique(frame_inds)
-        }
+        if self.batched:
+            unique_inds, inverse_inds = np.unique(
+                frame_inds, return_inverse=True)
+            imgs = container.get_batch(unique_inds).asnumpy()
+            if not np.array_equal(unique_inds, frame_inds):
+                imgs = imgs[inverse_inds]
+        else:
+            # Generate frame index mapping in order
+            frame_dict = {
+                idx: container[idx].asnumpy()
+                for idx in np.unique(frame_inds)
+            }
 
-        imgs = [frame_dict[idx] for idx in frame_inds]
+            imgs = _scatter_frames(frame_dict, frame_inds)
 
         results['video_reader'] = None
         del container
@@ -986,6 +1498,12 @@ class DecordDecode:
 
         return results
 
+    def __repr__(self):
+        repr_str = (f'{self.__class__.__name__}('
+                    f'batched={self.batched}, '
+                    f'keyframe_only={self.keyframe_only})')
+        return repr_str
+
 
 @PIPELINES.register_module()
 class OpenCVInit:
@@ -993,14 +1511,26 @@ class OpenCVInit:
 
     Required keys are "filename", added or modified keys are "new_path",
     "video_reader" and "total_frames".
+
+    Args:
+        io_backend (str): io backend where frames are store.
+            Default: 'disk'.
+        cache_cfg (dict | None): Config of the local file cache, see
+            :class:`mmaction.utils.FileCache`. If set, videos are fetched
+            once into the shared on-disk cache and opened from there instead
+            of being written to a temporary file for every sample.
+            Default: None.
+        kwargs (dict): Args for file client.
     """
 
-    def __init__(self, io_backend='disk', **kwargs):
+    def __init__(self, io_backend='disk', cache_cfg=None, **kwargs):
         self.io_backend = io_backend
+        self.cache_cfg = cache_cfg
         self.kwargs = kwargs
         self.file_client = None
+        self.file_cache = None
         self.tmp_folder = None
-        if self.io_backend != 'disk':
+        if self.io_backend != 'disk' and self.cache_cfg is None:
             random_string = get_random_string()
             thread_id = get_thread_id()
             self.tmp_folder = osp.join(get_shm_dir(),
@@ -1014,8 +1544,17 @@ class OpenCVInit:
             results (dict): The resulting dict to be modified and passed
                 to the next transform in pipeline.
         """
-        if self.io_backend == 'disk':
+        if self.cache_cfg is not None:
+            if self.file_client is None:
+                self.file_client = FileClient(self.io_backend, **self.kwargs)
+            if self.file_cache is None:
+                self.file_cache = FileCache(self.file_client, **self.cache_cfg)
+            new_path, container = self.file_cache.open_local(
+                results['filename'], lambda path:
+                (path, mmcv.VideoReader(path)))
+        elif self.io_backend == 'disk':
             new_path = results['filename']
+            container = mmcv.VideoReader(new_path)
         else:
             if self.file_client is None:
                 self.file_client = FileClient(self.io_backend, **self.kwargs)
@@ -1025,8 +1564,8 @@ class OpenCVInit:
             new_path = osp.join(self.tmp_folder, f'tmp_{thread_id}.mp4')
             with open(new_path, 'wb') as f:
                 f.write(self.file_client.get(results['filename']))
+            container = mmcv.VideoReader(new_path)
 
-        container = mmcv.VideoReader(new_path)
         results['new_path'] = new_path
         results['video_reader'] = container
         results['total_frames'] = len(container)
@@ -1059,23 +1598,26 @@ class OpenCVDecode:
                 to the next transform in pipeline.
         """
         container = results['video_reader']
-        imgs = list()
 
         if results['frame_inds'].ndim != 1:
             results['frame_inds'] = np.squeeze(results['frame_inds'])
 
-        for frame_ind in results['frame_inds']:
+        # read the unique indices in increasing order, so that the reader
+        # moves forward through the video without seeking back
+        frame_dict = dict()
+        for frame_ind in np.unique(results['frame_inds']):
             cur_frame = container[frame_ind]
             # last frame may be None in OpenCV
+            idx = frame_ind
             while isinstance(cur_frame, type(None)):
-                frame_ind -= 1
-                cur_frame = container[frame_ind]
-            imgs.append(cur_frame)
+                idx -= 1
+                cur_frame = container[idx]
+            frame_dict[frame_ind] = cur_frame
 
         results['video_reader'] = None
         del container
 
-        imgs = np.array(imgs)
+        imgs = np.array([frame_dict[idx] for idx in results['frame_inds']])
         # The default channel order of OpenCV is BGR, thus we change it to RGB
         imgs = imgs[:, :, :, ::-1]
         results['imgs'] = list(imgs)
@@ -1096,14 +1638,62 @@ class RawFrameDecode:
         io_backend (str): IO backend where frames are stored. Default: 'disk'.
         decoding_backend (str): Backend used for image decoding.
             Default: 'cv2'.
+        num_threads (int): Number of threads to read and decode the frames
+            concurrently. Each process creates its own thread pool. If set to
+            1, frames are loaded one by one in the calling thread. Default: 1.
+        target_short_side (int | None): If set, JPEG frames are decoded with
+            DCT domain downscaling to the smallest size whose short side is
+            at least ``target_short_side``, and "scale_factor" records the
+            downscaling. Default: None.
         kwargs (dict, optional): Arguments for FileClient.
     """
 
-    def __init__(self, io_backend='disk', decoding_backend='cv2', **kwargs):
+    def __init__(self,
+                 io_backend='disk',
+                 decoding_backend='cv2',
+                 num_threads=1,
+                 target_short_side=None,
+                 **kwargs):
         self.io_backend = io_backend
         self.decoding_backend = decoding_backend
+        self.num_threads = num_threads
+        self.target_short_side = target_short_side
         self.kwargs = kwargs
         self.file_client = None
+        self._pool = None
+        self._pool_pid = None
+
+    def __getstate__(self):
+        # thread pools can not be pickled or shared with forked processes
+        state = self.__dict__.copy()
+        state['_pool'] = None
+        state['_pool_pid'] = None
+        return state
+
+    def _get_pool(self):
+        """Get the thread pool of the current process."""
+        if self._pool is None or self._pool_pid != os.getpid():
+            self._pool = ThreadPoolExecutor(self.num_threads)
+            self._pool_pid = os.getpid()
+        return self._pool
+
+    def _get_bytes(self, filepath):
+        """Read the encoded bytes of one image."""
+        return self.file_client.get(filepath)
+
+    def _load_image(self, task):
+        """Read and decode one image given its path and decoding flag."""
+        filepath, flag = task
+        img_bytes = self._get_bytes(filepath)
+        if self.target_short_side is not None:
+            return _imfrombytes_reduced(img_bytes, self.target_short_side,
+                                        flag)
+        if flag == 'color':
+            # Get frame with channel order RGB directly.
+            img = mmcv.imfrombytes(img_bytes, channel_order='rgb')
+        else:
+            img = mmcv.imfrombytes(img_bytes, flag=flag)
+        return img, None
 
     def __call__(self, results):
         """Perform the ``RawFrameDecode`` to pick frames given indices.
@@ -1121,37 +1711,45 @@ class RawFrameDecode:
         if self.file_client is None:
             self.file_client = FileClient(self.io_backend, **self.kwargs)
 
-        imgs = list()
-
         if results['frame_inds'].ndim != 1:
             results['frame_inds'] = np.squeeze(results['frame_inds'])
 
         offset = results.get('offset', 0)
 
+        tasks = list()
         for frame_idx in results['frame_inds']:
             frame_idx += offset
             if modality == 'RGB':
                 filepath = osp.join(directory, filename_tmpl.format(frame_idx))
-                img_bytes = self.file_client.get(filepath)
-                # Get frame with channel order RGB directly.
-                cur_frame = mmcv.imfrombytes(img_bytes, channel_order='rgb')
-                imgs.append(cur_frame)
+                tasks.append((filepath, 'color'))
             elif modality == 'Flow':
                 x_filepath = osp.join(directory,
                                       filename_tmpl.format('x', frame_idx))
                 y_filepath = osp.join(directory,
                                       filename_tmpl.format('y', frame_idx))
-                x_img_bytes = self.file_client.get(x_filepath)
-                x_frame = mmcv.imfrombytes(x_img_bytes, flag='grayscale')
-                y_img_bytes = self.file_client.get(y_filepath)
-                y_frame = mmcv.imfrombytes(y_img_bytes, flag='grayscale')
-                imgs.extend([x_frame, y_frame])
+                tasks.extend([(x_filepath, 'grayscale'),
+                              (y_filepath, 'grayscale')])
             else:
                 raise NotImplementedError
 
+        # frames shared by several clips are loaded only once
+        unique_tasks = list(dict.fromkeys(tasks))
+        if self.num_threads > 1:
+            # ``map`` of the pool keeps the order of the tasks
+            loaded = list(self._get_pool().map(self._load_image, unique_tasks))
+        else:
+            loaded = [self._load_image(task) for task in unique_tasks]
+        frame_dict = {
+            task: img
+            for task, (img, _) in zip(unique_tasks, loaded)
+        }
+        imgs = _scatter_frames(frame_dict, tasks)
+
         results['imgs'] = imgs
         results['original_shape'] = imgs[0].shape[:2]
         results['img_shape'] = imgs[0].shape[:2]
+        if self.target_short_side is not None:
+            _set_reduced_scale_factor(results, *loaded[0])
 
         # we resize the gt_bboxes and proposals to their real scale
         if 'gt_bboxes' in results:
@@ -1170,7 +1768,88 @@ class RawFrameDecode:
     def __repr__(self):
         repr_str = (f'{self.__class__.__name__}('
                     f'io_backend={self.io_backend}, '
-                    f'decoding_backend={self.decoding_backend})')
+                    f'decoding_backend={self.decoding_backend}, '
+                    f'num_threads={self.num_threads}, '
+                    f'target_short_side={self.target_short_side})')
+        return repr_str
+
+
+@PIPELINES.register_module()
+class PackedFrameDecode(RawFrameDecode):
+    """Load and decode frames with given indices from a frame pack.
+
+    The frames of a video are stored in one frame pack file written by
+    :func:`mmaction.utils.write_frame_pack`, which holds the encoded frames
+    named as in the rawframe directory together with an index of their
+    offsets. The frame pack of a video is located at "frame_dir" + ``suffix``
+    and it is memory mapped, so that every frame is read with a single copy
+    from the mapped file.
+
+    Required keys are "frame_dir", "filename_tmpl" and "frame_inds",
+    added or modified keys are "imgs", "img_shape" and "original_shape".
+
+    Args:
+        io_backend (str): IO backend where frame packs are stored. Frame packs
+            on other backends than 'disk' are read as a whole.
+            Default: 'disk'.
+        decoding_backend (str): Backend used for image decoding.
+            Default: 'cv2'.
+        num_threads (int): Number of threads to decode the frames
+            concurrently. Default: 1.
+        target_short_side (int | None): If set, JPEG frames are decoded with
+            DCT domain downscaling to the smallest size whose short side is
+            at least ``target_short_side``. Default: None.
+        suffix (str): Suffix appended to "frame_dir" to get the path of the
+            frame pack. Default: '.pack'.
+        kwargs (dict, optional): Arguments for FileClient.
+    """
+
+    def __init__(self,
+                 io_backend='disk',
+                 decoding_backend='cv2',
+                 num_threads=1,
+                 target_short_side=None,
+                 suffix='.pack',
+                 **kwargs):
+        super().__init__(io_backend, decoding_backend, num_threads,
+                         target_short_side, **kwargs)
+        self.suffix = suffix
+        self._frame_pack = None
+
+    def _get_bytes(self, filepath):
+        return self._frame_pack.get(osp.basename(filepath))
+
+    def __call__(self, results):
+        """Perform the ``PackedFrameDecode`` to pick frames given indices.
+
+        Args:
+            results (dict): The resulting dict to be modified and passed
+                to the next transform in pipeline.
+        """
+        if self.file_client is None:
+            self.file_client = FileClient(self.io_backend, **self.kwargs)
+
+        pack_path = results['frame_dir'] + self.suffix
+        if self.io_backend == 'disk':
+            frame_pack = FramePack(pack_path)
+        else:
+            frame_pack = FramePack(buffer=self.file_client.get(pack_path))
+
+        self._frame_pack = frame_pack
+        try:
+            results = super().__call__(results)
+        finally:
+            self._frame_pack = None
+            frame_pack.close()
+        return results
+
+    def __repr__(self):
+        repr_str = (f'{self.__class__.__name__}('
+                    f'io_backend={self.io_backend}, '
+                    f'decoding_backend={self.decoding_backend}, '
+                    f'num_threads={self.num_threads}, '
+                    f'target_short_side={self.target_short_side}, '
+                    f'suffix={self.suffix})')
         return repr_str
 
 
@@ -1185,12 +1864,21 @@ class ImageDecode:
         io_backend (str): IO backend where frames are stored. Default: 'disk'.
         decoding_backend (str): Backend used for image decoding.
             Default: 'cv2'.
+        target_short_side (int | None): If set, JPEG images are decoded with
+            DCT domain downscaling to the smallest size whose short side is
+            at least ``target_short_side``, and "scale_factor" records the
+            downscaling. Default: None.
         kwargs (dict, optional): Arguments for FileClient.
     """
 
-    def __init__(self, io_backend='disk', decoding_backend='cv2', **kwargs):
+    def __init__(self,
+                 io_backend='disk',
+                 decoding_backend='cv2',
+                 target_short_side=None,
+                 **kwargs):
         self.io_backend = io_backend
         self.decoding_backend = decoding_backend
+        self.target_short_side = target_short_side
         self.kwargs = kwargs
         self.file_client = None
 
@@ -1211,7 +1899,11 @@ class ImageDecode:
         imgs = list()
         img_bytes = self.file_client.get(filename)
 
-        img = mmcv.imfrombytes(img_bytes, channel_order='rgb')
+        if self.target_short_side is not None:
+            img, size = _imfrombytes_reduced(img_bytes, self.target_short_side)
+            _set_reduced_scale_factor(results, img, size)
+        else:
+            img = mmcv.imfrombytes(img_bytes, channel_order='rgb')
         imgs.append(img)
 
         results['imgs'] = imgs
@@ -1219,24 +1911,41 @@ class ImageDecode:
         results['img_shape'] = imgs[0].shape[:2]
         return results
 
+    def __repr__(self):
+        repr_str = (f'{self.__class__.__name__}('
+                    f'io_backend={self.io_backend}, '
+                    f'decoding_backend={self.decoding_backend}, '
+                    f'target_short_side={self.target_short_side})')
+        return repr_str
+
 
 @PIPELINES.register_module()
 class AudioDecodeInit:
     """Using librosa to initialize the audio reader.
 
     Required keys are "audio_path", added or modified keys are "length",
-    "sample_rate", "audios".
+    "sample_rate", "audios" and "audio_reader".
 
     Args:
         io_backend (str): io backend where frames are store.
             Default: 'disk'.
         sample_rate (int): Audio sampling times per second. Default: 16000.
+        pad_method (str): Method to generate a dummy input when the audio
+            file does not exist. Options are 'zero' and 'random'.
+            Default: 'zero'.
+        streaming (bool): If set to True, the audio file is opened with
+            soundfile as "audio_reader" instead of being decoded as a whole,
+            and ``AudioDecode`` reads only the samples covered by the clips.
+            Files soundfile can not read are decoded as a whole with librosa.
+            Default: False.
+        kwargs (dict): Args for file client.
     """
 
     def __init__(self,
                  io_backend='disk',
                  sample_rate=16000,
                  pad_method='zero',
+                 streaming=False,
                  **kwargs):
         self.io_backend = io_backend
         self.sample_rate = sample_rate
@@ -1244,6 +1953,7 @@ class AudioDecodeInit:
             self.pad_method = pad_method
         else:
             raise NotImplementedError
+        self.streaming = streaming
         self.kwargs = kwargs
         self.file_client = None
 
@@ -1256,6 +1966,23 @@ class AudioDecodeInit:
         # librosa load raw audio file into a distribution of -1~+1
         return np.random.rand(shape).astype(np.float32) * 2 - 1
 
+    def _open_reader(self, audio_path):
+        """Open the audio file with soundfile, return None if soundfile can
+        not read it."""
+        try:
+            import soundfile
+        except ImportError:
+            raise ImportError('Please install soundfile first.')
+
+        if self.io_backend == 'disk':
+            file_obj = audio_path
+        else:
+            file_obj = io.BytesIO(self.file_client.get(audio_path))
+        try:
+            return soundfile.SoundFile(file_obj)
+        except RuntimeError:
+            return None
+
     def __call__(self, results):
         """Perform the librosa initialization.
 
@@ -1271,6 +1998,16 @@ class AudioDecodeInit:
         if self.file_client is None:
             self.file_client = FileClient(self.io_backend, **self.kwargs)
         if osp.exists(results['audio_path']):
+            reader = None
+            if self.streaming:
+                reader = self._open_reader(results['audio_path'])
+            if reader is not None:
+                results['audio_reader'] = reader
+                results['length'] = int(
+                    round(reader.frames * self.sample_rate /
+                          reader.samplerate))
+                results['sample_rate'] = self.sample_rate
+                return results
             file_obj = io.BytesIO(self.file_client.get(results['audio_path']))
             y, sr = librosa.load(file_obj, sr=self.sample_rate)
         else:
@@ -1288,7 +2025,8 @@ class AudioDecodeInit:
         repr_str = (f'{self.__class__.__name__}('
                     f'io_backend={self.io_backend}, '
                     f'sample_rate={self.sample_rate}, '
-                    f'pad_method={self.pad_method})')
+                    f'pad_method={self.pad_method}, '
+                    f'streaming={self.streaming})')
         return repr_str
 
 
@@ -1343,24 +2081,46 @@ class LoadAudioFeature:
 class AudioDecode:
     """Sample the audio w.r.t. the frames selected.
 
+    If "audio_reader" is given by ``AudioDecodeInit`` with ``streaming=True``,
+    only the samples covered by each clip are read from the audio file.
+
     Args:
         fixed_length (int): As the audio clip selected by frames sampled may
             not be exactly the same, `fixed_length` will truncate or pad them
             into the same size. Default: 32000.
 
     Required keys are "frame_inds", "num_clips", "total_frames", "length",
-    added or modified keys are "audios", "audios_shape".
+    and "audios" or "audio_reader", added or modified keys are "audios",
+    "audios_shape", "audio_clip_ranges" and "audio_reader".
     """
 
     def __init__(self, fixed_length=32000):
         self.fixed_length = fixed_length
 
+    @staticmethod
+    def _read_clip(reader, start_idx, end_idx, sample_rate):
+        """Read the samples in [start_idx, end_idx) at ``sample_rate`` from a
+        soundfile reader, mixed down to mono."""
+        native_rate = reader.samplerate
+        native_start = int(start_idx * native_rate / sample_rate)
+        native_end = int(np.ceil(end_idx * native_rate / sample_rate))
+        reader.seek(native_start)
+        clip = reader.read(
+            native_end - native_start, dtype='float32', always_2d=True)
+        clip = clip.mean(axis=1)
+        if native_rate != sample_rate:
+            import librosa
+            clip = librosa.resample(
+                clip, orig_sr=native_rate, target_sr=sample_rate)
+        return clip[:end_idx - start_idx]
+
     def __call__(self, results):
         """Perform the ``AudioDecode`` to pick audio clips."""
-        audio = results['audios']
+        reader = results.get('audio_reader')
         frame_inds = results['frame_inds']
         num_clips = results['num_clips']
         resampled_clips = list()
+        clip_ranges = list()
         frame_inds = frame_inds.reshape(num_clips, -1)
         for clip_idx in range(num_clips):
             clip_frame_inds = frame_inds[clip_idx]
@@ -1374,7 +2134,14 @@ class AudioDecode:
                 int(
                     round((clip_frame_inds[-1] + 1) / results['total_frames'] *
                           results['length'])))
-            cropped_audio = audio[start_idx:end_idx]
+            clip_ranges.append((start_idx, end_idx))
+            if reader is not None:
+                # the samples after ``fixed_length`` are truncated anyway
+                end_idx = min(end_idx, start_idx + self.fixed_length)
+                cropped_audio = self._read_clip(reader, start_idx, end_idx,
+                                                results['sample_rate'])
+            else:
+                cropped_audio = results['audios'][start_idx:end_idx]
             if cropped_audio.shape[0] >= self.fixed_length:
                 truncated_audio = cropped_audio[:self.fixed_length]
             else:
@@ -1385,10 +2152,20 @@ class AudioDecode:
 
             resampled_clips.append(truncated_audio)
 
+        if reader is not None:
+            reader.close()
+            results['audio_reader'] = None
+
         results['audios'] = np.array(resampled_clips)
         results['audios_shape'] = results['audios'].shape
+        results['audio_clip_ranges'] = np.array(clip_ranges)
         return results
 
+    def __repr__(self):
+        repr_str = (f'{self.__class__.__name__}('
+                    f'fixed_length={self.fixed_length})')
+        return repr_str
+
 
 @PIPELINES.register_module()
 class BuildPseudoClip:
@@ -6,6 +6,7 @@ import torch
 
 from .base import BaseDataset
 from .registry import DATASETS
+from .video_infos import CompactVideoInfos
 
 
 @DATASETS.register_module()
@@ -82,6 +83,8 @@ class RawframeDataset(BaseDataset):
             when sampling data. `power == 1` indicates uniformly sampling all
             data; `power == 0` indicates uniformly sampling all classes.
             Default: None.
+        cache_annotations (bool): Whether to cache the loaded annotations in
+            a binary file next to ``ann_file``. Default: False.
     """
 
     def __init__(self,
@@ -96,7 +99,8 @@ class RawframeDataset(BaseDataset):
                  start_index=1,
                  modality='RGB',
                  sample_by_class=False,
-                 power=None):
+                 power=None,
+                 cache_annotations=False):
         self.filename_tmpl = filename_tmpl
         self.with_offset = with_offset
         super().__init__(
@@ -109,7 +113,8 @@ class RawframeDataset(BaseDataset):
             start_index,
             modality,
             sample_by_class=sample_by_class,
-            power=power)
+            power=power,
+            cache_annotations=cache_annotations)
 
     def load_annotations(self):
         """Load annotation file to get video information."""
@@ -147,7 +152,7 @@ class RawframeDataset(BaseDataset):
                     video_info['label'] = label[0]
                 video_infos.append(video_info)
 
-        return video_infos
+        return CompactVideoInfos(video_infos)
 
     def prepare_train_frames(self, idx):
         """Prepare the frames for training given the index."""
@@ -0,0 +1,328 @@
+import glob
+import io
+import json
+import os.path as osp
+import random
+import tarfile
+
+import numpy as np
+import torch
+from mmcv import FileClient
+from mmcv.runner import get_dist_info
+from torch.utils.data import IterableDataset, get_worker_info
+
+from .pipelines import Compose
+from .registry import DATASETS
+
+
+@DATASETS.register_module()
+class ShardedVideoDataset(IterableDataset):
+    """Streaming video dataset reading sequential tar shards.
+
+    Each shard is a tar file of samples stored one after another, like
+    `WebDataset <https://github.com/webdataset/webdataset>`_. The members of
+    a sample share the same key, i.e. the basename up to the first dot: the
+    encoded video ``{key}.mp4`` (or another extension in ``video_exts``), and
+    the label ``{key}.cls`` as whitespace-separated ints and/or the other
+    fields of the sample ``{key}.json`` as a dict. For example,
+
+    .. code-block:: txt
+
+        shard_000000.tar
+        ├── some/dir/video_0.mp4
+        ├── some/dir/video_0.cls    # "7"
+        ├── some/dir/video_1.mp4
+        ├── some/dir/video_1.cls    # "3"
+        └── ...
+
+    The video bytes are put in "video_bytes", which ``DecordInit`` and
+    ``PyAVInit`` read instead of the file of "filename".
+
+    Shards are split over the ranks and then the dataloader workers, so
+    there should be at least as many shards as ranks x workers. The shards
+    are shuffled by ``seed`` and the epoch set by :meth:`set_epoch` (see
+    :obj:`DatasetEpochHook`), and the samples are shuffled within a buffer.
+    Training can be resumed at a shard of the order of an epoch with
+    ``start_shard``, where "shard_index" of the samples records the position
+    of their shards in the order.
+
+    The dataset is meant for training only. It has no ``evaluate``, and the
+    order of its samples depends on the ranks and workers, so validate and
+    test on a :obj:`VideoDataset` instead.
+
+    Args:
+        shards (str | list[str]): Paths to the shards, or a glob pattern of
+            them, relative to ``data_prefix``.
+        pipeline (list[dict | callable]): A sequence of data transforms.
+        data_prefix (str | None): Path to a directory where shards are held.
+            Default: None.
+        test_mode (bool): Store True to read the shards and samples in order
+            without shuffling, e.g. to inspect the data. Default: False.
+        multi_class (bool): Determines whether the dataset is a multi-class
+            dataset. Default: False.
+        num_classes (int | None): Number of classes of the dataset, used in
+            multi-class datasets. Default: None.
+        start_index (int): Specify a start index for frames. Default: 0.
+        modality (str): Modality of data. Default: 'RGB'.
+        shuffle_buffer (int): Size of the buffer to shuffle samples in, 0 for
+            no shuffling. Default: 1000.
+        seed (int): Seed to shuffle the shards and samples. Default: 0.
+        epoch (int): The initial epoch. Default: 0.
+        start_shard (int): Number of the shards of the initial epoch to skip
+            when resuming. Default: 0.
+        num_samples (int | None): Number of samples of an epoch. If set, each
+            rank yields ``num_samples // world_size`` samples per epoch,
+            reading its shards again if they run out, so that all the ranks
+            run the same number of iterations. If set to None, the shards are
+            read once per epoch and the dataset has no length.
+            Default: None.
+        video_exts (tuple[str]): Extensions of the video members.
+            Default: ('mp4', 'avi', 'webm', 'mkv', 'mov').
+        io_backend (str): io backend where shards are stored. Shards on other
+            backends than 'disk' are fetched into memory. Default: 'disk'.
+        kwargs (dict): Args for file client.
+    """
+
+    def __init__(self,
+                 shards,
+                 pipeline,
+                 data_prefix=None,
+                 test_mode=False,
+                 multi_class=False,
+                 num_classes=None,
+                 start_index=0,
+                 modality='RGB',
+                 shuffle_buffer=1000,
+                 seed=0,
+                 epoch=0,
+                 start_shard=0,
+                 num_samples=None,
+                 video_exts=('mp4', 'avi', 'webm', 'mkv', 'mov'),
+                 io_backend='disk',
+                 **kwargs):
+        super().__init__()
+        if isinstance(shards, str):
+            pattern = shards
+            if data_prefix is not None:
+                pattern = osp.join(data_prefix, pattern)
+            shards = sorted(glob.glob(pattern))
+        elif data_prefix is not None:
+            shards = [osp.join(data_prefix, shard) for shard in shards]
+        if not shards:
+            raise ValueError('No shard is found')
+        self.shards = list(shards)
+        self.data_prefix = data_prefix
+        self.test_mode = test_mode
+        self.multi_class = multi_class
+        self.num_classes = num_classes
+        self.start_index = start_index
+        self.modality = modality
+        self.shuffle_buffer = 0 if test_mode else shuffle_buffer
+        self.seed = seed
+        self.epoch = epoch
+        self.start_shard = start_shard
+        self.num_samples = num_samples
+        self.video_exts = tuple(video_exts)
+        self.io_backend = io_backend
+        self.kwargs = kwargs
+        self.file_client = None
+        self.batch_size = 1
+        if self.multi_class:
+            assert self.num_classes is not None
+
+        self.pipeline = Compose(pipeline)
+
+    def set_epoch(self, epoch):
+        """Set the epoch to shuffle the shards and samples of.
+
+        ``start_shard`` only applies to the initial epoch.
+
+        Args:
+            epoch (int): The epoch.
+        """
+        if epoch != self.epoch:
+            self.start_shard = 0
+        self.epoch = epoch
+
+    def set_batch_size(self, batch_size):
+        """Set the batch size of the dataloader, so that the workers split the
+        samples of an epoch by whole batches.
+
+        Args:
+            batch_size (int): The batch size.
+        """
+        self.batch_size = batch_size
+
+    def __len__(self):
+        """Get the number of samples of an epoch on this rank."""
+        if self.num_samples is None:
+            raise TypeError(f'{self.__class__.__name__} without num_samples '
+                            'has no length')
+        _, world_size = get_dist_info()
+        return self.num_samples // world_size
+
+    def _get_shard_order(self, epoch, start_shard=0):
+        order = list(range(len(self.shards)))
+        if not self.test_mode:
+            random.Random(self.seed + epoch).shuffle(order)
+        return order[start_shard:]
+
+    def _open_shard(self, shard):
+        if self.io_backend == 'disk':
+            return tarfile.open(shard, mode='r|*')
+        if self.file_client is None:
+            self.file_client = FileClient(self.io_backend, **self.kwargs)
+        return tarfile.open(
+            fileobj=io.BytesIO(self.file_client.get(shard)), mode='r|*')
+
+    def _read_shard(self, shard):
+        """Yield the members of the samples in a shard, grouped by keys."""
+        key, sample = None, {}
+        with self._open_shard(shard) as tar:
+            for member in tar:
+                if not member.isfile():
+                    continue
+                dirname, basename = osp.split(member.name)
+                member_key, _, ext = basename.partition('.')
+                member_key = osp.join(dirname, member_key)
+                if member_key != key:
+                    if sample:
+                        yield key, sample
+                    key, sample = member_key, {}
+                sample[ext] = tar.extractfile(member).read()
+        if sample:
+            yield key, sample
+
+    def _make_results(self, shard, key, sample):
+        video_ext = next((ext for ext in self.video_exts if ext in sample),
+                         None)
+        if video_ext is None:
+            raise KeyError(f'No video of {key} in {shard}')
+        results = dict(
+            filename=f'{shard}/{key}.{video_ext}',
+            video_bytes=sample[video_ext])
+        if 'json' in sample:
+            results.update(json.loads(sample['json']))
+        if 'cls' in sample:
+            label = [int(x) for x in sample['cls'].split()]
+            if self.multi_class:
+                results['label'] = label
+            else:
+                assert len(label) == 1
+                results['label'] = label[0]
+        results['modality'] = self.modality
+        results['start_index'] = self.start_index
+
+        # prepare tensor in getitem
+        if self.multi_class and isinstance(results['label'], list):
+            onehot = torch.zeros(self.num_classes)
+            onehot[results['label']] = 1.
+            results['label'] = onehot
+        return results
+
+    def _iter_samples(self, rank, world_size, worker_id, num_workers, stats):
+        """Yield the samples of the shards of a worker, passing over the
+        shards again if a fixed number of samples is required.
+
+        The number of samples of the first full pass is recorded in
+        ``stats['pass_size']``.
+        """
+        num_readers = world_size * num_workers
+        reader_id = rank * num_workers + worker_id
+        epoch, start_shard = self.epoch, self.start_shard
+        while True:
+            order = self._get_shard_order(epoch, start_shard)
+            shard_inds = [
+                i for i in range(len(order)) if i % num_readers == reader_id
+            ]
+            if not shard_inds:
+                if self.num_samples is None:
+                    return
+                raise ValueError(
+                    f'{len(order)} shards are not enough for {world_size} '
+                    f'ranks x {num_workers} workers')
+            num_read = 0
+            for i in shard_inds:
+                shard = self.shards[order[i]]
+                for key, sample in self._read_shard(shard):
+                    results = self._make_results(shard, key, sample)
+                    results['shard_index'] = start_shard + i
+                    num_read += 1
+                    yield results
+            if self.num_samples is None:
+                return
+            if num_read == 0:
+                raise ValueError(f'No sample is read from the shards of '
+                                 f'rank {rank} worker {worker_id}')
+            if start_shard == 0:
+                stats.setdefault('pass_size', num_read)
+            # another pass over the shards in a new order
+            epoch, start_shard = epoch + 1, 0
+
+    def _get_num_yields(self, worker_id, num_workers):
+        """Get the number of samples a worker yields in an epoch.
+
+        The samples of a rank are split over the workers by whole batches,
+        so that only the last batch of an epoch is incomplete.
+        """
+        num_rank_samples = len(self)
+        batch_size = self.batch_size
+        num_batches = -(-num_rank_samples // batch_size)
+        num_worker_batches = num_batches // num_workers + int(
+            worker_id < num_batches % num_workers)
+        num_yields = num_worker_batches * batch_size
+        if num_batches > 0 and (num_batches - 1) % num_workers == worker_id:
+            # the worker of the incomplete last batch
+            num_yields -= num_batches * batch_size - num_rank_samples
+        return num_yields
+
+    def __iter__(self):
+        rank, world_size = get_dist_info()
+        worker_info = get_worker_info()
+        if worker_info is None:
+            worker_id, num_workers = 0, 1
+        else:
+            worker_id, num_workers = worker_info.id, worker_info.num_workers
+
+        num_yields = None
+        if self.num_samples is not None:
+            num_yields = self._get_num_yields(worker_id, num_workers)
+            if num_yields == 0:
+                return
+
+        rng = np.random.RandomState(
+            (self.seed, self.epoch, rank * num_workers + worker_id))
+        stats = {}
+        samples = self._iter_samples(rank, world_size, worker_id, num_workers,
+                                     stats)
+        num_yielded = 0
+        num_dropped = 0
+        for results in self._shuffle(samples, rng):
+            results = self.pipeline(results)
+            # skip the samples dropped by the pipeline
+            if results is None:
+                num_dropped += 1
+                if num_dropped > stats.get('pass_size', num_dropped):
+                    raise RuntimeError(
+                        'The pipeline drops all the samples of a pass over '
+                        f'the shards of rank {rank} worker {worker_id}')
+                continue
+            num_dropped = 0
+            yield results
+            num_yielded += 1
+            if num_yielded == num_yields:
+                return
+
+    def _shuffle(self, samples, rng):
+        """Shuffle the samples in a buffer."""
+        buffer = []
+        for results in samples:
+            if len(buffer) < self.shuffle_buffer:
+                buffer.append(results)
+                continue
+            if buffer:
+                idx = rng.randint(len(buffer))
+                buffer[idx], results = results, buffer[idx]
+            yield results
+        rng.shuffle(buffer)
+        yield from buffer
@@ -0,0 +1,248 @@
+import multiprocessing
+from collections.abc import Mapping
+
+import torch
+from mmcv.parallel import collate
+from torch.utils.data import DataLoader
+
+# offsets of the fields in a slab are aligned to cache lines
+_ALIGNMENT = 64
+
+
+class SharedSlabRing:
+    """A ring of preallocated shared-memory slabs carrying batches from the
+    dataloader workers to the main process.
+
+    A worker acquires a free slab and stacks a batch into it, and the main
+    process releases the slab when the batch is consumed. Since the slabs are
+    allocated once and mapped by all the processes, a batch is neither
+    pickled nor copied into new shared memory.
+
+    Args:
+        num_slabs (int): Number of slabs.
+        slab_size (int): Size of each slab in bytes.
+        pin_memory (bool): Whether to page-lock the slabs in the main process,
+            so that the batches are copied to GPUs asynchronously without
+            being copied into pinned memory first. Default: False.
+        mp_context (str | :obj:`multiprocessing.context.BaseContext` | None):
+            Multiprocessing context of the dataloader workers. Default: None.
+    """
+
+    def __init__(self,
+                 num_slabs,
+                 slab_size,
+                 pin_memory=False,
+                 mp_context=None):
+        if num_slabs < 1:
+            raise ValueError(f'num_slabs must be positive, got {num_slabs}')
+        self.num_slabs = num_slabs
+        self.slab_size = slab_size
+        self.slabs = [
+            torch.empty(slab_size, dtype=torch.uint8).share_memory_()
+            for _ in range(num_slabs)
+        ]
+        self._in_use = torch.zeros(num_slabs, dtype=torch.bool).share_memory_()
+        if mp_context is None or isinstance(mp_context, str):
+            mp_context = multiprocessing.get_context(mp_context)
+        self._cond = mp_context.Condition()
+
+        self.pinned = pin_memory and torch.cuda.is_available()
+        if self.pinned:
+            cudart = torch.cuda.cudart()
+            for slab in self.slabs:
+                cudart.cudaHostRegister(slab.data_ptr(), slab.numel(), 0)
+
+    def acquire(self):
+        """Wait for a free slab and mark it in use.
+
+        Returns:
+            int: Index of the slab.
+        """
+        with self._cond:
+            while True:
+                free = (~self._in_use).nonzero()
+                if len(free) > 0:
+                    index = int(free[0])
+                    self._in_use[index] = True
+                    return index
+                self._cond.wait()
+
+    def release(self, index):
+        """Mark a slab free.
+
+        Args:
+            index (int): Index of the slab.
+        """
+        with self._cond:
+            self._in_use[index] = False
+            self._cond.notify_all()
+
+    def reset(self):
+        """Mark all the slabs free, when no worker is alive."""
+        with self._cond:
+            self._in_use.zero_()
+            self._cond.notify_all()
+
+    def __del__(self):
+        if getattr(self, 'pinned', False):
+            cudart = torch.cuda.cudart()
+            for slab in self.slabs:
+                cudart.cudaHostUnregister(slab.data_ptr())
+
+
+class SlabBatch:
+    """Handle of a batch stacked into a slab of :obj:`SharedSlabRing`.
+
+    Only the handle is sent from the worker to the main process, where the
+    tensors are restored as views of the slab by :meth:`unpack`.
+
+    Args:
+        index (int): Index of the slab.
+        layout (list[tuple]): Key, offset in bytes, shape and dtype of each
+            tensor in the slab.
+        rest (dict): The other fields of the batch collated by mmcv
+            ``collate``.
+        keys (list[str]): Keys of the batch in order.
+    """
+
+    def __init__(self, index, layout, rest, keys):
+        self.index = index
+        self.layout = layout
+        self.rest = rest
+        self.keys = keys
+
+    def pin_memory(self):
+        """The slabs are pinned in advance, so the batch is left as it is."""
+        return self
+
+    def unpack(self, ring):
+        """Restore the batch with the tensors as views of the slab.
+
+        Args:
+            ring (:obj:`SharedSlabRing`): The ring holding the slab.
+
+        Returns:
+            dict: The batch.
+        """
+        slab = ring.slabs[self.index]
+        tensors = {}
+        for key, offset, shape, dtype in self.layout:
+            nbytes = _nbytes(shape, dtype)
+            tensors[key] = slab[offset:offset + nbytes].view(dtype).view(shape)
+        return {
+            key: tensors[key] if key in tensors else self.rest[key]
+            for key in self.keys
+        }
+
+
+def _nbytes(shape, dtype):
+    numel = 1
+    for size in shape:
+        numel *= size
+    return numel * torch.empty((), dtype=dtype).element_size()
+
+
+class SlabCollate:
+    """Collate a batch into a slab of :obj:`SharedSlabRing`.
+
+    Tensors of the same shape and dtype in all the samples, e.g. "imgs" and
+    "label", are stacked into a free slab, and the other fields are collated
+    by mmcv ``collate``. Batches which are not dicts, or do not fit in a slab,
+    are collated by mmcv ``collate`` as usual.
+
+    Args:
+        ring (:obj:`SharedSlabRing`): The ring of slabs.
+        samples_per_gpu (int): Number of samples on each GPU. Default: 1.
+    """
+
+    def __init__(self, ring, samples_per_gpu=1):
+        self.ring = ring
+        self.samples_per_gpu = samples_per_gpu
+
+    def _get_layout(self, batch):
+        layout = []
+        offset = 0
+        for key, value in batch[0].items():
+            if not isinstance(value, torch.Tensor):
+                continue
+            if not all(
+                    isinstance(sample[key], torch.Tensor) and sample[key].shape
+                    == value.shape and sample[key].dtype == value.dtype
+                    for sample in batch):
+                continue
+            shape = (len(batch), ) + tuple(value.shape)
+            layout.append((key, offset, shape, value.dtype))
+            offset += -(-_nbytes(shape, value.dtype) //
+                        _ALIGNMENT) * _ALIGNMENT
+        return layout, offset
+
+    def __call__(self, batch):
+        if not isinstance(batch[0], Mapping):
+            return collate(batch, samples_per_gpu=self.samples_per_gpu)
+        layout, size = self._get_layout(batch)
+        if not layout or size > self.ring.slab_size:
+            return collate(batch, samples_per_gpu=self.samples_per_gpu)
+
+        index = self.ring.acquire()
+        slab = self.ring.slabs[index]
+        for key, offset, shape, dtype in layout:
+            out = slab[offset:offset +
+                       _nbytes(shape, dtype)].view(dtype).view(shape)
+            torch.stack([sample[key] for sample in batch], out=out)
+
+        stacked_keys = {key for key, *_ in layout}
+        rest = [{
+            key: value
+            for key, value in sample.items() if key not in stacked_keys
+        } for sample in batch]
+        rest = collate(
+            rest, samples_per_gpu=self.samples_per_gpu) if rest[0] else {}
+        return SlabBatch(index, layout, rest, list(batch[0]))
+
+
+class SlabDataLoader(DataLoader):
+    """DataLoader whose workers collate batches into a
+    :obj:`SharedSlabRing`.
+
+    The tensors of a batch are views of a slab, which is reused after the
+    next batch is fetched, so a batch should not be kept beyond the next
+    iteration.
+
+    Args:
+        dataset (:obj:`Dataset`): A PyTorch dataset.
+        slab_ring (:obj:`SharedSlabRing`): The ring of slabs, which should
+            have more slabs than the batches prefetched by the workers.
+        samples_per_gpu (int): Number of samples on each GPU. Default: 1.
+        kwargs (dict): Other arguments of :obj:`DataLoader`, except
+            ``collate_fn``.
+    """
+
+    def __init__(self, dataset, slab_ring, samples_per_gpu=1, **kwargs):
+        if kwargs.get('persistent_workers', False):
+            raise NotImplementedError(
+                'Persistent workers are not supported with shared-memory '
+                'slabs')
+        super().__init__(
+            dataset,
+            collate_fn=SlabCollate(slab_ring, samples_per_gpu),
+            **kwargs)
+        self.slab_ring = slab_ring
+
+    def __iter__(self):
+        iterator = super().__iter__()
+        held = None
+        try:
+            for batch in iterator:
+                # the previous batch has been consumed
+                if held is not None:
+                    self.slab_ring.release(held)
+                    held = None
+                if isinstance(batch, SlabBatch):
+                    held = batch.index
+                    batch = batch.unpack(self.slab_ring)
+                yield batch
+        finally:
+            # the workers are shut down before the slabs of the batches they
+            # prefetched are freed
+            del iterator
+            self.slab_ring.reset()
@@ -1,9 +1,8 @@
 import os.path as osp
 
-import torch
-
 from .base import BaseDataset
 from .registry import DATASETS
+from .video_infos import CompactVideoInfos
 
 
 @DATASETS.register_module()
@@ -52,16 +51,12 @@ class VideoDataset(BaseDataset):
                 if self.multi_class:
                     assert self.num_classes is not None
                     filename, label = line_split[0], line_split[1:]
+                    # converted into one-hot tensors when preparing samples
                     label = list(map(int, label))
-                    onehot = torch.zeros(self.num_classes)
-                    onehot[label] = 1.0
                 else:
                     filename, label = line_split
                     label = int(label)
                 if self.data_prefix is not None:
                     filename = osp.join(self.data_prefix, filename)
-                video_infos.append(
-                    dict(
-                        filename=filename,
-                        label=onehot if self.multi_class else label))
-        return video_infos
+                video_infos.append(dict(filename=filename, label=label))
+        return CompactVideoInfos(video_infos)
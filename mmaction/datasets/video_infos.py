@@ -0,0 +1,309 @@
+import os
+import pickle
+import struct
+from collections.abc import Sequence
+
+import numpy as np
+
+# kinds of columns, by the types of the values
+_NUMERIC_KINDS = {'int': np.int64, 'float': np.float64, 'bool': np.bool_}
+# placeholder of the fields missed by some videos
+_MISSING = object()
+
+# binary format of the dumped video infos: the magic, the length of the
+# pickled header, the header, and the arrays aligned to _ALIGNMENT bytes
+_MAGIC = b'MMAVINFO'
+_VERSION = 1
+_ALIGNMENT = 64
+
+
+def _align(nbytes):
+    return -(-nbytes // _ALIGNMENT) * _ALIGNMENT
+
+
+def _infer_kind(values):
+    if all(type(value) is bool for value in values):
+        return 'bool'
+    if all(type(value) is int for value in values):
+        return 'int'
+    if all(type(value) is float for value in values):
+        return 'float'
+    if all(type(value) is str for value in values):
+        return 'str'
+    if all(
+            type(value) is list and all(type(x) is int for x in value)
+            for value in values):
+        return 'int_list'
+    return 'object'
+
+
+class CompactVideoInfos(Sequence):
+    """A columnar store of video infos.
+
+    A list of video info dicts takes a Python object for each field of each
+    video, whose reference counts are updated whenever it is read. The pages
+    of such a list are then copied by every dataloader worker forked from the
+    main process, however read-only the list is. Instead, each field is kept
+    in a NumPy array here: ints, floats and bools in arrays of their types,
+    lists of ints in a flattened array with offsets, and strings and other
+    objects (pickled) in one byte blob shared by all the fields.
+
+    It is a sequence of dicts, and a new dict is built for each access, so
+    modifying a dict does not change the store. It can be dumped into a
+    binary file and loaded back by memory mapping, so the processes loading
+    the same file share its pages.
+
+    Args:
+        video_infos (list[dict]): The video infos. Videos can miss some of
+            the fields.
+    """
+
+    def __init__(self, video_infos):
+        self._len = len(video_infos)
+        self._keys = []
+        values = {}
+        for i, video_info in enumerate(video_infos):
+            for key, value in video_info.items():
+                if key not in values:
+                    self._keys.append(key)
+                    values[key] = [_MISSING] * self._len
+                values[key][i] = value
+
+        blob = bytearray()
+        self._columns = {}
+        self._present = {}
+        for key in self._keys:
+            column = values.pop(key)
+            present = np.array([value is not _MISSING for value in column])
+            self._present[key] = None if present.all() else present
+            column = [value for value in column if value is not _MISSING]
+            kind = _infer_kind(column)
+            if kind in _NUMERIC_KINDS:
+                data = np.zeros(self._len, dtype=_NUMERIC_KINDS[kind])
+                data[present] = column
+            elif kind == 'int_list':
+                lengths = np.zeros(self._len, dtype=np.int64)
+                lengths[present] = [len(value) for value in column]
+                offsets = np.zeros(self._len + 1, dtype=np.int64)
+                np.cumsum(lengths, out=offsets[1:])
+                flat = [x for value in column for x in value]
+                data = (np.array(flat, dtype=np.int64), offsets)
+            else:
+                starts = np.zeros(self._len, dtype=np.int64)
+                ends = np.zeros(self._len, dtype=np.int64)
+                for i, value in zip(np.flatnonzero(present), column):
+                    starts[i] = len(blob)
+                    if kind == 'str':
+                        blob += value.encode('utf-8')
+                    else:
+                        blob += pickle.dumps(value)
+                    ends[i] = len(blob)
+                data = (starts, ends)
+            self._columns[key] = (kind, data)
+        self._blob = np.frombuffer(bytes(blob), dtype=np.uint8)
+        self._filename = None
+
+    def dump(self, filename, meta=None):
+        """Dump the video infos into a binary file.
+
+        The file is written to a temporary file first and then renamed, so
+        processes dumping the same file concurrently do not corrupt it.
+
+        Args:
+            filename (str): Path to the file.
+            meta (dict | None): Meta information stored with the video infos,
+                e.g. to validate the file. Default: None.
+        """
+        arrays = [self._blob]
+        columns = {}
+        present = {}
+        for key in self._keys:
+            kind, data = self._columns[key]
+            data = data if isinstance(data, tuple) else (data, )
+            columns[key] = (kind, len(arrays), len(data))
+            arrays.extend(data)
+            if self._present[key] is None:
+                present[key] = None
+            else:
+                present[key] = len(arrays)
+                arrays.append(self._present[key])
+
+        layout = []
+        offset = 0
+        for array in arrays:
+            layout.append((offset, array.dtype.str, array.shape))
+            offset += _align(array.nbytes)
+        data_size = offset
+        header = pickle.dumps(
+            dict(
+                version=_VERSION,
+                len=self._len,
+                keys=self._keys,
+                columns=columns,
+                present=present,
+                layout=layout,
+                meta=meta))
+        data_start = _align(len(_MAGIC) + 8 + len(header))
+
+        tmp_filename = f'{filename}.tmp{os.getpid()}'
+        with open(tmp_filename, 'wb') as f:
+            f.write(_MAGIC)
+            f.write(struct.pack('<Q', len(header)))
+            f.write(header)
+            for (offset, _, _), array in zip(layout, arrays):
+                f.seek(data_start + offset)
+                f.write(np.ascontiguousarray(array).data)
+            f.truncate(data_start + data_size)
+        os.replace(tmp_filename, filename)
+
+    @staticmethod
+    def read_meta(filename):
+        """Read the meta information of a file dumped by :meth:`dump`.
+
+        Args:
+            filename (str): Path to the file.
+
+        Returns:
+            dict | None: The meta information, or None if the file is not
+                dumped by :meth:`dump` of this version.
+        """
+        header = CompactVideoInfos._read_header(filename)[0]
+        return None if header is None else header['meta']
+
+    @staticmethod
+    def _read_header(filename):
+        with open(filename, 'rb') as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                return None, 0
+            header_len = struct.unpack('<Q', f.read(8))[0]
+            header = pickle.loads(f.read(header_len))
+        if header.get('version') != _VERSION:
+            return None, 0
+        return header, _align(len(_MAGIC) + 8 + header_len)
+
+    @classmethod
+    def load(cls, filename):
+        """Load the video infos from a file dumped by :meth:`dump`.
+
+        The arrays are memory mapped from the file in read-only mode.
+
+        Args:
+            filename (str): Path to the file.
+
+        Returns:
+            :obj:`CompactVideoInfos`: The video infos.
+        """
+        header, data_start = cls._read_header(filename)
+        if header is None:
+            raise ValueError(f'{filename} is not a dumped {cls.__name__} of '
+                             f'version {_VERSION}')
+        buffer = np.memmap(filename, dtype=np.uint8, mode='r')
+        arrays = []
+        for offset, dtype, shape in header['layout']:
+            dtype = np.dtype(dtype)
+            nbytes = int(np.prod(shape)) * dtype.itemsize
+            start = data_start + offset
+            arrays.append(buffer[start:start +
+                                 nbytes].view(dtype).reshape(shape))
+
+        self = cls.__new__(cls)
+        self._len = header['len']
+        self._keys = header['keys']
+        self._blob = arrays[0]
+        self._columns = {}
+        self._present = {}
+        for key in self._keys:
+            kind, index, num_arrays = header['columns'][key]
+            data = tuple(arrays[index:index + num_arrays])
+            self._columns[key] = (kind, data if num_arrays > 1 else data[0])
+            index = header['present'][key]
+            self._present[key] = None if index is None else arrays[index]
+        self._filename = filename
+        return self
+
+    def __getstate__(self):
+        # memory mapped video infos are mapped again when unpickled
+        if self._filename is not None:
+            return dict(_filename=self._filename)
+        return self.__dict__
+
+    def __setstate__(self, state):
+        if set(state) == {'_filename'}:
+            state = self.load(state['_filename']).__dict__
+        self.__dict__.update(state)
+
+    def _get_value(self, key, idx):
+        kind, data = self._columns[key]
+        if kind in _NUMERIC_KINDS:
+            return data[idx].item()
+        if kind == 'int_list':
+            flat, offsets = data
+            return flat[offsets[idx]:offsets[idx + 1]].tolist()
+        starts, ends = data
+        value = self._blob[starts[idx]:ends[idx]].tobytes()
+        if kind == 'str':
+            return value.decode('utf-8')
+        return pickle.loads(value)
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(self._len))]
+        idx = int(idx)
+        if idx < 0:
+            idx += self._len
+        if not 0 <= idx < self._len:
+            raise IndexError(f'index {idx} is out of range')
+        return {
+            key: self._get_value(key, idx)
+            for key in self._keys
+            if self._present[key] is None or self._present[key][idx]
+        }
+
+    def __iter__(self):
+        for idx in range(self._len):
+            yield self[idx]
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence) or len(self) != len(other):
+            return False
+        return all(info == other_info for info, other_info in zip(self, other))
+
+    __hash__ = None
+
+    def fields(self):
+        """Get the fields of the videos.
+
+        Returns:
+            list[str]: The fields.
+        """
+        return list(self._keys)
+
+    def column(self, key):
+        """Get a field of all the videos.
+
+        Args:
+            key (str): The field.
+
+        Returns:
+            np.ndarray | list: The values, as an array for int, float and bool
+                fields, which is read-only, or as a list for other fields.
+                Missing values are 0 in arrays and None in lists.
+        """
+        kind, data = self._columns[key]
+        if kind in _NUMERIC_KINDS:
+            data = data.view()
+            data.flags.writeable = False
+            return data
+        present = self._present[key]
+        return [
+            self._get_value(key, idx)
+            if present is None or present[idx] else None
+            for idx in range(self._len)
+        ]
+
+    def __repr__(self):
+        return (f'{self.__class__.__name__}(num_videos={self._len}, '
+                f'keys={self._keys})')
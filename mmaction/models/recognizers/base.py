@@ -7,6 +7,7 @@ import torch.nn as nn
 import torch.nn.functional as F
 from mmcv.runner import auto_fp16
 
+from ...utils.module_hooks import GPUAugment
 from .. import builder
 
 
@@ -47,6 +48,10 @@ class BaseRecognizer(nn.Module, metaclass=ABCMeta):
         self.aux_info = []
         if train_cfg is not None and 'aux_info' in train_cfg:
             self.aux_info = train_cfg['aux_info']
+        # the batches with 'lazy_params' are augmented on the device
+        self.gpu_augment = None
+        if train_cfg is not None and 'gpu_augment' in train_cfg:
+            self.gpu_augment = GPUAugment(**train_cfg['gpu_augment'])
         # max_testing_views should be int
         self.max_testing_views = None
         if test_cfg is not None and 'max_testing_views' in test_cfg:
@@ -175,6 +180,17 @@ class BaseRecognizer(nn.Module, metaclass=ABCMeta):
 
         return self.forward_test(imgs, **kwargs)
 
+    def _augment(self, imgs, aux_info):
+        """Apply the lazy augmentations packed as 'lazy_params' in the aux
+        info, which is removed from the aux info."""
+        lazy_params = aux_info.pop('lazy_params', None)
+        if lazy_params is None:
+            return imgs
+        if self.gpu_augment is None:
+            raise ValueError('gpu_augment should be set in train_cfg to '
+                             'apply lazy_params')
+        return self.gpu_augment.augment(imgs, lazy_params)
+
     def train_step(self, data_batch, optimizer, **kwargs):
         """The iteration step during training.
 
@@ -208,6 +224,7 @@ class BaseRecognizer(nn.Module, metaclass=ABCMeta):
         for item in self.aux_info:
             assert item in data_batch
             aux_info[item] = data_batch[item]
+        imgs = self._augment(imgs, aux_info)
 
         losses = self(imgs, label, return_loss=True, **aux_info)
 
@@ -232,7 +249,10 @@ class BaseRecognizer(nn.Module, metaclass=ABCMeta):
 
         aux_info = {}
         for item in self.aux_info:
-            aux_info[item] = data_batch[item]
+            # the val pipeline may not collect all the aux info
+            if item in data_batch:
+                aux_info[item] = data_batch[item]
+        imgs = self._augment(imgs, aux_info)
 
         losses = self(imgs, label, return_loss=True, **aux_info)
 
@@ -1,5 +1,7 @@
 from .collect_env import collect_env
 from .decorators import import_module_error_class, import_module_error_func
+from .file_cache import FileCache
+from .frame_pack import FramePack, merge_frame_pack, write_frame_pack
 from .gradcam_utils import GradCAM
 from .logger import get_root_logger
 from .misc import get_random_string, get_shm_dir, get_thread_id
@@ -9,5 +11,6 @@ from .precise_bn import PreciseBNHook
 __all__ = [
     'get_root_logger', 'collect_env', 'get_random_string', 'get_thread_id',
     'get_shm_dir', 'GradCAM', 'PreciseBNHook', 'import_module_error_class',
-    'import_module_error_func', 'register_module_hooks'
+    'import_module_error_func', 'register_module_hooks', 'FileCache',
+    'FramePack', 'write_frame_pack', 'merge_frame_pack'
 ]
@@ -0,0 +1,185 @@
+import hashlib
+import mmap
+import os
+import os.path as osp
+
+import mmcv
+
+from .misc import get_thread_id
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class FileCache:
+    """A local on-disk LRU cache for files fetched by a file client.
+
+    Files are stored under ``cache_dir`` with names derived from the hash of
+    the original file path, so the cache is shared by all processes using the
+    same ``cache_dir``, e.g. dataloader workers of every rank on one node, and
+    it survives across epochs. The modification time of a cached file is
+    refreshed on every access, and once the total size exceeds ``max_size``,
+    the least recently used files are removed until it is within
+    ``low_water * max_size``, so that the cache is not scanned again at the
+    next insertion.
+
+    Args:
+        file_client (:obj:`mmcv.fileio.FileClient`): File client used to
+            fetch the files missing in the cache.
+        cache_dir (str): Directory to store the cached files.
+        max_size (int): Size budget of the cache in bytes.
+            Default: 10 * 1024 ** 3.
+        check_interval (int): Number of insertions of one process between two
+            scans of the whole cache directory. The directory is also scanned
+            once the size written by this process exceeds ``max_size``.
+            Default: 64.
+        low_water (float): Fraction of ``max_size`` the cache is evicted down
+            to. Default: 0.9.
+    """
+
+    def __init__(self,
+                 file_client,
+                 cache_dir,
+                 max_size=10 * 1024**3,
+                 check_interval=64,
+                 low_water=0.9):
+        assert 0 < low_water <= 1
+        self.file_client = file_client
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.check_interval = check_interval
+        self.low_water = low_water
+        mmcv.mkdir_or_exist(self.cache_dir)
+        self._lock_path = osp.join(self.cache_dir, '.lock')
+        self._num_insert = 0
+        self._size = 0
+
+    def _cache_path(self, filepath):
+        key = hashlib.sha1(str(filepath).encode()).hexdigest()
+        ext = osp.splitext(str(filepath))[1]
+        return osp.join(self.cache_dir, key[:2], key + ext)
+
+    def _insert(self, filepath, cache_path):
+        value_buf = self.file_client.get(filepath)
+        mmcv.mkdir_or_exist(osp.dirname(cache_path))
+        # write to a temporary file first so that other processes never see
+        # a partially written file
+        tmp_path = f'{cache_path}.{os.getpid()}_{get_thread_id()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(value_buf)
+        os.replace(tmp_path, cache_path)
+
+        self._num_insert += 1
+        self._size += len(value_buf)
+        if (self._size > self.max_size
+                or self._num_insert % self.check_interval == 0):
+            self.evict()
+
+    def evict(self):
+        """Remove the least recently used files until the total size of the
+        cache is within ``low_water * max_size``."""
+        with open(self._lock_path, 'w') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            entries = []
+            for entry in os.scandir(self.cache_dir):
+                if not entry.is_dir():
+                    continue
+                for sub_entry in os.scandir(entry.path):
+                    if sub_entry.name.endswith('.tmp'):
+                        continue
+                    try:
+                        stat = sub_entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append(
+                        (stat.st_mtime, stat.st_size, sub_entry.path))
+            entries.sort()
+            total_size = sum(entry[1] for entry in entries)
+            if total_size <= self.max_size:
+                self._size = total_size
+                return
+            target_size = self.low_water * self.max_size
+            # always keep the most recently used file
+            for _, size, path in entries[:-1]:
+                if total_size <= target_size:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total_size -= size
+            self._size = total_size
+
+    def get_local_path(self, filepath):
+        """Get the path of the cached copy of a file.
+
+        The file is fetched with the file client if it is not in the cache.
+        It may be evicted by another process before it is opened, so use
+        :meth:`open_local` to open it.
+
+        Args:
+            filepath (str): Path of the original file.
+
+        Returns:
+            str: Path of the cached file.
+        """
+        cache_path = self._cache_path(filepath)
+        try:
+            # refresh the modification time used as the LRU order
+            os.utime(cache_path)
+        except FileNotFoundError:
+            self._insert(filepath, cache_path)
+        return cache_path
+
+    def open_local(self, filepath, open_fn):
+        """Open the cached copy of a file by its path.
+
+        The path returned by :meth:`get_local_path` may be evicted by another
+        process before it is opened, in which case the file is fetched again
+        and reopened. An opened file stays readable after it is evicted.
+
+        Args:
+            filepath (str): Path of the original file.
+            open_fn (callable): Function opening a local path, e.g.
+                ``decord.VideoReader``.
+
+        Returns:
+            Any: The return of ``open_fn``.
+        """
+        for _ in range(2):
+            cache_path = self.get_local_path(filepath)
+            try:
+                return open_fn(cache_path)
+            except Exception:
+                if osp.exists(cache_path):
+                    raise
+                # evicted by another process in between, fetch it again
+        raise FileNotFoundError(f'Failed to cache {filepath}')
+
+    @staticmethod
+    def _mmap(cache_path):
+        with open(cache_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b''
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def get(self, filepath):
+        """Get the content of a file as a read-only memory map.
+
+        Args:
+            filepath (str): Path of the original file.
+
+        Returns:
+            mmap.mmap | bytes: Memory-mapped content of the cached file, or
+                empty bytes for an empty file.
+        """
+        return self.open_local(filepath, self._mmap)
+
+    def __repr__(self):
+        repr_str = (f'{self.__class__.__name__}('
+                    f'cache_dir={self.cache_dir}, '
+                    f'max_size={self.max_size})')
+        return repr_str
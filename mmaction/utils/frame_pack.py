@@ -0,0 +1,149 @@
+import mmap
+import os
+import os.path as osp
+import struct
+
+import numpy as np
+
+# A frame pack file is laid out as:
+#   magic (8 bytes) | number of frames (uint64) | size of names (uint64) |
+#   index of (offset, length) for each frame (uint64 x 2 x number of frames) |
+#   names joined by '\n' (utf-8) | encoded frames
+# All integers are little endian and offsets are counted from the beginning
+# of the file.
+FRAME_PACK_MAGIC = b'MMAPACK1'
+_HEADER = struct.Struct('<8sQQ')
+
+
+def write_frame_pack(filepath, frames):
+    """Write encoded frames into one frame pack file.
+
+    Args:
+        filepath (str): Path of the frame pack file to write.
+        frames (list[tuple[str, bytes]]): Names and encoded bytes of the
+            frames, e.g. ``[('img_00001.jpg', b'...'), ...]``.
+    """
+    names = [name for name, _ in frames]
+    for name in names:
+        if '\n' in name:
+            raise ValueError(f'Frame name can not contain "\\n": {name!r}')
+    names_buf = '\n'.join(names).encode('utf-8')
+    num_frames = len(frames)
+
+    index = np.empty((num_frames, 2), dtype='<u8')
+    offset = _HEADER.size + index.nbytes + len(names_buf)
+    for i, (_, content) in enumerate(frames):
+        index[i] = (offset, len(content))
+        offset += len(content)
+
+    with open(filepath, 'wb') as f:
+        f.write(_HEADER.pack(FRAME_PACK_MAGIC, num_frames, len(names_buf)))
+        f.write(index.tobytes())
+        f.write(names_buf)
+        for _, content in frames:
+            f.write(content)
+
+
+def merge_frame_pack(filepath, frames):
+    """Add encoded frames into a frame pack file, creating it if missing.
+
+    The frames already in the pack are kept, e.g. the rgb frames when the
+    flow frames of the same video are added. The merged pack is written to a
+    temporary file first and then renamed.
+
+    Args:
+        filepath (str): Path of the frame pack file.
+        frames (list[tuple[str, bytes]]): Names and encoded bytes of the
+            frames to add. Frames already in the pack with the same bytes are
+            skipped.
+
+    Raises:
+        FileExistsError: If a frame in the pack has the same name as a new
+            frame but different bytes.
+    """
+    if not osp.exists(filepath):
+        write_frame_pack(filepath, frames)
+        return
+
+    with FramePack(filepath) as frame_pack:
+        merged = [(name, bytes(frame_pack.get(name)))
+                  for name in frame_pack.keys()]
+        existing = dict(merged)
+    for name, content in frames:
+        if name not in existing:
+            merged.append((name, content))
+        elif existing[name] != content:
+            raise FileExistsError(f'{filepath} already holds another frame '
+                                  f'named {name}')
+    tmp_filepath = f'{filepath}.tmp{os.getpid()}'
+    write_frame_pack(tmp_filepath, merged)
+    os.replace(tmp_filepath, filepath)
+
+
+class FramePack:
+    """Reader of a frame pack file written by :func:`write_frame_pack`.
+
+    The file is memory mapped, and reading one frame copies only the bytes of
+    that frame.
+
+    Args:
+        filepath (str | None): Path of the frame pack file. Default: None.
+        buffer (bytes | None): Content of the frame pack file, used when the
+            file is not on a local disk. Exactly one of ``filepath`` and
+            ``buffer`` should be given. Default: None.
+    """
+
+    def __init__(self, filepath=None, buffer=None):
+        if (filepath is None) == (buffer is None):
+            raise ValueError('Exactly one of filepath and buffer should be '
+                             'given')
+        self.filepath = filepath
+        if filepath is not None:
+            with open(filepath, 'rb') as f:
+                self._buffer = mmap.mmap(
+                    f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._buffer = buffer
+
+        magic, num_frames, names_size = _HEADER.unpack_from(self._buffer, 0)
+        if magic != FRAME_PACK_MAGIC:
+            raise ValueError(f'{filepath} is not a frame pack file')
+        index_end = _HEADER.size + num_frames * 16
+        index = np.frombuffer(
+            self._buffer[_HEADER.size:index_end], dtype='<u8').reshape(-1, 2)
+        names = bytes(self._buffer[index_end:index_end + names_size]).decode(
+            'utf-8').split('\n') if num_frames else []
+        self._index = dict(zip(names, index.tolist()))
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def keys(self):
+        """Names of the frames in the pack."""
+        return self._index.keys()
+
+    def get(self, name):
+        """Get the encoded bytes of a frame.
+
+        Args:
+            name (str): Name of the frame.
+
+        Returns:
+            bytes: Encoded bytes of the frame.
+        """
+        offset, length = self._index[name]
+        return self._buffer[offset:offset + length]
+
+    def close(self):
+        """Close the memory map of the file."""
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
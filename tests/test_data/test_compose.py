@@ -1,7 +1,14 @@
+import os.path as osp
+import tracemalloc
+from unittest.mock import MagicMock
+
 import numpy as np
 import pytest
 from mmcv.utils import assert_keys_equal
+from torch.utils.data import DataLoader, Dataset
 
+from mmaction.core import PipelineProfileHook
+from mmaction.datasets import build_dataset
 from mmaction.datasets.pipelines import Compose, ImageToTensor
 
 
@@ -35,3 +42,103 @@ def test_compose():
 
     assert repr(compose) == compose.__class__.__name__ + \
         f'(\n    {image_to_tensor}\n)'
+
+
+class ToyDataset(Dataset):
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+
+    def __len__(self):
+        return 8
+
+    def __getitem__(self, idx):
+        return self.pipeline(
+            dict(imgs=[np.zeros((16, 16, 3), dtype=np.uint8)] * 2, label=idx))
+
+
+@pytest.mark.parametrize('num_workers', [0, 2])
+def test_compose_profile(num_workers):
+    test_pipeline = [
+        dict(type='FormatShape', input_format='NCHW'),
+        dict(type='Collect', keys=['imgs', 'label'], meta_keys=[]),
+        dict(type='ToTensor', keys=['imgs'])
+    ]
+    compose = Compose(test_pipeline)
+    with pytest.raises(RuntimeError):
+        compose.profile_stats()
+
+    compose = Compose(test_pipeline, profile=True, trace_alloc=True)
+    data_loader = DataLoader(
+        ToyDataset(compose), batch_size=2, num_workers=num_workers)
+    for data in data_loader:
+        assert data['imgs'].shape == (2, 2, 3, 16, 16)
+
+    # the statistics are aggregated across the workers
+    stats = compose.profile_stats()
+    assert [stat['name']
+            for stat in stats] == ['FormatShape', 'Collect', 'ToTensor']
+    for stat in stats:
+        assert stat['count'] == 8
+        assert stat['time'] > 0
+        assert stat['shape'] == [2, 3, 16, 16]
+    assert stats[0]['out_bytes'] == 2 * 16 * 16 * 3
+    assert stats[0]['alloc_bytes'] >= 2 * 16 * 16 * 3
+
+    table = compose.profile_table().split('\n')
+    assert len(table) == 5
+    assert table[2].startswith('| FormatShape | 8 | ')
+    assert table[2].endswith(' | 2x3x16x16 |')
+
+    compose.reset_profile()
+    stats = compose.profile_stats()
+    assert stats[0]['count'] == 0
+    assert stats[0]['shape'] is None
+    tracemalloc.stop()
+
+
+def test_compose_trace_alloc_without_reset_peak(monkeypatch):
+    # tracemalloc.reset_peak is missing before Python 3.9
+    monkeypatch.delattr(tracemalloc, 'reset_peak', raising=False)
+    compose = Compose([dict(type='FormatShape', input_format='NCHW')],
+                      profile=True,
+                      trace_alloc=True)
+    imgs = [np.random.randn(16, 16, 3) for _ in range(2)]
+    compose(dict(imgs=imgs, num_clips=1, clip_len=2))
+    stats = compose.profile_stats()
+    assert stats[0]['count'] == 1
+    assert stats[0]['alloc_bytes'] >= 2 * 16 * 16 * 3 * 8
+    tracemalloc.stop()
+
+
+def test_build_dataset_profile_pipeline():
+    data_prefix = osp.normpath(osp.join(osp.dirname(__file__), '../data'))
+    dataset_cfg = dict(
+        type='RawframeDataset',
+        ann_file=osp.join(data_prefix, 'annotations/rawframe_test_list.txt'),
+        pipeline=[dict(type='Collect', keys=['label'], meta_keys=[])],
+        data_prefix=data_prefix,
+        profile_pipeline=dict(trace_alloc=False))
+    dataset = build_dataset(dataset_cfg)
+    assert dataset.pipeline.profile
+    assert not build_dataset(dict(dataset_cfg,
+                                  profile_pipeline=False)).pipeline.profile
+    repeat_dataset = build_dataset(
+        dict(type='RepeatDataset', dataset=dataset_cfg, times=2))
+    assert repeat_dataset.dataset.pipeline.profile
+
+    for data in DataLoader(repeat_dataset, batch_size=2):
+        assert data['label'].shape == (2, )
+    assert dataset_cfg['profile_pipeline'] == dict(trace_alloc=False)
+
+    class Runner:
+        epoch = 0
+        data_loader = DataLoader(repeat_dataset)
+        logger = MagicMock()
+
+    runner = Runner()
+    PipelineProfileHook().after_train_epoch(runner)
+    msg = runner.logger.info.call_args[0][0]
+    assert msg.startswith('Pipeline profile of RawframeDataset in epoch 1')
+    assert '| Collect | 4 | ' in msg
+    assert repeat_dataset.dataset.pipeline.profile_stats()[0]['count'] == 0
@@ -61,6 +61,11 @@ class TestAVADataset:
         assert_array_equal(ava_infos[0]['ann']['gt_bboxes'],
                            np.array([[0.031, 0.162, 0.67, 0.995]]))
         assert_array_equal(ava_infos[0]['ann']['entity_ids'], np.array([0]))
+        # the annotations and proposals are packed into arrays
+        assert_array_equal(ava_dataset.gt_offsets, [0, 1])
+        assert_array_equal(ava_dataset.gt_labels, target_labels)
+        assert_array_equal(ava_dataset.proposal_offsets, [0, 1])
+        assert_array_equal(ava_dataset.proposal_scores, [0.998163])
 
         # custom classes
         ava_dataset = AVADataset(
@@ -109,6 +114,29 @@ class TestAVADataset:
             data_prefix=self.data_prefix,
             proposal_file=self.proposal_file)
 
+    def test_ava_filter_proposals(self):
+        ava_dataset = AVADataset(
+            self.ann_file,
+            self.exclude_file,
+            self.pipeline,
+            data_prefix=self.data_prefix,
+            person_det_score_thr=0.5,
+            num_max_proposals=2)
+        proposals = {
+            'a,0902':
+            np.array([[0, 0, 1, 1, 0.6], [0, 0, 1, 1, 0.4], [0, 0, 1, 1, 0.7],
+                      [0, 0, 1, 1, 0.9]]),
+            'a,0903':
+            np.array([[0, 0, 1, 1, 0.1], [0, 0, 1, 1, 0.3]]),
+            'a,0904':
+            np.array([[0, 0, 1, 1], [0, 0, 0.5, 0.5], [0, 0, 0.2, 0.2]])
+        }
+        filtered = ava_dataset.filter_proposals(proposals)
+        assert_array_equal(filtered['a,0902'][:, 4], [0.6, 0.7])
+        # the proposal with the largest score is kept
+        assert_array_equal(filtered['a,0903'][:, 4], [0.3])
+        assert_array_equal(filtered['a,0904'], proposals['a,0904'][:2])
+
     def test_ava_pipeline(self):
         target_keys = [
             'frame_dir', 'video_id', 'timestamp', 'img_key', 'shot_info',
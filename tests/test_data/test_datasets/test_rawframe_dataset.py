@@ -1,4 +1,7 @@
+import glob
 import os.path as osp
+import shutil
+import tempfile
 
 import numpy as np
 import pytest
@@ -52,6 +55,51 @@ class TestRawframDataset(BaseTestDataset):
             assert set(info['label']) == set(label)
         assert rawframe_dataset.start_index == 1
 
+    def test_rawframe_dataset_cache(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ann_file = osp.join(tmpdir, 'rawframe_test_list.txt')
+            shutil.copy(self.frame_ann_file, ann_file)
+            rawframe_dataset = RawframeDataset(
+                ann_file,
+                self.frame_pipeline,
+                self.data_prefix,
+                cache_annotations=True)
+            cache_files = glob.glob(f'{ann_file}.*.cache')
+            assert len(cache_files) == 1
+            frame_dir = osp.join(self.data_prefix, 'imgs')
+            target_infos = [
+                dict(frame_dir=frame_dir, total_frames=5, label=127)
+            ] * 2
+            assert rawframe_dataset.video_infos == target_infos
+
+            # loaded from the cache
+            mtime = osp.getmtime(cache_files[0])
+            rawframe_dataset = RawframeDataset(
+                ann_file,
+                self.frame_pipeline,
+                self.data_prefix,
+                cache_annotations=True)
+            assert rawframe_dataset.video_infos == target_infos
+            assert osp.getmtime(cache_files[0]) == mtime
+            assert len(rawframe_dataset[0]['imgs']) == 32
+
+            # the cache of other arguments
+            rawframe_dataset = RawframeDataset(
+                ann_file, self.frame_pipeline, cache_annotations=True)
+            assert rawframe_dataset.video_infos[0]['frame_dir'] == 'imgs'
+            assert len(glob.glob(f'{ann_file}.*.cache')) == 2
+
+            # invalidated by changing ann_file
+            with open(ann_file, 'a') as f:
+                f.write('imgs 6 1\n')
+            rawframe_dataset = RawframeDataset(
+                ann_file,
+                self.frame_pipeline,
+                self.data_prefix,
+                cache_annotations=True)
+            assert len(rawframe_dataset) == 3
+            assert rawframe_dataset.video_infos[2]['total_frames'] == 6
+
     def test_dataset_realpath(self):
         dataset = RawframeDataset(self.frame_ann_file, self.frame_pipeline,
                                   '.')
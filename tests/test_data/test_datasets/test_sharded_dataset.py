@@ -0,0 +1,232 @@
+import io
+import os.path as osp
+import tarfile
+import tempfile
+from unittest.mock import patch
+
+import pytest
+import torch
+from torch.utils.data import DataLoader
+
+from mmaction.core import DatasetEpochHook
+from mmaction.datasets import ShardedVideoDataset, build_dataloader
+from mmaction.datasets.pipelines import Compose
+from .base import BaseTestDataset
+
+
+def _add_member(tar, name, data):
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    tar.addfile(info, io.BytesIO(data))
+
+
+class TestShardedDataset(BaseTestDataset):
+
+    @classmethod
+    def setup_class(cls):
+        super().setup_class()
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.shard_dir = cls.tmpdir.name
+        cls.num_shards = 4
+        cls.samples_per_shard = 3
+        for i in range(cls.num_shards):
+            shard = osp.join(cls.shard_dir, f'shard_{i:06d}.tar')
+            with tarfile.open(shard, 'w') as tar:
+                for j in range(cls.samples_per_shard):
+                    key = f'dir/video_{i}_{j}'
+                    _add_member(tar, key + '.mp4', f'{i} {j}'.encode())
+                    _add_member(tar, key + '.cls', f'{i} {j + 4}'.encode())
+                    _add_member(tar, key + '.json', b'{"total_frames": 8}')
+        cls.all_keys = {(i, j)
+                        for i in range(cls.num_shards)
+                        for j in range(cls.samples_per_shard)}
+
+        with open(osp.join(cls.data_prefix, 'test.mp4'), 'rb') as f:
+            cls.video_bytes = f.read()
+        with tarfile.open(osp.join(cls.shard_dir, 'video.tar'), 'w') as tar:
+            _add_member(tar, 'test.mp4', cls.video_bytes)
+            _add_member(tar, 'test.cls', b'2')
+
+    @classmethod
+    def teardown_class(cls):
+        cls.tmpdir.cleanup()
+
+    def build_dataset(self, shards='shard_*.tar', pipeline=(), **kwargs):
+        data_prefix = self.shard_dir if isinstance(shards, str) else None
+        return ShardedVideoDataset(
+            shards,
+            list(pipeline),
+            data_prefix=data_prefix,
+            multi_class=True,
+            num_classes=8,
+            **kwargs)
+
+    @staticmethod
+    def get_key(results):
+        return tuple(int(x) for x in results['video_bytes'].split())
+
+    def test_sharded_dataset(self):
+        with pytest.raises(ValueError):
+            ShardedVideoDataset('none_*.tar', [], data_prefix=self.shard_dir)
+
+        dataset = self.build_dataset(test_mode=True)
+        assert len(dataset.shards) == self.num_shards
+        with pytest.raises(TypeError):
+            len(dataset)
+        samples = list(dataset)
+        assert [self.get_key(results)
+                for results in samples] == sorted(self.all_keys)
+        results = samples[4]
+        assert results['filename'] == osp.join(self.shard_dir,
+                                               'shard_000001.tar',
+                                               'dir/video_1_1.mp4')
+        assert results['total_frames'] == 8
+        assert results['shard_index'] == 1
+        assert results['modality'] == 'RGB'
+        assert results['start_index'] == 0
+        assert torch.equal(results['label'],
+                           torch.tensor([0, 1, 0, 0, 0, 1, 0, 0.]))
+
+        dataset = self.build_dataset(
+            shards=[osp.join(self.shard_dir, 'shard_000002.tar')],
+            test_mode=True)
+        assert [self.get_key(results)
+                for results in dataset] == [(2, 0), (2, 1), (2, 2)]
+
+        # samples dropped by the pipeline are skipped
+        dataset = self.build_dataset(pipeline=[lambda results: None])
+        assert list(dataset) == []
+
+    def test_sharded_dataset_shuffle(self):
+        dataset = self.build_dataset(shuffle_buffer=4, seed=1)
+        keys = [self.get_key(results) for results in dataset]
+        assert set(keys) == self.all_keys
+        assert len(keys) == len(self.all_keys)
+        assert keys != sorted(self.all_keys)
+        # the same order in the same epoch
+        assert [self.get_key(results) for results in dataset] == keys
+        dataset.set_epoch(1)
+        assert [self.get_key(results) for results in dataset] != keys
+
+    def test_sharded_dataset_resume(self):
+        dataset = self.build_dataset(shuffle_buffer=0, start_shard=2)
+        order = dataset._get_shard_order(0)
+        samples = list(dataset)
+        assert len(samples) == 2 * self.samples_per_shard
+        for results in samples:
+            shard_index = results['shard_index']
+            assert shard_index in (2, 3)
+            assert self.get_key(results)[0] == order[shard_index]
+
+        # start_shard only applies to the initial epoch
+        dataset.set_epoch(0)
+        assert len(list(dataset)) == 2 * self.samples_per_shard
+        dataset.set_epoch(1)
+        assert dataset.start_shard == 0
+        assert len(list(dataset)) == len(self.all_keys)
+
+    def test_sharded_dataset_workers(self):
+        dataset = self.build_dataset(shuffle_buffer=2)
+        data_loader = DataLoader(dataset, batch_size=None, num_workers=2)
+        keys = [self.get_key(results) for results in data_loader]
+        assert sorted(keys) == sorted(self.all_keys)
+
+        dataset = self.build_dataset(
+            pipeline=[dict(type='Collect', keys=['label'], meta_keys=[])])
+        data_loader = build_dataloader(
+            dataset, videos_per_gpu=3, workers_per_gpu=2, dist=False)
+        batches = list(data_loader)
+        assert len(batches) == 4
+        assert batches[0]['label'].shape == (3, 8)
+
+    def test_sharded_dataset_ranks(self):
+        keys = []
+        for rank in range(2):
+            with patch(
+                    'mmaction.datasets.sharded_dataset.get_dist_info',
+                    return_value=(rank, 2)):
+                dataset = self.build_dataset(shuffle_buffer=2)
+                keys.extend(self.get_key(results) for results in dataset)
+        assert sorted(keys) == sorted(self.all_keys)
+
+        # too few shards for all the workers of a fixed number of samples
+        with patch(
+                'mmaction.datasets.sharded_dataset.get_dist_info',
+                return_value=(4, 5)):
+            dataset = self.build_dataset(num_samples=10)
+            with pytest.raises(ValueError):
+                list(dataset)
+
+    def test_sharded_dataset_num_samples(self):
+        dataset = self.build_dataset(num_samples=20, shuffle_buffer=0)
+        assert len(dataset) == 20
+        keys = [self.get_key(results) for results in dataset]
+        assert len(keys) == 20
+        # the shards are read again in another order
+        assert set(keys[:12]) == self.all_keys
+        assert set(keys[12:]) < self.all_keys
+
+        for rank in range(2):
+            with patch(
+                    'mmaction.datasets.sharded_dataset.get_dist_info',
+                    return_value=(rank, 2)):
+                dataset = self.build_dataset(num_samples=15)
+                assert len(dataset) == 7
+                assert len(list(dataset)) == 7
+                data_loader = DataLoader(
+                    dataset, batch_size=None, num_workers=2)
+                assert len(list(data_loader)) == 7
+
+        # the workers split the samples by whole batches
+        dataset = self.build_dataset(
+            num_samples=20,
+            pipeline=[dict(type='Collect', keys=['label'], meta_keys=[])])
+        data_loader = build_dataloader(
+            dataset, videos_per_gpu=3, workers_per_gpu=2, dist=False)
+        assert dataset.batch_size == 3
+        batch_sizes = [len(batch['label']) for batch in data_loader]
+        assert len(batch_sizes) == len(data_loader) == 7
+        assert sorted(batch_sizes) == [2, 3, 3, 3, 3, 3, 3]
+
+    def test_sharded_dataset_no_samples(self):
+        # a pass over the shards yields no sample
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tarfile.open(osp.join(tmpdir, 'empty.tar'), 'w').close()
+            dataset = ShardedVideoDataset(
+                'empty.tar', [], data_prefix=tmpdir, num_samples=4)
+            with pytest.raises(ValueError):
+                list(dataset)
+            dataset = ShardedVideoDataset('empty.tar', [], data_prefix=tmpdir)
+            assert list(dataset) == []
+
+        # the pipeline drops all the samples
+        dataset = self.build_dataset(
+            pipeline=[lambda results: None], num_samples=4)
+        with pytest.raises(RuntimeError):
+            list(dataset)
+        dataset = self.build_dataset(
+            pipeline=[lambda results: None], num_samples=4, start_shard=3)
+        with pytest.raises(RuntimeError):
+            list(dataset)
+
+    def test_sharded_dataset_decode(self):
+        filename = osp.join(self.data_prefix, 'test.mp4')
+        for init in ('DecordInit', 'PyAVInit'):
+            pipeline = [dict(type=init)]
+            dataset = ShardedVideoDataset(
+                'video.tar', pipeline, data_prefix=self.shard_dir)
+            results = next(iter(dataset))
+            assert results['label'] == 2
+            expected = Compose(pipeline)(dict(filename=filename))
+            assert results['total_frames'] == expected['total_frames']
+
+    def test_dataset_epoch_hook(self):
+        dataset = self.build_dataset(start_shard=2)
+
+        class Runner:
+            epoch = 3
+            data_loader = DataLoader(dataset, batch_size=None)
+
+        DatasetEpochHook().before_epoch(Runner())
+        assert dataset.epoch == 3
+        assert dataset.start_shard == 0
@@ -0,0 +1,86 @@
+import os.path as osp
+import pickle
+import tempfile
+
+import numpy as np
+import pytest
+
+from mmaction.datasets import CompactVideoInfos
+
+
+def test_compact_video_infos():
+    video_infos = [
+        dict(
+            frame_dir='imgs/a',
+            total_frames=5,
+            label=[1, 2],
+            fps=30.,
+            flip=True,
+            meta=dict(a=1)),
+        dict(
+            frame_dir='imgs/é', total_frames=7, label=[], fps=25., flip=False),
+        dict(
+            frame_dir='',
+            total_frames=0,
+            label=[3],
+            fps=1.,
+            flip=False,
+            meta=None)
+    ]
+    compact_infos = CompactVideoInfos(video_infos)
+    assert len(compact_infos) == 3
+    assert compact_infos == video_infos
+    assert compact_infos != video_infos[:2]
+    assert list(compact_infos) == video_infos
+    assert compact_infos[-1] == video_infos[-1]
+    assert compact_infos[1:] == video_infos[1:]
+    assert 'meta' not in compact_infos[1]
+    assert compact_infos.fields() == [
+        'frame_dir', 'total_frames', 'label', 'fps', 'flip', 'meta'
+    ]
+    with pytest.raises(IndexError):
+        compact_infos[3]
+
+    # a new dict is built for each access
+    compact_infos[0]['label'].append(3)
+    assert compact_infos[0]['label'] == [1, 2]
+
+    total_frames = compact_infos.column('total_frames')
+    assert total_frames.dtype == np.int64
+    np.testing.assert_array_equal(total_frames, [5, 7, 0])
+    with pytest.raises(ValueError):
+        total_frames[0] = 1
+    assert compact_infos.column('meta') == [dict(a=1), None, None]
+
+    assert pickle.loads(pickle.dumps(compact_infos)) == video_infos
+    assert repr(compact_infos) == (
+        "CompactVideoInfos(num_videos=3, keys=['frame_dir', 'total_frames', "
+        "'label', 'fps', 'flip', 'meta'])")
+
+    assert CompactVideoInfos([]) == []
+
+
+def test_compact_video_infos_dump():
+    video_infos = [
+        dict(filename='a.mp4', label=[1, 2], meta=dict(a=1)),
+        dict(filename='b.mp4', label=[3])
+    ]
+    compact_infos = CompactVideoInfos(video_infos)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = osp.join(tmpdir, 'infos.cache')
+        compact_infos.dump(filename, meta=dict(size=1))
+        assert CompactVideoInfos.read_meta(filename) == dict(size=1)
+        loaded_infos = CompactVideoInfos.load(filename)
+        assert loaded_infos == video_infos
+        assert isinstance(loaded_infos.column('label'), list)
+        # mapped again when unpickled
+        assert pickle.loads(pickle.dumps(loaded_infos)) == video_infos
+
+        CompactVideoInfos([]).dump(filename)
+        assert CompactVideoInfos.load(filename) == []
+
+        with open(filename, 'wb') as f:
+            f.write(b'not dumped')
+        assert CompactVideoInfos.read_meta(filename) is None
+        with pytest.raises(ValueError):
+            CompactVideoInfos.load(filename)
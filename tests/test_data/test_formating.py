@@ -180,6 +180,15 @@ def test_format_shape():
     format_shape = FormatShape('NPTCHW')
     assert format_shape(results)['input_shape'] == (8, 9, 3, 224, 224)
 
+    # frames in one array are formatted without copying
+    imgs = np.random.randn(12, 32, 32, 3)
+    for input_format in ['NCHW', 'NCTHW', 'NPTCHW']:
+        results = dict(imgs=imgs, num_clips=2, clip_len=3, num_proposals=2)
+        results = FormatShape(input_format)(results)
+        assert np.shares_memory(results['imgs'], imgs)
+        tensor = ToTensor(['imgs'])(results)['imgs']
+        assert np.shares_memory(tensor.numpy(), imgs)
+
 
 def test_format_audio_shape():
     with pytest.raises(ValueError):
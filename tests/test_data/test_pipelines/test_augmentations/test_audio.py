@@ -1,8 +1,15 @@
+import copy
+import os
+import os.path as osp
+import tempfile
+
 import numpy as np
 import pytest
 from mmcv.utils import assert_dict_has_keys
+from numpy.testing import assert_array_almost_equal
 
-from mmaction.datasets.pipelines import AudioAmplify, MelSpectrogram
+from mmaction.datasets.pipelines import (AudioAmplify, AudioDecode,
+                                         AudioDecodeInit, MelSpectrogram)
 
 
 class TestAudio:
@@ -44,8 +51,43 @@ class TestAudio:
         mel = MelSpectrogram(fixed_length=1)
         results = mel(results)
         assert assert_dict_has_keys(results, target_keys)
+        assert results['audios'].shape == (1, 1, 80)
         assert repr(mel) == (f'{mel.__class__.__name__}'
-                             f'(window_size={mel.window_size}), '
+                             f'(window_size={mel.window_size}, '
                              f'step_size={mel.step_size}, '
                              f'n_mels={mel.n_mels}, '
-                             f'fixed_length={mel.fixed_length})')
+                             f'fixed_length={mel.fixed_length}, '
+                             f'cache_dir=None)')
+
+    def test_melspectrogram_cache(self):
+        wav_path = osp.normpath(
+            osp.join(osp.dirname(__file__), '../../../data/test.wav'))
+        results = dict(
+            audio_path=wav_path,
+            total_frames=300,
+            frame_inds=np.array([[0, 63], [128, 191], [236, 299]]),
+            num_clips=3)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mel = MelSpectrogram(fixed_length=64, cache_dir=tmpdir)
+            # the clip starts are aligned to the hop length of 256 samples in
+            # the first two cases, where the clips are truncated or padded
+            # with zeros respectively
+            for length, fixed_length in [(300 * 256, 16000),
+                                         (300 * 256, 20000),
+                                         (300 * 256 + 150, 16000)]:
+                clip_results = AudioDecodeInit(streaming=True)(
+                    copy.deepcopy(results))
+                clip_results['length'] = length
+                clip_results = AudioDecode(fixed_length)(clip_results)
+                clip_results = AudioAmplify(1.5)(clip_results)
+                ref_mels = MelSpectrogram(
+                    fixed_length=64)(copy.deepcopy(clip_results))['audios']
+                for _ in range(2):
+                    mels = mel(copy.deepcopy(clip_results))['audios']
+                    assert mels.shape == ref_mels.shape == (3, 64, 80)
+                    assert len(os.listdir(tmpdir)) == 1
+                    assert_array_almost_equal(
+                        mels / ref_mels.max(),
+                        ref_mels / ref_mels.max(),
+                        decimal=6)
@@ -1,6 +1,6 @@
 import numpy as np
 from mmcv.utils import assert_dict_has_keys
-from numpy.testing import assert_array_equal
+from numpy.testing import assert_array_almost_equal, assert_array_equal
 
 from mmaction.datasets.pipelines import ColorJitter
 
@@ -60,4 +60,65 @@ class TestColor:
                                       f'color_space_aug={False}, '
                                       f'alpha_std={0.1}, '
                                       f'eig_val={eig_val}, '
-                                      f'eig_vec={eig_vec})')
+                                      f'eig_vec={eig_vec}, '
+                                      f'keep_uint8={False}, '
+                                      f'lazy={False})')
+
+    def test_color_jitter_clip(self):
+        imgs = np.random.randint(0, 255, size=(8, 32, 40, 3), dtype=np.uint8)
+        color_jitter = ColorJitter(color_space_aug=True)
+
+        # frames of the same shape are distorted as one clip, the same as
+        # distorting them one by one
+        np.random.seed(0)
+        clip_results = color_jitter(dict(imgs=list(imgs)))
+        assert isinstance(clip_results['imgs'], np.ndarray)
+        assert clip_results['imgs'].dtype == np.float32
+        assert clip_results['imgs'].shape == (8, 32, 40, 3)
+
+        np.random.seed(0)
+        params = [np.random.uniform(-32, 32)]
+        params += [np.random.uniform(0.6, 1.4) for _ in range(2)]
+        params += [np.random.uniform(-18, 18), np.random.rand()]
+        target_imgs = [color_jitter._jitter_img(img, *params) for img in imgs]
+        rgb = color_jitter._pca_noise()
+        target_imgs = np.array(target_imgs) + rgb
+        assert_array_almost_equal(clip_results['imgs'], target_imgs, 3)
+
+        # the clip given as one array
+        np.random.seed(0)
+        array_results = color_jitter(dict(imgs=imgs))
+        assert_array_almost_equal(array_results['imgs'], clip_results['imgs'])
+
+        # frames of different shapes are distorted one by one
+        imgs = [imgs[0], imgs[1, :16]]
+        results = color_jitter(dict(imgs=imgs))
+        assert isinstance(results['imgs'], list)
+        assert results['imgs'][0].shape == (32, 40, 3)
+        assert results['imgs'][1].shape == (16, 40, 3)
+
+    def test_color_jitter_uint8(self):
+        imgs = np.random.randint(0, 255, size=(8, 32, 40, 3), dtype=np.uint8)
+        for color_space_aug in [False, True]:
+            np.random.seed(0)
+            float_results = ColorJitter(color_space_aug)(dict(imgs=imgs))
+            np.random.seed(0)
+            color_jitter = ColorJitter(color_space_aug, keep_uint8=True)
+            results = color_jitter(dict(imgs=list(imgs)))
+            assert results['imgs'].dtype == np.uint8
+            assert results['imgs'].shape == (8, 32, 40, 3)
+            # the float results rounded and clipped into [0, 255]
+            target_imgs = np.clip(np.rint(float_results['imgs']), 0, 255)
+            assert np.abs(results['imgs'] - target_imgs).max() <= 1
+
+        # frames of different shapes stay uint8 as well
+        imgs = [imgs[0], imgs[1, :16]]
+        results = color_jitter(dict(imgs=imgs))
+        assert results['imgs'][0].dtype == np.uint8
+        assert results['imgs'][0].shape == (32, 40, 3)
+        assert results['imgs'][1].shape == (16, 40, 3)
+
+        # float frames are not converted into uint8
+        imgs = np.random.rand(2, 32, 40, 3).astype(np.float32) * 255
+        results = color_jitter(dict(imgs=imgs))
+        assert results['imgs'].dtype == np.float32
@@ -262,7 +262,7 @@ class TestCrops:
         assert three_crop_results['img_shape'] == (224, 224)
 
         assert repr(three_crop) == (f'{three_crop.__class__.__name__}'
-                                    f'(crop_size={(224, 224)})')
+                                    f'(crop_size={(224, 224)}, lazy={False})')
 
     def test_ten_crop(self):
         with pytest.raises(TypeError):
@@ -289,7 +289,7 @@ class TestCrops:
         assert ten_crop_results['img_shape'] == (224, 224)
 
         assert repr(ten_crop) == (f'{ten_crop.__class__.__name__}'
-                                  f'(crop_size={(224, 224)})')
+                                  f'(crop_size={(224, 224)}, lazy={False})')
 
     def test_multi_group_crop(self):
         with pytest.raises(TypeError):
@@ -327,4 +327,4 @@ class TestCrops:
 
         assert repr(multi_group_crop) == (
             f'{multi_group_crop.__class__.__name__}'
-            f'(crop_size={(224, 224)}, groups={3})')
+            f'(crop_size={(224, 224)}, groups={3}, lazy={False})')
@@ -3,7 +3,7 @@ import pytest
 from mmcv.utils import assert_dict_has_keys
 from numpy.testing import assert_array_almost_equal
 
-from mmaction.datasets.pipelines import CenterCrop, Imgaug
+from mmaction.datasets.pipelines import CenterCrop, Imgaug, NativeImgaug
 from .base import check_flip
 
 
@@ -97,3 +97,71 @@ class TestAugumentations:
         assert_dict_has_keys(resize_results, target_keys)
         assert resize_results['img_shape'] == (32, 32)
         assert repr(imgaug_resize) == f'Imgaug(transforms={transforms})'
+
+    def test_native_imgaug(self):
+        with pytest.raises(ValueError):
+            # transforms only support one string, 'default'
+            NativeImgaug(transforms='test')
+
+        with pytest.raises(TypeError):
+            # only uint8 images are supported
+            imgs = list(np.random.rand(2, 64, 64, 3).astype(np.float32))
+            NativeImgaug()(dict(imgs=imgs, modality='RGB'))
+
+        from imgaug import augmenters as iaa
+        from imgaug.augmentables import bbs
+
+        # the same transforms are applied to all the frames
+        target_keys = ['imgs', 'img_shape', 'gt_bboxes', 'proposals']
+        img = np.random.randint(0, 255, (64, 80, 3)).astype(np.uint8)
+        native_imgaug = NativeImgaug()
+        for seed in range(10):
+            np.random.seed(seed)
+            results = dict(
+                imgs=[img.copy() for _ in range(4)],
+                modality='RGB',
+                img_shape=(64, 80),
+                gt_bboxes=np.array([[10, 5, 30, 25]]),
+                proposals=np.array([[0, 0, 80, 64]]))
+            results = native_imgaug(results)
+            assert assert_dict_has_keys(results, target_keys)
+            assert results['imgs'].shape == (4, 64, 80, 3)
+            assert results['imgs'].dtype == np.uint8
+            assert results['img_shape'] == (64, 80)
+            for frame in results['imgs'][1:]:
+                assert np.array_equal(frame, results['imgs'][0])
+
+        # the rotation follows imgaug
+        imgs = np.random.randint(0, 255, (2, 64, 80, 3)).astype(np.uint8)
+        rotated = NativeImgaug._rotate(imgs, 20)
+        rotate = iaa.Rotate(rotate=20)
+        for img, rotated_img in zip(imgs, rotated):
+            assert np.array_equal(rotate.augment_image(img), rotated_img)
+        bboxes = bbs.BoundingBoxesOnImage(
+            [bbs.BoundingBox(x1=10, y1=20, x2=30, y2=25)], shape=(64, 80))
+        bbox, = rotate.augment_bounding_boxes([bboxes])[0].items
+        assert_array_almost_equal(
+            NativeImgaug._rotate_bboxes([[10, 20, 30, 25]], 20, 64, 80),
+            [[bbox.x1, bbox.y1, bbox.x2, bbox.y2]], 4)
+
+        # the rotated bboxes fit the rotated frames
+        img = np.zeros((1, 64, 80, 3), dtype=np.uint8)
+        img[:, 10:30, 20:40] = 255
+        ys, xs = np.mgrid[:64, :80] + 0.5
+        for angle in [-25, 20, 30]:
+            mask = NativeImgaug._rotate(img, angle)[0, ..., 0] / 255
+            rotated_bbox = NativeImgaug._rotate_bboxes([[20, 10, 40, 30]],
+                                                       angle, 64, 80)[0]
+            # the centroid of the rotated square is the center of its bbox
+            assert_array_almost_equal([
+                (mask * xs).sum() / mask.sum(), (mask * ys).sum() / mask.sum()
+            ], [(rotated_bbox[0] + rotated_bbox[2]) / 2,
+                (rotated_bbox[1] + rotated_bbox[3]) / 2], 2)
+            # the covered pixels are within the bbox
+            covered_ys, covered_xs = np.nonzero(mask > 0.5)
+            assert covered_xs.min() >= np.floor(rotated_bbox[0])
+            assert covered_xs.max() < np.ceil(rotated_bbox[2])
+            assert covered_ys.min() >= np.floor(rotated_bbox[1])
+            assert covered_ys.max() < np.ceil(rotated_bbox[3])
+
+        assert repr(native_imgaug) == 'NativeImgaug(transforms=default)'
@@ -1,10 +1,16 @@
+import copy
+import random
+
 import numpy as np
 import pytest
 from mmcv.utils import assert_dict_has_keys
+from numpy.testing import assert_array_almost_equal
 
-from mmaction.datasets.pipelines import (CenterCrop, Flip, Fuse,
-                                         MultiScaleCrop, RandomCrop,
-                                         RandomResizedCrop, Resize)
+from mmaction.datasets.pipelines import (CenterCrop, ColorJitter, Flip, Fuse,
+                                         MultiGroupCrop, MultiScaleCrop,
+                                         Normalize, PackLazyParams, RandomCrop,
+                                         RandomResizedCrop, Resize, TenCrop,
+                                         ThreeCrop)
 from .base import check_crop, check_flip
 
 
@@ -371,3 +377,233 @@ class TestLazy:
 
         assert repr(center_crop) == (f'{center_crop.__class__.__name__}'
                                      f'(crop_size={(224, 224)}, lazy={True})')
+
+    def test_fuse_normalize(self):
+        img_norm_cfg = dict(
+            mean=[123.675, 116.28, 103.53],
+            std=[58.395, 57.12, 57.375],
+            to_bgr=True)
+        flow_norm_cfg = dict(
+            mean=[128, 128], std=[128, 128], adjust_magnitude=True)
+
+        def lazy_results(modality, num_imgs, flip_ratio, direction, scale):
+            shape = (num_imgs, 240, 320, 3)
+            if modality == 'Flow':
+                shape = shape[:3]
+            imgs = list(np.random.randint(0, 256, shape).astype(np.uint8))
+            results = dict(
+                imgs=imgs,
+                modality=modality,
+                scale_factor=np.array([0.5, 2], dtype=np.float32))
+            results = Resize(scale=(-1, 256), lazy=True)(results)
+            results = CenterCrop(crop_size=224, lazy=True)(results)
+            results = Resize(scale=scale, keep_ratio=False, lazy=True)(results)
+            results = Flip(
+                flip_ratio=flip_ratio, direction=direction, lazy=True)(
+                    results)
+            return results
+
+        for modality, norm_cfg in [('RGB', img_norm_cfg),
+                                   ('Flow', flow_norm_cfg)]:
+            for flip_ratio, direction in [(0, 'horizontal'), (1, 'horizontal'),
+                                          (1, 'vertical')]:
+                if modality == 'Flow' and direction == 'vertical':
+                    continue
+                for scale in [(112, 112), (224, 224)]:
+                    results = lazy_results(modality, 4, flip_ratio, direction,
+                                           scale)
+                    ref_results = Normalize(**norm_cfg)(
+                        Fuse()(copy.deepcopy(results)))
+                    fuse = Fuse(img_norm_cfg=norm_cfg)
+                    fuse_results = fuse(results)
+                    assert 'lazy' not in fuse_results
+                    assert fuse_results['imgs'].dtype == np.float32
+                    assert fuse_results['imgs'].shape == ref_results[
+                        'imgs'].shape
+                    assert_array_almost_equal(
+                        fuse_results['imgs'], ref_results['imgs'], decimal=5)
+                    for key, value in ref_results['img_norm_cfg'].items():
+                        assert np.all(
+                            fuse_results['img_norm_cfg'][key] == value)
+
+        with pytest.raises(NotImplementedError):
+            results = lazy_results('RGB', 2, 0, 'horizontal', (112, 112))
+            results['modality'] = 'Audio'
+            Fuse(img_norm_cfg=img_norm_cfg)(results)
+
+        assert repr(fuse) == (f'{fuse.__class__.__name__}'
+                              f'(img_norm_cfg={flow_norm_cfg})')
+        assert repr(Fuse()) == 'Fuse(img_norm_cfg=None)'
+
+    def test_flip_flow_lazy(self):
+        imgs = list(np.random.randint(0, 256, (4, 64, 64)).astype(np.uint8))
+        results = dict(imgs=copy.deepcopy(imgs), modality='Flow')
+        results = Flip(flip_ratio=1, lazy=True)(results)
+        results = Fuse()(results)
+        # the frames are fused into one array
+        assert isinstance(results['imgs'], np.ndarray)
+        assert results['imgs'].shape == (4, 64, 64)
+        ref_results = dict(imgs=copy.deepcopy(imgs), modality='Flow')
+        ref_results = Flip(flip_ratio=1)(ref_results)
+        assert np.array_equal(results['imgs'], ref_results['imgs'])
+
+    def test_multi_view_crop_lazy(self):
+        img_norm_cfg = dict(
+            mean=[123.675, 116.28, 103.53],
+            std=[58.395, 57.12, 57.375],
+            to_bgr=True)
+        flow_norm_cfg = dict(mean=[128, 128], std=[128, 128])
+
+        def pipeline(modality, crop, lazy, flip_ratio=0, norm_cfg=None):
+            shape = (4, 240, 320, 3) if modality == 'RGB' else (4, 240, 320)
+            np.random.seed(0)
+            random.seed(0)
+            imgs = list(np.random.randint(0, 256, shape).astype(np.uint8))
+            results = dict(imgs=imgs, modality=modality)
+            results = Resize(scale=(-1, 128), lazy=lazy)(results)
+            results = crop(lazy)(results)
+            if not lazy:
+                # crops of overlapping views share the memory
+                results['imgs'] = [img.copy() for img in results['imgs']]
+            results = Flip(flip_ratio=flip_ratio, lazy=lazy)(results)
+            if lazy:
+                return Fuse(img_norm_cfg=norm_cfg)(results)
+            if norm_cfg is not None:
+                results = Normalize(**norm_cfg)(results)
+            return results
+
+        crops = [
+            lambda lazy: ThreeCrop(crop_size=128, lazy=lazy),
+            lambda lazy: TenCrop(crop_size=112, lazy=lazy),
+            lambda lazy: MultiGroupCrop(crop_size=112, groups=2, lazy=lazy)
+        ]
+        for crop in crops:
+            for modality, norm_cfg in [('RGB', img_norm_cfg),
+                                       ('Flow', flow_norm_cfg)]:
+                for flip_ratio in [0, 1]:
+                    results = pipeline(modality, crop, True, flip_ratio)
+                    ref_results = pipeline(modality, crop, False, flip_ratio)
+                    assert 'lazy' not in results
+                    assert results['img_shape'] == ref_results['img_shape']
+                    assert np.array_equal(results['imgs'],
+                                          np.stack(ref_results['imgs']))
+
+                    results = pipeline(modality, crop, True, flip_ratio,
+                                       norm_cfg)
+                    ref_results = pipeline(modality, crop, False, flip_ratio,
+                                           norm_cfg)
+                    assert results['imgs'].dtype == np.float32
+                    assert_array_almost_equal(results['imgs'],
+                                              ref_results['imgs'], 4)
+
+        imgs = list(
+            np.random.randint(0, 256, (4, 240, 320, 3)).astype(np.uint8))
+        results = dict(imgs=imgs, modality='RGB')
+        results = TenCrop(crop_size=112, lazy=True)(results)
+        assert results['img_shape'] == (112, 112)
+        assert results['lazy']['views'].shape == (10, 4)
+        assert results['crop_bbox'].shape == (40, 4)
+        assert np.array_equal(results['lazy']['view_flips'], [False, True] * 5)
+
+        with pytest.raises(NotImplementedError):
+            # crop after multi-view crops
+            CenterCrop(crop_size=64, lazy=True)(copy.deepcopy(results))
+        with pytest.raises(NotImplementedError):
+            # multi-view crops twice
+            ThreeCrop(crop_size=112, lazy=True)(copy.deepcopy(results))
+        with pytest.raises(NotImplementedError):
+            PackLazyParams()(copy.deepcopy(results))
+
+        with pytest.raises(NotImplementedError):
+            # flip before multi-view crops
+            results = dict(imgs=imgs, modality='RGB')
+            results = Flip(flip_ratio=1, lazy=True)(results)
+            ThreeCrop(crop_size=240, lazy=True)(results)
+
+        assert repr(ThreeCrop(
+            crop_size=112,
+            lazy=True)) == (f'ThreeCrop(crop_size={(112, 112)}, lazy={True})')
+
+    def test_color_jitter_lazy(self):
+        imgs = list(np.random.randint(0, 256, (4, 64, 80, 3)).astype(np.uint8))
+        img_norm_cfg = dict(
+            mean=[123.675, 116.28, 103.53],
+            std=[58.395, 57.12, 57.375],
+            to_bgr=True)
+        for keep_uint8 in [False, True]:
+            color_jitter = ColorJitter(
+                color_space_aug=True, keep_uint8=keep_uint8, lazy=True)
+            np.random.seed(0)
+            results = dict(imgs=copy.deepcopy(imgs), modality='RGB')
+            results = CenterCrop(crop_size=48, lazy=True)(results)
+            results = Flip(flip_ratio=1, lazy=True)(results)
+            results = color_jitter(results)
+            assert results['imgs'][0].shape == (64, 80, 3)
+            assert results['lazy']['color_transforms'].shape == (4, 3, 4)
+            assert results['lazy']['color_keep_uint8'] is keep_uint8
+
+            np.random.seed(0)
+            ref_results = dict(imgs=copy.deepcopy(imgs), modality='RGB')
+            ref_results = CenterCrop(crop_size=48)(ref_results)
+            ref_results = Flip(flip_ratio=1)(ref_results)
+            ref_results = ColorJitter(
+                color_space_aug=True, keep_uint8=keep_uint8)(
+                    ref_results)
+
+            fuse_results = Fuse()(copy.deepcopy(results))
+            assert 'lazy' not in fuse_results
+            assert fuse_results['imgs'].dtype == ref_results['imgs'].dtype
+            assert_array_almost_equal(fuse_results['imgs'],
+                                      ref_results['imgs'], 4)
+
+            # the color jitter is fused into the normalization
+            fuse_results = Fuse(img_norm_cfg=img_norm_cfg)(results)
+            ref_results = Normalize(**img_norm_cfg)(ref_results)
+            assert_array_almost_equal(fuse_results['imgs'],
+                                      ref_results['imgs'], 4)
+
+        with pytest.raises(NotImplementedError):
+            # ColorJitter is lazy twice
+            results = dict(imgs=copy.deepcopy(imgs), modality='RGB')
+            results = color_jitter(color_jitter(results))
+
+        with pytest.raises(NotImplementedError):
+            results = dict(imgs=copy.deepcopy(imgs), modality='Flow')
+            Fuse()(color_jitter(results))
+
+    def test_pack_lazy_params(self):
+        imgs = list(np.random.randint(0, 256, (4, 64, 80, 3)).astype(np.uint8))
+        results = dict(imgs=copy.deepcopy(imgs), modality='RGB')
+
+        with pytest.raises(ValueError):
+            # no lazy operation
+            PackLazyParams()(copy.deepcopy(results))
+
+        results = RandomResizedCrop(lazy=True)(results)
+        results = Resize(scale=(32, 32), keep_ratio=False, lazy=True)(results)
+        results = Flip(flip_ratio=1, direction='vertical', lazy=True)(results)
+        crop_bbox = results['lazy']['crop_bbox'].round()
+        results = PackLazyParams()(results)
+        assert 'lazy' not in results
+        lazy_params = results['lazy_params']
+        assert lazy_params['crop_bbox'].dtype == np.float32
+        assert_array_almost_equal(lazy_params['crop_bbox'], crop_bbox)
+        assert np.array_equal(lazy_params['img_shape'], [32, 32])
+        assert np.array_equal(lazy_params['flip'], [0, 1])
+        assert 'color_transforms' not in lazy_params
+        # the frames are left as they are
+        assert np.array_equal(results['imgs'], imgs)
+
+        results = dict(imgs=copy.deepcopy(imgs), modality='RGB')
+        results = ColorJitter(lazy=True)(results)
+        results = PackLazyParams()(results)
+        lazy_params = results['lazy_params']
+        assert np.array_equal(lazy_params['crop_bbox'], [0, 0, 80, 64])
+        assert np.array_equal(lazy_params['flip'], [0, 0])
+        assert lazy_params['color_transforms'].shape == (4, 3, 4)
+
+        with pytest.raises(NotImplementedError):
+            results = dict(imgs=copy.deepcopy(imgs), modality='Flow')
+            PackLazyParams()(Flip(flip_ratio=1, lazy=True)(results))
+
+        assert repr(PackLazyParams()) == 'PackLazyParams()'
@@ -67,3 +67,47 @@ class TestNormalization:
             f'(mean={np.array([123.675, 116.28, 103.53])}, ' +
             f'std={np.array([58.395, 57.12, 57.375])}, to_bgr={True}, '
             f'adjust_magnitude={False})')
+
+    def test_normalize_clip_array(self):
+        config = dict(
+            mean=[123.675, 116.28, 103.53],
+            std=[58.395, 57.12, 57.375],
+            to_bgr=True)
+        normalize = Normalize(**config)
+
+        # the clip given as one uint8 array is normalized as the list of
+        # its frames
+        imgs = np.random.randint(0, 256, (3, 64, 48, 3), dtype=np.uint8)
+        results = normalize(dict(imgs=imgs, modality='RGB'))
+        list_results = normalize(dict(imgs=list(imgs), modality='RGB'))
+        assert results['imgs'].dtype == np.float32
+        assert results['imgs'].shape == (3, 64, 48, 3)
+        np.testing.assert_array_almost_equal(results['imgs'],
+                                             list_results['imgs'])
+        check_normalize(
+            list(imgs.astype(np.float32)), results['imgs'],
+            results['img_norm_cfg'])
+
+        # a contiguous float32 clip is normalized in place
+        imgs = np.random.rand(3, 64, 48, 3).astype(np.float32) * 255
+        origin_imgs = imgs.copy()
+        results = normalize(dict(imgs=imgs, modality='RGB'))
+        assert results['imgs'] is imgs
+        check_normalize(
+            list(origin_imgs), results['imgs'], results['img_norm_cfg'])
+
+        # flow clip given as one array with the magnitude adjusted
+        config = dict(mean=[128, 128], std=[128, 128], adjust_magnitude=True)
+        normalize = Normalize(**config)
+        imgs = np.random.randint(0, 256, (4, 64, 48), dtype=np.uint8)
+        scale_factor = np.array([0.5, 2.], dtype=np.float32)
+        results = normalize(
+            dict(imgs=imgs, modality='Flow', scale_factor=scale_factor))
+        list_results = normalize(
+            dict(imgs=list(imgs), modality='Flow', scale_factor=scale_factor))
+        x_components = (imgs[0::2].astype(np.float32) - 128) / 128 * 0.5
+        y_components = (imgs[1::2].astype(np.float32) - 128) / 128 * 2.
+        result_imgs = np.stack([x_components, y_components], axis=-1)
+        assert results['imgs'].shape == (2, 64, 48, 2)
+        np.testing.assert_array_almost_equal(results['imgs'], result_imgs)
+        np.testing.assert_array_almost_equal(list_results['imgs'], result_imgs)
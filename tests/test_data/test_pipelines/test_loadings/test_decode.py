@@ -1,15 +1,26 @@
 import copy
+import os
+import os.path as osp
+import tempfile
 
+import mmcv
 import numpy as np
 import pytest
 from mmcv.utils import assert_dict_has_keys
+from numpy.testing import assert_array_almost_equal
 
+# yapf: disable
 from mmaction.datasets.pipelines import (AudioDecode, AudioDecodeInit,
-                                         DecordDecode, DecordInit,
-                                         FrameSelector, OpenCVDecode,
-                                         OpenCVInit, PyAVDecode,
+                                         DecordDecode, DecordInit, FormatShape,
+                                         FrameSelector, ImageDecode,
+                                         MotionVectorToFlow, Normalize,
+                                         OpenCVDecode, OpenCVInit,
+                                         PackedFrameDecode, PyAVDecode,
                                          PyAVDecodeMotionVector, PyAVInit,
-                                         RawFrameDecode)
+                                         RawFrameDecode, SampleFrames,
+                                         UntrimmedSampleFrames)
+# yapf: enable
+from mmaction.utils import write_frame_pack
 from .base import BaseTestLoading
 
 
@@ -43,7 +54,7 @@ class TestDecode(BaseTestLoading):
         assert np.shape(pyav_decode_result['imgs']) == (len(
             video_result['frame_inds']), 256, 340, 3)
         assert repr(pyav_decode) == (f'{pyav_decode.__class__.__name__}('
-                                     f'multi_thread={False})')
+                                     f'multi_thread={False}, mode=accurate)')
 
         # test PyAV with 1 dim input and start_index = 0
         video_result = copy.deepcopy(self.video_results)
@@ -73,7 +84,7 @@ class TestDecode(BaseTestLoading):
         assert np.shape(pyav_decode_result['imgs']) == (len(
             video_result['frame_inds']), 256, 340, 3)
         assert repr(pyav_decode) == (f'{pyav_decode.__class__.__name__}('
-                                     f'multi_thread={True})')
+                                     f'multi_thread={True}, mode=accurate)')
 
         # test PyAV with 2 dim input
         video_result = copy.deepcopy(self.video_results)
@@ -119,7 +130,56 @@ class TestDecode(BaseTestLoading):
             video_result['frame_inds']), 256, 340, 3)
 
         assert repr(pyav_decode) == pyav_decode.__class__.__name__ + \
-            f'(multi_thread={True})'
+            f'(multi_thread={True}, mode=accurate)'
+
+        # PyAV with seek mode
+        for frame_inds in [
+                np.arange(1, self.total_frames, 5),
+                np.array([250, 3, 3, 120, 299, 0])
+        ]:
+            imgs = dict()
+            for mode in ['accurate', 'seek']:
+                video_result = copy.deepcopy(self.video_results)
+                video_result['frame_inds'] = frame_inds
+                pyav_init = PyAVInit()
+                pyav_init_result = pyav_init(video_result)
+                video_result['video_reader'] = pyav_init_result['video_reader']
+
+                pyav_decode = PyAVDecode(mode=mode)
+                pyav_decode_result = pyav_decode(video_result)
+                assert assert_dict_has_keys(pyav_decode_result, target_keys)
+                assert pyav_decode_result['original_shape'] == (256, 340)
+                assert np.shape(pyav_decode_result['imgs']) == (len(
+                    video_result['frame_inds']), 256, 340, 3)
+                imgs[mode] = pyav_decode_result['imgs']
+            assert np.array_equal(imgs['accurate'], imgs['seek'])
+        assert repr(pyav_decode) == (f'{pyav_decode.__class__.__name__}('
+                                     f'multi_thread={False}, mode=seek)')
+
+        with pytest.raises(AssertionError):
+            PyAVDecode(mode='any')
+
+    def test_init_with_file_cache(self):
+        init_decode_pairs = [(PyAVInit, PyAVDecode),
+                             (DecordInit, DecordDecode),
+                             (OpenCVInit, OpenCVDecode)]
+        for init_cls, decode_cls in init_decode_pairs:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                video_result = copy.deepcopy(self.video_results)
+                init = init_cls(cache_cfg=dict(cache_dir=tmpdir))
+                init_result = init(video_result)
+                assert init_result['total_frames'] == 300
+                assert init.file_cache.cache_dir == tmpdir
+                cache_path = init.file_cache.get_local_path(self.video_path)
+                assert osp.exists(cache_path)
+
+                # a new init transform reuses the cached file
+                init = init_cls(cache_cfg=dict(cache_dir=tmpdir))
+                video_result = copy.deepcopy(self.video_results)
+                video_result['frame_inds'] = np.arange(0, 300, 50)
+                video_result = init(video_result)
+                decode_result = decode_cls()(video_result)
+                assert np.shape(decode_result['imgs']) == (6, 256, 340, 3)
 
     def test_decord_init(self):
         target_keys = ['video_reader', 'total_frames']
@@ -193,6 +253,119 @@ class TestDecode(BaseTestLoading):
         assert decord_decode_result['original_shape'] == (256, 340)
         assert np.shape(decord_decode_result['imgs']) == (len(
             video_result['frame_inds']), 256, 340, 3)
+        assert repr(decord_decode) == (f'{decord_decode.__class__.__name__}('
+                                       f'batched={False}, '
+                                       f'keyframe_only={False})')
+
+        # test Decord with batched decoding
+        for frame_inds in [
+                np.arange(1, self.total_frames, 3)[:, np.newaxis],
+                np.array([250, 3, 3, 120, 299, 0])
+        ]:
+            imgs = dict()
+            for batched in [False, True]:
+                video_result = copy.deepcopy(self.video_results)
+                video_result['frame_inds'] = frame_inds
+                decord_init = DecordInit()
+                decord_init_result = decord_init(video_result)
+                video_result['video_reader'] = decord_init_result[
+                    'video_reader']
+
+                decord_decode = DecordDecode(batched=batched)
+                decord_decode_result = decord_decode(video_result)
+                assert assert_dict_has_keys(decord_decode_result, target_keys)
+                assert decord_decode_result['original_shape'] == (256, 340)
+                assert np.shape(decord_decode_result['imgs']) == (len(
+                    video_result['frame_inds']), 256, 340, 3)
+                imgs[batched] = decord_decode_result['imgs']
+            assert isinstance(imgs[True], np.ndarray)
+            assert imgs[True].dtype == np.uint8
+            assert imgs[True].flags['C_CONTIGUOUS']
+            assert np.array_equal(imgs[False], imgs[True])
+        assert repr(decord_decode) == (f'{decord_decode.__class__.__name__}('
+                                       f'batched={True}, '
+                                       f'keyframe_only={False})')
+
+    def test_keyframe_decode(self):
+        target_keys = ['frame_inds', 'imgs', 'original_shape']
+
+        # the keyframes of test.mp4 are frame 0 and frame 235
+        frame_inds = np.array([299, 0, 117, 118, 200, 120])
+        key_inds = np.array([235, 0, 0, 235, 235, 235])
+        video_result = copy.deepcopy(self.video_results)
+        video_result['frame_inds'] = np.array([0, 235])
+        video_result = PyAVInit()(video_result)
+        key_imgs = PyAVDecode()(video_result)['imgs']
+        key_imgs = [key_imgs[0 if idx == 0 else 1] for idx in key_inds]
+
+        for init, decode in [(PyAVInit(), PyAVDecode(mode='keyframe')),
+                             (DecordInit(), DecordDecode(keyframe_only=True)),
+                             (DecordInit(),
+                              DecordDecode(batched=True, keyframe_only=True))]:
+            video_result = copy.deepcopy(self.video_results)
+            video_result['frame_inds'] = frame_inds
+            video_result = init(video_result)
+            decode_result = decode(video_result)
+            assert assert_dict_has_keys(decode_result, target_keys)
+            assert np.array_equal(decode_result['frame_inds'], key_inds)
+            assert np.array_equal(decode_result['imgs'], key_imgs)
+
+        assert repr(decode) == (f'{decode.__class__.__name__}('
+                                f'batched={True}, keyframe_only={True})')
+
+        # test keyframe decoding after untrimmed sampling
+        video_result = copy.deepcopy(self.video_results)
+        video_result = UntrimmedSampleFrames(
+            clip_len=1, frame_interval=16)(
+                video_result)
+        video_result = PyAVInit()(video_result)
+        decode_result = PyAVDecode(mode='keyframe')(video_result)
+        assert np.array_equal(decode_result['frame_inds'],
+                              np.where(np.arange(8, 300, 16) <= 117, 0, 235))
+        assert len(decode_result['imgs']) == len(decode_result['frame_inds'])
+
+    def test_multi_clip_decode(self):
+        # overlapping clips with repeated indices and indices out of range
+        frame_inds = np.array([[4, 5, 6, 7], [6, 7, 8, 9], [0, 4, 302, 305]])
+        video_result = copy.deepcopy(self.video_results)
+        video_result['frame_inds'] = np.arange(10)
+        video_result = PyAVInit()(video_result)
+        ref_imgs = PyAVDecode()(video_result)['imgs']
+        # the indices out of range are wrapped around
+        ref_imgs = [ref_imgs[idx % 300] for idx in frame_inds.reshape(-1)]
+
+        for init, decode in [(PyAVInit(), PyAVDecode()),
+                             (DecordInit(), DecordDecode()),
+                             (OpenCVInit(), OpenCVDecode())]:
+            video_result = copy.deepcopy(self.video_results)
+            video_result['frame_inds'] = frame_inds[:2].reshape(-1)
+            video_result = init(video_result)
+            imgs = decode(video_result)['imgs']
+            assert len(imgs) == 8
+            assert len(set(id(img) for img in imgs)) == 8
+            if isinstance(decode, PyAVDecode):
+                assert np.array_equal(imgs, ref_imgs[:8])
+
+        video_result = copy.deepcopy(self.video_results)
+        video_result['frame_inds'] = frame_inds.reshape(-1)
+        video_result = PyAVInit()(video_result)
+        imgs = PyAVDecode()(video_result)['imgs']
+        assert len(set(id(img) for img in imgs)) == 12
+        assert np.array_equal(imgs, ref_imgs)
+
+        for frame_results in [self.frame_results, self.flow_frame_results]:
+            inputs = copy.deepcopy(frame_results)
+            inputs['frame_inds'] = np.array([1, 2, 2, 3, 3, 4])
+            ref_imgs = RawFrameDecode()(dict(
+                inputs, frame_inds=np.array([1, 2, 3, 4])))['imgs']
+            num_imgs = len(ref_imgs) // 4
+            ref_imgs = [
+                ref_imgs[idx * num_imgs + i] for idx in [0, 1, 1, 2, 2, 3]
+                for i in range(num_imgs)
+            ]
+            imgs = RawFrameDecode(num_threads=2)(inputs)['imgs']
+            assert len(set(id(img) for img in imgs)) == len(imgs)
+            assert np.array_equal(imgs, ref_imgs)
 
     def test_opencv_init(self):
         target_keys = ['new_path', 'video_reader', 'total_frames']
@@ -364,6 +537,27 @@ class TestDecode(BaseTestLoading):
                                              240, 320)
         assert results['original_shape'] == (240, 320)
 
+        # test frame selector with multiple threads
+        for frame_results in [self.frame_results, self.flow_frame_results]:
+            inputs = copy.deepcopy(frame_results)
+            inputs['frame_inds'] = np.array([5, 1, 3, 3, 2])
+            results = RawFrameDecode(io_backend='disk')(copy.deepcopy(inputs))
+            frame_selector = RawFrameDecode(io_backend='disk', num_threads=4)
+            threaded_results = frame_selector(inputs)
+            assert assert_dict_has_keys(threaded_results, target_keys)
+            assert np.array_equal(threaded_results['imgs'], results['imgs'])
+            pool = frame_selector._pool
+            assert pool is not None
+            frame_selector(inputs)
+            assert frame_selector._pool is pool
+            # the thread pool is not copied along with the transform
+            assert copy.deepcopy(frame_selector)._pool is None
+        assert repr(frame_selector) == (f'{frame_selector.__class__.__name__}('
+                                        f'io_backend=disk, '
+                                        f'decoding_backend=cv2, '
+                                        f'num_threads={4}, '
+                                        f'target_short_side=None)')
+
         # test frame selector in turbojpeg decording backend
         # when start_index = 0
         inputs = copy.deepcopy(self.frame_results)
@@ -391,7 +585,109 @@ class TestDecode(BaseTestLoading):
         assert results['original_shape'] == (240, 320)
         assert repr(frame_selector) == (f'{frame_selector.__class__.__name__}('
                                         f'io_backend=disk, '
-                                        f'decoding_backend=turbojpeg)')
+                                        f'decoding_backend=turbojpeg, '
+                                        f'num_threads={1}, '
+                                        f'target_short_side=None)')
+
+    def test_reduced_decode(self):
+        target_keys = ['imgs', 'original_shape', 'img_shape', 'scale_factor']
+
+        # test RawFrameDecode with reduced decoding
+        for target_short_side, shape in [(256, (240, 320)), (100, (120, 160)),
+                                         (60, (60, 80)), (10, (30, 40))]:
+            for frame_results in [self.frame_results, self.flow_frame_results]:
+                inputs = copy.deepcopy(frame_results)
+                inputs['frame_inds'] = np.arange(1, self.total_frames, 2)
+                frame_selector = RawFrameDecode(
+                    target_short_side=target_short_side)
+                results = frame_selector(inputs)
+                assert assert_dict_has_keys(results, target_keys)
+                assert results['img_shape'] == shape
+                assert results['original_shape'] == shape
+                assert all(img.shape[:2] == shape for img in results['imgs'])
+                assert_array_almost_equal(results['scale_factor'],
+                                          [shape[1] / 320, shape[0] / 240])
+        assert repr(frame_selector) == (f'{frame_selector.__class__.__name__}('
+                                        f'io_backend=disk, '
+                                        f'decoding_backend=cv2, '
+                                        f'num_threads={1}, '
+                                        f'target_short_side={10})')
+
+        # the reduced frames are close to the resized full frames
+        for decoding_backend in ['cv2', 'pillow']:
+            inputs = copy.deepcopy(self.frame_results)
+            inputs['frame_inds'] = np.array([1])
+            full_results = RawFrameDecode(decoding_backend=decoding_backend)(
+                copy.deepcopy(inputs))
+            results = RawFrameDecode(
+                decoding_backend=decoding_backend, target_short_side=120)(
+                    inputs)
+            assert results['img_shape'] == (120, 160)
+            resized = mmcv.imresize(
+                full_results['imgs'][0], (160, 120), interpolation='area')
+            assert np.abs(resized.astype(np.float32) -
+                          results['imgs'][0]).mean() < 2
+        mmcv.use_backend('cv2')
+
+        # test ImageDecode with reduced decoding
+        inputs = dict(filename=self.img_path, scale_factor=np.array([2, 2]))
+        image_decode = ImageDecode(target_short_side=60)
+        results = image_decode(inputs)
+        assert assert_dict_has_keys(results, target_keys)
+        assert results['img_shape'] == (60, 80)
+        assert np.shape(results['imgs']) == (1, 60, 80, 3)
+        assert_array_almost_equal(results['scale_factor'], [0.5, 0.5])
+        assert repr(image_decode) == (f'{image_decode.__class__.__name__}('
+                                      f'io_backend=disk, '
+                                      f'decoding_backend=cv2, '
+                                      f'target_short_side={60})')
+
+        # images other than JPEG are decoded at full resolution
+        with tempfile.TemporaryDirectory() as tmpdir:
+            png_path = osp.join(tmpdir, 'test.png')
+            mmcv.imwrite(mmcv.imread(self.img_path), png_path)
+            results = ImageDecode(target_short_side=60)(
+                dict(filename=png_path))
+            assert results['img_shape'] == (240, 320)
+            assert_array_almost_equal(results['scale_factor'], [1, 1])
+
+    def test_packed_frame_decode(self):
+        target_keys = ['frame_inds', 'imgs', 'original_shape', 'modality']
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            frames = []
+            for name in sorted(os.listdir(self.img_dir)):
+                with open(osp.join(self.img_dir, name), 'rb') as f:
+                    frames.append((name, f.read()))
+            frame_dir = osp.join(tmpdir, 'imgs')
+            write_frame_pack(frame_dir + '.pack', frames)
+
+            for frame_results in [self.frame_results, self.flow_frame_results]:
+                for num_threads in [1, 2]:
+                    inputs = copy.deepcopy(frame_results)
+                    inputs['frame_inds'] = np.array([5, 1, 3, 3, 2])
+                    results = RawFrameDecode()(copy.deepcopy(inputs))
+                    inputs['frame_dir'] = frame_dir
+                    packed_decode = PackedFrameDecode(num_threads=num_threads)
+                    packed_results = packed_decode(inputs)
+                    assert assert_dict_has_keys(packed_results, target_keys)
+                    assert packed_results['original_shape'] == (240, 320)
+                    assert np.array_equal(packed_results['imgs'],
+                                          results['imgs'])
+                    assert packed_decode._frame_pack is None
+
+            # frame_dir without frame pack
+            inputs = copy.deepcopy(self.frame_results)
+            inputs['frame_inds'] = np.array([1])
+            with pytest.raises(FileNotFoundError):
+                PackedFrameDecode()(inputs)
+
+        assert repr(packed_decode) == (f'{packed_decode.__class__.__name__}('
+                                       f'io_backend=disk, '
+                                       f'decoding_backend=cv2, '
+                                       f'num_threads={2}, '
+                                       f'target_short_side=None, '
+                                       f'suffix=.pack)')
 
     def test_audio_decode_init(self):
         target_keys = ['audios', 'length', 'sample_rate']
@@ -412,7 +708,19 @@ class TestDecode(BaseTestLoading):
             f'{audio_decode_init.__class__.__name__}('
             f'io_backend=disk, '
             f'sample_rate=16000, '
-            f'pad_method=zero)')
+            f'pad_method=zero, '
+            f'streaming={False})')
+
+        # test streaming audio reader
+        inputs = copy.deepcopy(self.audio_results)
+        del inputs['audios']
+        results = AudioDecodeInit(streaming=True)(inputs)
+        assert assert_dict_has_keys(results,
+                                    ['audio_reader', 'length', 'sample_rate'])
+        assert 'audios' not in results
+        ref_results = AudioDecodeInit()(copy.deepcopy(self.audio_results))
+        assert results['length'] == ref_results['length']
+        results['audio_reader'].close()
 
     def test_audio_decode(self):
         target_keys = ['frame_inds', 'audios']
@@ -424,6 +732,32 @@ class TestDecode(BaseTestLoading):
         audio_selector = AudioDecode()
         results = audio_selector(inputs)
         assert assert_dict_has_keys(results, target_keys)
+        assert repr(audio_selector) == (f'{audio_selector.__class__.__name__}'
+                                        f'(fixed_length=32000)')
+
+        # test reading the clips with the streaming audio reader
+        for sample_rate in [16000, 8000]:
+            clips = []
+            for streaming in [False, True]:
+                inputs = copy.deepcopy(self.audio_results)
+                del inputs['audios']
+                inputs = AudioDecodeInit(
+                    sample_rate=sample_rate, streaming=streaming)(
+                        inputs)
+                inputs['frame_inds'] = np.array([[10, 40], [100, 150],
+                                                 [250, 299]])
+                inputs['num_clips'] = 3
+                results = AudioDecode(fixed_length=sample_rate)(inputs)
+                assert results['audios'].shape == (3, sample_rate)
+                assert results['audio_clip_ranges'].shape == (3, 2)
+                clips.append(results['audios'])
+            assert results['audio_reader'] is None
+            if sample_rate == 16000:
+                assert np.array_equal(clips[0], clips[1])
+            else:
+                # resampling each clip differs only around the boundaries
+                assert_array_almost_equal(
+                    clips[0][:, 100:-100], clips[1][:, 100:-100], decimal=2)
 
     def test_pyav_decode_motion_vector(self):
         pyav_init = PyAVInit()
@@ -450,3 +784,80 @@ class TestDecode(BaseTestLoading):
         results = pyav(results)
 
         assert assert_dict_has_keys(results, target_keys)
+
+    def test_parse_motion_vectors(self):
+
+        def parse_vectors(mv, vectors, height, width):
+            # rasterize the blocks one by one
+            for vector in vectors:
+                w, h = int(vector['w']), int(vector['h'])
+                sx = int(vector['dst_x']) - w // 2
+                sy = int(vector['dst_y']) - h // 2
+                if sx >= 0 and sx + w < width and sy >= 0 and sy + h < height:
+                    mv[sy:sy + h,
+                       sx:sx + w] = (vector['dst_x'] - vector['src_x'],
+                                     vector['dst_y'] - vector['src_y'])
+            return mv
+
+        dtype = np.dtype([('w', 'u1'), ('h', 'u1'), ('src_x', '<i2'),
+                          ('src_y', '<i2'), ('dst_x', '<i2'),
+                          ('dst_y', '<i2')])
+        rng = np.random.RandomState(0)
+        # overlapping blocks aligned to 4 and 1 pixels, in frames of sizes
+        # divisible or not by the block grid
+        for align, (height, width) in [(4, (64, 80)), (4, (62, 78)),
+                                       (1, (64, 80))]:
+            vectors = np.zeros(200, dtype=dtype)
+            vectors['w'] = rng.choice([4, 8, 16], 200)
+            vectors['h'] = rng.choice([4, 8, 16], 200)
+            vectors['dst_x'] = (
+                rng.randint(-8, width, 200) // align * align +
+                vectors['w'] // 2)
+            vectors['dst_y'] = (
+                rng.randint(-8, height, 200) // align * align +
+                vectors['h'] // 2)
+            vectors['src_x'] = vectors['dst_x'] + rng.randint(-30, 30, 200)
+            vectors['src_y'] = vectors['dst_y'] + rng.randint(-30, 30, 200)
+            mv = PyAVDecodeMotionVector._parse_vectors(
+                np.zeros((height, width, 2), dtype=np.int8), vectors, height,
+                width)
+            ref_mv = parse_vectors(
+                np.zeros((height, width, 2), dtype=np.int8), vectors, height,
+                width)
+            assert np.array_equal(mv, ref_mv)
+
+        # no block inside the frame
+        mv = PyAVDecodeMotionVector._parse_vectors(
+            np.zeros((64, 80, 2), dtype=np.int8), vectors[:0], 64, 80)
+        assert not mv.any()
+
+    def test_motion_vector_to_flow(self):
+        results = copy.deepcopy(self.video_results)
+        results = SampleFrames(
+            clip_len=5, frame_interval=1, num_clips=3)(
+                results)
+        results = PyAVInit()(results)
+        results = PyAVDecodeMotionVector()(results)
+        motion_vectors = results['motion_vectors']
+
+        mv_to_flow = MotionVectorToFlow()
+        results = mv_to_flow(results)
+        assert assert_dict_has_keys(
+            results, ['imgs', 'modality', 'img_shape', 'original_shape'])
+        assert 'motion_vectors' not in results
+        assert results['modality'] == 'Flow'
+        assert results['img_shape'] == (256, 340)
+        assert len(results['imgs']) == 30
+        assert results['imgs'][0].dtype == np.uint8
+        for i, mv in enumerate(motion_vectors):
+            for j in range(2):
+                flow = np.clip(mv[..., j].astype(np.float32), -20, 20)
+                flow = ((flow + 20) * (255 / 40.)).astype(np.uint8)
+                assert np.array_equal(results['imgs'][2 * i + j], flow)
+
+        # the flow images fit the flow pipeline of TSN
+        results = Normalize(mean=[128, 128], std=[128, 128])(results)
+        results = FormatShape(input_format='NCHW_Flow')(results)
+        assert results['imgs'].shape == (3, 10, 256, 340)
+        assert repr(mv_to_flow) == (f'{mv_to_flow.__class__.__name__}'
+                                    f'(bound=20.0)')
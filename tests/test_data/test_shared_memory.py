@@ -0,0 +1,109 @@
+import pytest
+import torch
+from mmcv.parallel import DataContainer as DC
+from torch.utils.data import Dataset
+
+from mmaction.datasets import build_dataloader
+from mmaction.datasets.shared_memory import SharedSlabRing, SlabDataLoader
+
+
+class ToyDataset(Dataset):
+
+    def __init__(self, num_clips=2):
+        self.num_clips = num_clips
+
+    def __len__(self):
+        return 10
+
+    def __getitem__(self, idx):
+        imgs = torch.arange(
+            self.num_clips * 3 * 4 * 8 * 8, dtype=torch.float32).view(
+                self.num_clips, 3, 4, 8, 8) + idx
+        return dict(
+            imgs=imgs,
+            label=torch.tensor([idx]),
+            img_metas=DC(dict(idx=idx), cpu_only=True))
+
+
+def test_shared_slab_ring():
+    with pytest.raises(ValueError):
+        SharedSlabRing(0, 1024)
+
+    ring = SharedSlabRing(2, 1024)
+    assert len(ring.slabs) == 2
+    assert all(slab.is_shared() for slab in ring.slabs)
+    assert ring.acquire() == 0
+    assert ring.acquire() == 1
+    ring.release(0)
+    assert ring.acquire() == 0
+    ring.reset()
+    assert ring.acquire() == 0
+
+
+@pytest.mark.parametrize('workers_per_gpu', [0, 2])
+def test_slab_dataloader(workers_per_gpu):
+    dataset = ToyDataset()
+    slab_size = 4 * dataset[0]['imgs'].numel() * 4 + 1024
+    data_loader = build_dataloader(
+        dataset,
+        videos_per_gpu=4,
+        workers_per_gpu=workers_per_gpu,
+        dist=False,
+        shuffle=False,
+        pin_memory=False,
+        shm_slab_size=slab_size)
+    assert isinstance(data_loader, SlabDataLoader)
+    ref_data_loader = build_dataloader(
+        dataset,
+        videos_per_gpu=4,
+        workers_per_gpu=0,
+        dist=False,
+        shuffle=False,
+        pin_memory=False)
+
+    for _ in range(2):
+        num_batches = 0
+        for batch, ref_batch in zip(data_loader, ref_data_loader):
+            assert list(batch) == list(ref_batch)
+            assert torch.equal(batch['imgs'], ref_batch['imgs'])
+            assert torch.equal(batch['label'], ref_batch['label'])
+            assert batch['img_metas'].data == ref_batch['img_metas'].data
+            num_batches += 1
+        assert num_batches == 3
+
+    # iterate again after breaking an iteration
+    for batch in data_loader:
+        break
+    batches = [batch['label'].clone() for batch in data_loader]
+    assert torch.equal(torch.cat(batches).view(-1), torch.arange(10))
+
+    # batches larger than a slab are collated as usual
+    data_loader = build_dataloader(
+        ToyDataset(num_clips=4),
+        videos_per_gpu=4,
+        workers_per_gpu=workers_per_gpu,
+        dist=False,
+        shuffle=False,
+        pin_memory=False,
+        shm_slab_size=slab_size)
+    batch = next(iter(data_loader))
+    assert batch['imgs'].shape == (4, 4, 3, 4, 8, 8)
+
+    with pytest.raises(ValueError):
+        # not enough slabs for the prefetched batches
+        build_dataloader(
+            dataset,
+            videos_per_gpu=4,
+            workers_per_gpu=2,
+            dist=False,
+            shm_slab_size=slab_size,
+            shm_num_slabs=2)
+
+    with pytest.raises(NotImplementedError):
+        build_dataloader(
+            dataset,
+            videos_per_gpu=4,
+            workers_per_gpu=2,
+            dist=False,
+            shm_slab_size=slab_size,
+            persistent_workers=True)
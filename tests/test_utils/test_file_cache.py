@@ -0,0 +1,120 @@
+import os
+import os.path as osp
+import tempfile
+
+import pytest
+from mmcv.fileio import FileClient
+
+from mmaction.utils import FileCache
+
+
+class CountingFileClient:
+
+    def __init__(self):
+        self.file_client = FileClient('disk')
+        self.num_get = 0
+
+    def get(self, filepath):
+        self.num_get += 1
+        return self.file_client.get(filepath)
+
+
+def test_file_cache():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        src_dir = osp.join(tmpdir, 'src')
+        cache_dir = osp.join(tmpdir, 'cache')
+        os.mkdir(src_dir)
+        filepaths = []
+        for i in range(4):
+            filepath = osp.join(src_dir, f'{i}.mp4')
+            with open(filepath, 'wb') as f:
+                f.write(bytes([i]) * 100)
+            filepaths.append(filepath)
+        empty_path = osp.join(src_dir, 'empty.mp4')
+        open(empty_path, 'wb').close()
+
+        file_client = CountingFileClient()
+        file_cache = FileCache(file_client, cache_dir, max_size=250)
+        assert repr(file_cache) == (f'{file_cache.__class__.__name__}('
+                                    f'cache_dir={cache_dir}, max_size=250)')
+
+        # files are fetched once and shared by caches on the same directory
+        content = file_cache.get(filepaths[0])
+        assert content[:] == bytes([0]) * 100
+        assert file_client.num_get == 1
+        another_cache = FileCache(file_client, cache_dir, max_size=250)
+        assert another_cache.get(filepaths[0])[:] == bytes([0]) * 100
+        assert file_client.num_get == 1
+        local_path = file_cache.get_local_path(filepaths[0])
+        assert local_path.startswith(cache_dir)
+        assert local_path.endswith('.mp4')
+        assert file_client.num_get == 1
+
+        # the least recently used file is evicted
+        file_cache.get(filepaths[1])
+        os.utime(file_cache.get_local_path(filepaths[0]), (0, 0))
+        file_cache.get(filepaths[2])
+        assert file_client.num_get == 3
+        assert not osp.exists(file_cache._cache_path(filepaths[0]))
+        assert osp.exists(file_cache._cache_path(filepaths[1]))
+        assert osp.exists(file_cache._cache_path(filepaths[2]))
+        assert file_cache.get(filepaths[0])[:] == bytes([0]) * 100
+        assert file_client.num_get == 4
+
+        assert file_cache.get(empty_path) == b''
+
+        with pytest.raises(FileNotFoundError):
+            file_cache.get(osp.join(src_dir, 'not_exist.mp4'))
+
+
+def test_file_cache_eviction():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filepaths = []
+        for i in range(6):
+            filepath = osp.join(tmpdir, f'{i}.mp4')
+            with open(filepath, 'wb') as f:
+                f.write(bytes([i]) * 100)
+            filepaths.append(filepath)
+        cache_dir = osp.join(tmpdir, 'cache')
+        file_cache = FileCache(
+            FileClient('disk'), cache_dir, max_size=450, low_water=0.5)
+        num_evict = 0
+        evict = file_cache.evict
+
+        def counting_evict():
+            nonlocal num_evict
+            num_evict += 1
+            evict()
+
+        file_cache.evict = counting_evict
+        for i, filepath in enumerate(filepaths[:5]):
+            file_cache.get_local_path(filepath)
+            os.utime(file_cache._cache_path(filepath), (i, i))
+        # evicted down to the low water mark
+        assert num_evict == 1
+        assert file_cache._size == 200
+        assert [
+            osp.exists(file_cache._cache_path(filepath))
+            for filepath in filepaths[:5]
+        ] == [False, False, False, True, True]
+        # not scanned again at the next insertion
+        file_cache.get_local_path(filepaths[5])
+        assert num_evict == 1
+
+        # reopened if evicted by another process before being opened
+        def open_fn(path):
+            if not opened:
+                os.remove(path)
+                opened.append(path)
+            with open(path, 'rb') as f:
+                return f.read()
+
+        opened = []
+        assert file_cache.open_local(filepaths[0], open_fn) == bytes(100)
+        assert opened == [file_cache._cache_path(filepaths[0])]
+
+        def failed_open_fn(path):
+            raise ValueError
+
+        with pytest.raises(ValueError):
+            file_cache.open_local(filepaths[0], failed_open_fn)
@@ -0,0 +1,88 @@
+import importlib.util
+import os
+import os.path as osp
+import tempfile
+
+import pytest
+
+from mmaction.utils import FramePack, merge_frame_pack, write_frame_pack
+
+
+def test_frame_pack():
+    frames = [('img_00001.jpg', b'abc'), ('img_00002.jpg', b''),
+              ('x_00001.jpg', b'0123456789')]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pack_path = osp.join(tmpdir, 'video.pack')
+        write_frame_pack(pack_path, frames)
+
+        with open(pack_path, 'rb') as f:
+            buffer = f.read()
+        for frame_pack in [FramePack(pack_path), FramePack(buffer=buffer)]:
+            with frame_pack:
+                assert len(frame_pack) == 3
+                assert list(frame_pack.keys()) == [name for name, _ in frames]
+                assert 'x_00001.jpg' in frame_pack
+                assert 'y_00001.jpg' not in frame_pack
+                for name, content in frames:
+                    assert frame_pack.get(name) == content
+                with pytest.raises(KeyError):
+                    frame_pack.get('y_00001.jpg')
+
+        empty_path = osp.join(tmpdir, 'empty.pack')
+        write_frame_pack(empty_path, [])
+        assert len(FramePack(empty_path)) == 0
+
+        with pytest.raises(ValueError):
+            write_frame_pack(pack_path, [('img\n.jpg', b'')])
+        with pytest.raises(ValueError):
+            FramePack()
+        with pytest.raises(ValueError):
+            FramePack(pack_path, buffer)
+        with pytest.raises(ValueError):
+            FramePack(buffer=b'0' * 32)
+
+
+def test_merge_frame_pack():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pack_path = osp.join(tmpdir, 'video.pack')
+        merge_frame_pack(pack_path, [('img_00001.jpg', b'abc')])
+        merge_frame_pack(pack_path, [('img_00001.jpg', b'abc'),
+                                     ('flow_x_00001.jpg', b'x')])
+        with FramePack(pack_path) as frame_pack:
+            assert list(
+                frame_pack.keys()) == ['img_00001.jpg', 'flow_x_00001.jpg']
+            assert frame_pack.get('flow_x_00001.jpg') == b'x'
+
+        with pytest.raises(FileExistsError):
+            merge_frame_pack(pack_path, [('img_00001.jpg', b'abd')])
+        with FramePack(pack_path) as frame_pack:
+            assert frame_pack.get('img_00001.jpg') == b'abc'
+
+
+def test_build_rawframes_pack():
+    # an rgb pass and then a flow pass of tools/data/build_rawframes.py
+    tool_path = osp.join(
+        osp.dirname(__file__), '../../tools/data/build_rawframes.py')
+    spec = importlib.util.spec_from_file_location('build_rawframes', tool_path)
+    build_rawframes = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(build_rawframes)
+
+    def extract(frame_dir, names):
+        os.makedirs(frame_dir)
+        for name in names:
+            with open(osp.join(frame_dir, name), 'wb') as f:
+                f.write(name.encode())
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        frame_dir = osp.join(tmpdir, 'video')
+        rgb_names = ['img_00001.jpg', 'img_00002.jpg']
+        flow_names = ['flow_x_00001.jpg', 'flow_y_00001.jpg']
+        extract(frame_dir, rgb_names)
+        build_rawframes.pack_frames(frame_dir)
+        assert not osp.exists(frame_dir)
+        extract(frame_dir, flow_names)
+        build_rawframes.pack_frames(frame_dir)
+        with FramePack(frame_dir + '.pack') as frame_pack:
+            assert sorted(frame_pack.keys()) == sorted(rgb_names + flow_names)
+            for name in rgb_names + flow_names:
+                assert frame_pack.get(name) == name.encode()
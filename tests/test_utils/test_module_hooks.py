@@ -1,14 +1,20 @@
 import copy
 import os.path as osp
+from unittest.mock import patch
 
+import cv2
 import mmcv
 import numpy as np
 import pytest
 import torch
+from mmcv.parallel import collate
 
+from mmaction.datasets.pipelines import (ColorJitter, Flip, FormatShape, Fuse,
+                                         Normalize, PackLazyParams, RandomCrop,
+                                         Resize)
 from mmaction.models import build_recognizer
 from mmaction.utils import register_module_hooks
-from mmaction.utils.module_hooks import GPUNormalize
+from mmaction.utils.module_hooks import GPUAugment, GPUNormalize
 
 
 def test_register_module_hooks():
@@ -118,3 +124,119 @@ def test_gpu_normalize():
     gpu_normalize_cfg['input_format'] = '_format'
     with pytest.raises(ValueError):
         gpu_normalize = GPUNormalize(**gpu_normalize_cfg)
+
+    # case 6
+    gpu_normalize_cfg = copy.deepcopy(_gpu_normalize_cfg)
+    gpu_normalize_cfg['input_format'] = 'NCTHW'
+    gpu_normalize_cfg['to_bgr'] = True
+    gpu_normalize = GPUNormalize(**gpu_normalize_cfg)
+    imgs = np.random.randint(256, size=(2, 4, 24, 32, 3), dtype=np.uint8)
+    _input = (torch.tensor(imgs).permute(0, 4, 1, 2, 3), )
+    normalize_hook = gpu_normalize.hook_func()
+    _input = normalize_hook(torch.nn.Module, _input)
+    result_imgs = np.array(_input[0].permute(0, 2, 3, 4, 1))
+    check_normalize(imgs[..., ::-1], result_imgs, gpu_normalize_cfg)
+
+    # uint8 frames from the augmentations are normalized as on CPUs
+    color_jitter = ColorJitter(color_space_aug=True, keep_uint8=True)
+    imgs = color_jitter(dict(imgs=imgs[0]))['imgs']
+    assert imgs.dtype == np.uint8
+    normalize = Normalize(
+        mean=gpu_normalize_cfg['mean'],
+        std=gpu_normalize_cfg['std'],
+        to_bgr=True)
+    cpu_imgs = normalize(dict(imgs=imgs, modality='RGB'))['imgs']
+    _input = (torch.tensor(imgs).permute(3, 0, 1, 2)[None], )
+    _input = normalize_hook(torch.nn.Module, _input)
+    result_imgs = np.array(_input[0][0].permute(1, 2, 3, 0))
+    np.testing.assert_array_almost_equal(result_imgs, cpu_imgs, decimal=4)
+
+
+def test_gpu_augment():
+    with pytest.raises(ValueError):
+        GPUAugment(input_format='NPTCHW')
+    with pytest.raises(ValueError):
+        GPUAugment(input_format='NCHW', interpolation='bicubic')
+
+    def lazy_samples(input_format, crop_size, color_jitter, batch_size=3):
+        fused_imgs = []
+        samples = []
+        for i in range(batch_size):
+            imgs = np.random.randint(256, size=(4, 60, 80, 3), dtype=np.uint8)
+            # smooth frames differ little in the interpolation at the edges
+            imgs = [cv2.GaussianBlur(img, (7, 7), 3) for img in imgs]
+            results = dict(imgs=imgs, modality='RGB')
+            results = RandomCrop(crop_size, lazy=True)(results)
+            results = Resize((32, 32), keep_ratio=False, lazy=True)(results)
+            direction = ['horizontal', 'vertical'][i % 2]
+            results = Flip(
+                flip_ratio=0.5, direction=direction, lazy=True)(
+                    results)
+            if color_jitter:
+                results = ColorJitter(
+                    color_space_aug=True, keep_uint8=True, lazy=True)(
+                        results)
+            format_shape = FormatShape(input_format)
+            if input_format == 'NCTHW':
+                results.update(clip_len=2, num_clips=2)
+            fused_imgs.append(
+                format_shape(Fuse()(copy.deepcopy(results)))['imgs'])
+            results = format_shape(PackLazyParams()(results))
+            samples.append(
+                dict(
+                    imgs=torch.from_numpy(results['imgs']),
+                    lazy_params=results['lazy_params']))
+        return collate(samples), np.stack(fused_imgs)
+
+    for input_format in ['NCHW', 'NCTHW']:
+        gpu_augment = GPUAugment(input_format=input_format)
+
+        # frames cropped without resizing are the same as fused on CPUs
+        batch, fused_imgs = lazy_samples(input_format, 32, False)
+        imgs = gpu_augment.augment(batch['imgs'], batch['lazy_params'])
+        assert imgs.dtype == torch.uint8
+        assert imgs.shape == fused_imgs.shape
+        assert np.array_equal(imgs.numpy(), fused_imgs)
+
+        # frames resized and color jittered differ by rounding and at edges
+        batch, fused_imgs = lazy_samples(input_format, 48, True)
+        imgs = gpu_augment.augment(batch['imgs'], batch['lazy_params'])
+        assert imgs.shape == fused_imgs.shape
+        diff = np.abs(imgs.numpy().astype(np.int64) - fused_imgs)
+        assert diff.max() <= 4
+        assert diff.mean() < 0.5
+
+        # float frames stay in float
+        imgs = gpu_augment.augment(batch['imgs'].float(), batch['lazy_params'])
+        assert imgs.dtype == torch.float32
+
+    # recognizers apply the lazy parameters in train_step and val_step
+    repo_dpath = osp.dirname(osp.dirname(osp.dirname(__file__)))
+    config = mmcv.Config.fromfile(
+        osp.join(repo_dpath, 'configs/_base_/models/tsn_r50.py'))
+    config.model['backbone']['pretrained'] = None
+    config.model['train_cfg'] = dict(
+        aux_info=['lazy_params'], gpu_augment=dict(input_format='NCHW'))
+    recognizer = build_recognizer(config.model)
+    assert isinstance(recognizer.gpu_augment, GPUAugment)
+    batch, fused_imgs = lazy_samples('NCHW', 32, False)
+    batch['label'] = torch.zeros(3, 1, dtype=torch.int64)
+    with patch.object(
+            recognizer,
+            'forward_train',
+            return_value=dict(loss_cls=torch.tensor(1.))) as forward_train:
+        recognizer.train_step(batch, None)
+        imgs, _ = forward_train.call_args[0]
+        assert np.array_equal(imgs.numpy(), fused_imgs)
+        assert 'lazy_params' not in forward_train.call_args[1]
+
+        # the val pipeline may not collect the lazy parameters
+        val_batch = dict(imgs=batch['imgs'], label=batch['label'])
+        recognizer.val_step(val_batch, None)
+        imgs, _ = forward_train.call_args[0]
+        assert imgs is batch['imgs']
+
+    config.model['train_cfg'] = dict(aux_info=['lazy_params'])
+    recognizer = build_recognizer(config.model)
+    with pytest.raises(ValueError):
+        recognizer.train_step(batch, None)
@@ -0,0 +1,99 @@
+"""This file is for benchmarking the decoding modes of ``PyAVDecode``. The
+command line to run this file is:
+
+$ python tools/analysis/bench_decoding.py ${VIDEO_FILES}
+
+For each video it samples frame indices with ``SampleFrames``, decodes them
+with every given mode, checks that all modes return the same frames and
+reports the average decoding time per video.
+"""
+import argparse
+import copy
+import time
+
+import numpy as np
+
+from mmaction.datasets.pipelines import PyAVDecode, PyAVInit, SampleFrames
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the decoding modes of PyAVDecode')
+    parser.add_argument('videos', nargs='+', help='video files to decode')
+    parser.add_argument(
+        '--modes',
+        nargs='+',
+        default=['accurate', 'seek'],
+        help='decoding modes to compare')
+    parser.add_argument(
+        '--clip-len', type=int, default=1, help='frames of each clip')
+    parser.add_argument(
+        '--frame-interval',
+        type=int,
+        default=1,
+        help='temporal interval of adjacent sampled frames')
+    parser.add_argument(
+        '--num-clips', type=int, default=8, help='number of sampled clips')
+    parser.add_argument(
+        '--test-mode',
+        action='store_true',
+        help='whether to sample frames in test mode')
+    parser.add_argument(
+        '--repeat', type=int, default=3, help='repeat times for each video')
+    parser.add_argument(
+        '--multi-thread',
+        action='store_true',
+        help='whether to use multi thread decoding')
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    args = parser.parse_args()
+    return args
+
+
+def main():
+    args = parse_args()
+    np.random.seed(args.seed)
+
+    init = PyAVInit()
+    sampler = SampleFrames(
+        clip_len=args.clip_len,
+        frame_interval=args.frame_interval,
+        num_clips=args.num_clips,
+        test_mode=args.test_mode)
+    decoders = {
+        mode: PyAVDecode(multi_thread=args.multi_thread, mode=mode)
+        for mode in args.modes
+    }
+
+    time_cost = {mode: 0. for mode in args.modes}
+    num_samples = 0
+    for video in args.videos:
+        results = init(dict(filename=video, start_index=0))
+        results['video_reader'] = None
+        for _ in range(args.repeat):
+            sample = sampler(copy.deepcopy(results))
+            imgs = dict()
+            for mode, decoder in decoders.items():
+                sample['video_reader'] = init(sample)['video_reader']
+                tic = time.time()
+                imgs[mode] = decoder(sample)['imgs']
+                time_cost[mode] += time.time() - tic
+
+            ref_mode = args.modes[0]
+            for mode in args.modes[1:]:
+                assert all(
+                    np.array_equal(ref, img)
+                    for ref, img in zip(imgs[ref_mode], imgs[mode])), (
+                        f'{mode} mode decodes different frames from '
+                        f'{ref_mode} mode for {video}')
+            num_samples += 1
+
+    print(f'Decoded {num_samples} samples from {len(args.videos)} videos')
+    for mode in args.modes:
+        avg_time = time_cost[mode] / num_samples * 1000
+        speedup = time_cost[args.modes[0]] / time_cost[mode]
+        print(f'{mode:>10}: {avg_time:.2f} ms/sample, '
+              f'{speedup:.2f}x speed up')
+
+
+if __name__ == '__main__':
+    main()
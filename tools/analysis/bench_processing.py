@@ -7,22 +7,131 @@ configs/task/method/[config filename]
 It use cProfile to record cpu running time and output to program.prof
 To visualize cProfile output program.prof, use Snakeviz and run:
 $ snakeviz program.prof
+
+To measure the throughput of ``RawFrameDecode`` against the number of threads
+it reads frames with, run:
+$ python tools/analysis/bench_processing.py
+configs/task/method/[config filename] --num-threads 1 2 4 8
+
+To profile the wall time, output size and shape of each transform of the
+train pipeline, aggregated across the dataloader workers, run:
+$ python tools/analysis/bench_processing.py
+configs/task/method/[config filename] --profile --workers 2
+--profile-out profile.json
 """
 import argparse
+import copy
 import os
+import time
 
 import mmcv
 from mmcv import Config
 
 from mmaction import __version__
 from mmaction.datasets import build_dataloader, build_dataset
+from mmaction.datasets.pipelines import Compose
 from mmaction.utils import get_root_logger
 
 
-def main():
+def parse_args():
     parser = argparse.ArgumentParser(description='Benchmark dataloading')
     parser.add_argument('config', help='train config file path')
+    parser.add_argument(
+        '--num-threads',
+        type=int,
+        nargs='+',
+        help='numbers of threads used by RawFrameDecode to benchmark the '
+        'throughput with')
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='profile each transform of the train pipeline')
+    parser.add_argument(
+        '--trace-alloc',
+        action='store_true',
+        help='trace the memory allocated by each transform with tracemalloc '
+        'when profiling')
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=0,
+        help='number of dataloader workers when profiling')
+    parser.add_argument(
+        '--profile-out', help='json file to dump the profiled statistics to')
     args = parser.parse_args()
+    return args
+
+
+def build_bench_loader(cfg, workers_per_gpu=0):
+    dataset = build_dataset(cfg.data.train)
+    data_loader = build_dataloader(
+        dataset,
+        videos_per_gpu=cfg.data.videos_per_gpu,
+        workers_per_gpu=workers_per_gpu,
+        num_gpus=1,
+        dist=False)
+    return dataset, data_loader
+
+
+def bench_rawframe_threads(cfg, num_threads_list, logger):
+    """Report the throughput of the train pipeline with ``RawFrameDecode``
+    reading frames with different numbers of threads."""
+    throughputs = []
+    for num_threads in num_threads_list:
+        bench_cfg = copy.deepcopy(cfg)
+        found = False
+        for transform in bench_cfg.data.train.pipeline:
+            if transform['type'] in ['RawFrameDecode', 'FrameSelector']:
+                transform['num_threads'] = num_threads
+                found = True
+        if not found:
+            raise ValueError('RawFrameDecode is not used in the pipeline')
+
+        dataset, data_loader = build_bench_loader(bench_cfg)
+        num_samples = 0
+        tic = None
+        for i, data in enumerate(data_loader):
+            # skip the first 5 batches for warming up
+            if i == 5:
+                tic = time.time()
+            elif i > 5:
+                num_samples += len(data['imgs'])
+        if tic is None or num_samples == 0:
+            raise ValueError('Too few samples to benchmark the throughput')
+        throughput = num_samples / (time.time() - tic)
+        throughputs.append(throughput)
+        logger.info(f'num_threads: {num_threads}, '
+                    f'throughput: {throughput:.2f} samples/s')
+
+    table = ['| num_threads | samples/s | speed up |', '| --- | --- | --- |']
+    for num_threads, throughput in zip(num_threads_list, throughputs):
+        table.append(f'| {num_threads} | {throughput:.2f} | '
+                     f'{throughput / throughputs[0]:.2f} |')
+    print('\n'.join(table))
+
+
+def profile_pipeline(cfg, workers, trace_alloc, out_file, logger):
+    """Report the mean wall time, output size and shape of each transform
+    of the train pipeline, aggregated across the dataloader workers."""
+    dataset, data_loader = build_bench_loader(cfg, workers)
+    # rebuilt with the same transforms before the workers are started
+    dataset.pipeline = Compose(
+        dataset.pipeline.transforms, profile=True, trace_alloc=trace_alloc)
+    prog_bar = mmcv.ProgressBar(len(dataset))
+    for data in data_loader:
+        for _ in data['imgs']:
+            prog_bar.update()
+
+    stats = dataset.pipeline.profile_stats()
+    print()
+    print(dataset.pipeline.profile_table())
+    if out_file is not None:
+        mmcv.dump(stats, out_file)
+        logger.info(f'Profiled statistics are dumped to {out_file}')
+
+
+def main():
+    args = parse_args()
     cfg = Config.fromfile(args.config)
 
     # init logger before other steps
@@ -39,13 +148,15 @@ def main():
                 f1.writelines(lines)
     cfg.data.train.ann_file = ann_file_bench
 
-    dataset = build_dataset(cfg.data.train)
-    data_loader = build_dataloader(
-        dataset,
-        videos_per_gpu=cfg.data.videos_per_gpu,
-        workers_per_gpu=0,
-        num_gpus=1,
-        dist=False)
+    if args.num_threads is not None:
+        bench_rawframe_threads(cfg, args.num_threads, logger)
+        return
+    if args.profile:
+        profile_pipeline(cfg, args.workers, args.trace_alloc, args.profile_out,
+                         logger)
+        return
+
+    dataset, data_loader = build_bench_loader(cfg)
 
     # Start progress bar after first 5 batches
     prog_bar = mmcv.ProgressBar(
@@ -25,6 +25,17 @@ def parse_args():
         default=16,
         help='the sampling frequency of frame in the untrimed video')
     parser.add_argument('--modality', default='RGB', choices=['RGB', 'Flow'])
+    parser.add_argument(
+        '--video-input',
+        action='store_true',
+        help='whether the data list contains videos instead of frame '
+        'directories, the format should be `video_path num_frames label`, '
+        'only supported for RGB modality')
+    parser.add_argument(
+        '--keyframe-only',
+        action='store_true',
+        help='whether to decode only the keyframes nearest to the sampled '
+        'frames, only supported with --video-input')
     parser.add_argument('--ckpt', help='checkpoint for feature extraction')
     parser.add_argument(
         '--part',
@@ -34,6 +45,10 @@ def parse_args():
     parser.add_argument(
         '--total', type=int, default=1, help='how many parts exist')
     args = parser.parse_args()
+    if args.video_input and args.modality != 'RGB':
+        raise ValueError('--video-input only supports RGB modality')
+    if args.keyframe_only and not args.video_input:
+        raise ValueError('--keyframe-only requires --video-input')
     return args
 
 
@@ -54,13 +69,27 @@ def main():
     args.batch_size = 200
 
     # define the data pipeline for Untrimmed Videos
-    data_pipeline = [
-        dict(
-            type='UntrimmedSampleFrames',
-            clip_len=args.clip_len,
-            frame_interval=args.frame_interval,
-            start_index=0),
-        dict(type='FrameSelector'),
+    if args.video_input:
+        decode_mode = 'keyframe' if args.keyframe_only else 'accurate'
+        decode_pipeline = [
+            dict(type='PyAVInit'),
+            dict(
+                type='UntrimmedSampleFrames',
+                clip_len=args.clip_len,
+                frame_interval=args.frame_interval,
+                start_index=0),
+            dict(type='PyAVDecode', mode=decode_mode)
+        ]
+    else:
+        decode_pipeline = [
+            dict(
+                type='UntrimmedSampleFrames',
+                clip_len=args.clip_len,
+                frame_interval=args.frame_interval,
+                start_index=0),
+            dict(type='FrameSelector')
+        ]
+    data_pipeline = decode_pipeline + [
         dict(type='Resize', scale=(-1, 256)),
         dict(type='CenterCrop', crop_size=256),
         dict(type='Normalize', **args.img_norm_cfg),
@@ -103,19 +132,27 @@ def main():
 
     for item in data:
         frame_dir, length, label = item.split()
-        output_file = osp.basename(frame_dir) + '.pkl'
+        if args.video_input:
+            output_file = osp.splitext(osp.basename(frame_dir))[0] + '.pkl'
+        else:
+            output_file = osp.basename(frame_dir) + '.pkl'
         frame_dir = osp.join(args.data_prefix, frame_dir)
         output_file = osp.join(args.output_prefix, output_file)
         assert output_file.endswith('.pkl')
         length = int(length)
 
         # prepare a psuedo sample
-        tmpl = dict(
-            frame_dir=frame_dir,
-            total_frames=length,
-            filename_tmpl=args.f_tmpl,
-            start_index=0,
-            modality=args.modality)
+        if args.video_input:
+            # total_frames is read from the video by PyAVInit
+            tmpl = dict(
+                filename=frame_dir, start_index=0, modality=args.modality)
+        else:
+            tmpl = dict(
+                frame_dir=frame_dir,
+                total_frames=length,
+                filename_tmpl=args.f_tmpl,
+                start_index=0,
+                modality=args.modality)
         sample = data_pipeline(tmpl)
         imgs = sample['imgs']
         shape = imgs.shape
@@ -2,6 +2,7 @@ import argparse
 import glob
 import os
 import os.path as osp
+import shutil
 import sys
 import warnings
 from multiprocessing import Pool
@@ -9,6 +10,29 @@ from multiprocessing import Pool
 import mmcv
 import numpy as np
 
+from mmaction.utils import merge_frame_pack
+
+
+def pack_frames(frame_dir, keep_frames=False):
+    """Pack the frames in a rawframe directory into one frame pack file.
+
+    The frame pack is saved as ``frame_dir + '.pack'`` and can be loaded by
+    ``PackedFrameDecode``. The frames are merged into an existing pack, so
+    the rgb and flow frames extracted in separate passes share one pack.
+
+    Args:
+        frame_dir (str): Directory of the extracted frames of a video.
+        keep_frames (bool): Whether to keep the frame directory after
+            packing. Default: False.
+    """
+    frames = []
+    for name in sorted(os.listdir(frame_dir)):
+        with open(osp.join(frame_dir, name), 'rb') as f:
+            frames.append((name, f.read()))
+    merge_frame_pack(frame_dir + '.pack', frames)
+    if not keep_frames:
+        shutil.rmtree(frame_dir)
+
 
 def extract_frame(vid_item):
     """Generate optical flow using dense flow.
@@ -108,6 +132,14 @@ def extract_frame(vid_item):
         os.system(cmd_rgb)
         os.system(cmd_flow)
 
+    if args.pack:
+        video_name = osp.splitext(osp.basename(vid_path))[0]
+        frame_dir = osp.join(out_full_path, video_name)
+        if task == 'rgb' and args.use_opencv:
+            # out_full_path has already been joined with the video name
+            frame_dir = out_full_path
+        pack_frames(frame_dir, args.keep_frames)
+
     print(f'{task} {vid_id} {vid_path} {method} done')
     sys.stdout.flush()
     return True
@@ -179,6 +211,15 @@ def parse_args():
         '--input-frames',
         action='store_true',
         help='Whether to extract flow frames based on rgb frames')
+    parser.add_argument(
+        '--pack',
+        action='store_true',
+        help='Whether to pack the frames of each video into one frame pack '
+        'file, which can be loaded by PackedFrameDecode')
+    parser.add_argument(
+        '--keep-frames',
+        action='store_true',
+        help='Whether to keep the frame directories after packing')
     args = parser.parse_args()
 
     return args
@@ -0,0 +1,72 @@
+import argparse
+import io
+import os
+import os.path as osp
+import random
+import tarfile
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Pack videos and labels into tar shards for '
+        'ShardedVideoDataset')
+    parser.add_argument(
+        'annofile',
+        type=str,
+        help='the video annotation file, with lines of "filename label1 '
+        '[label2 ...]"')
+    parser.add_argument('src_dir', type=str, help='the root of the videos')
+    parser.add_argument('out_dir', type=str, help='the output directory')
+    parser.add_argument(
+        '--samples-per-shard',
+        type=int,
+        default=1000,
+        help='the number of videos in each shard')
+    parser.add_argument(
+        '--prefix', type=str, default='shard', help='the prefix of shards')
+    parser.add_argument(
+        '--shuffle',
+        action='store_true',
+        help='whether to shuffle the videos before packing')
+    parser.add_argument(
+        '--seed', type=int, default=0, help='the seed to shuffle videos')
+    args = parser.parse_args()
+
+    return args
+
+
+def add_member(tar, name, data):
+    """Add a member of bytes to a tar file."""
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    tar.addfile(info, io.BytesIO(data))
+
+
+def main():
+    args = parse_args()
+    with open(args.annofile) as f:
+        samples = [line.split() for line in f if line.strip()]
+    if args.shuffle:
+        random.Random(args.seed).shuffle(samples)
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    num_shards = -(-len(samples) // args.samples_per_shard)
+    for shard_idx in range(num_shards):
+        shard = osp.join(args.out_dir, f'{args.prefix}_{shard_idx:06d}.tar')
+        start = shard_idx * args.samples_per_shard
+        with tarfile.open(shard, 'w') as tar:
+            for filename, *label in samples[start:start +
+                                            args.samples_per_shard]:
+                # the key of a sample is its path up to the first dot of
+                # the basename, so other dots are replaced
+                dirname, basename = osp.split(filename)
+                stem, ext = osp.splitext(basename)
+                key = osp.join(dirname, stem.replace('.', '_'))
+                with open(osp.join(args.src_dir, filename), 'rb') as f:
+                    add_member(tar, key + ext, f.read())
+                add_member(tar, key + '.cls', ' '.join(label).encode())
+        print(f'{shard} ({shard_idx + 1}/{num_shards}) is built')
+
+
+if __name__ == '__main__':
+    main()